@@ -1,8 +1,24 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from src.services.youtube_analysis import run_youtube_analysis
+from src.services.batch_analysis import DEFAULT_CONCURRENCY, iter_batch_analysis
+from src.services.youtube_analysis import (
+    iter_youtube_analysis_events,
+    run_youtube_analysis_async,
+)
 from src.services.fx import get_fx_rates, FXError
+from src.services.jobs import JOB_KINDS, JobError, get_job_store, submit_job
+from src.services.report_store import SORT_COLUMNS, get_report_store
+from src.services.rolling_windows import get_windows_async
+from src.models.video import json_default
+from src.youtube.client import YouTubeAPIError
+from src.youtube.quota import QuotaExceededError, get_quota_ledger
 
 router = APIRouter()
 
@@ -12,6 +28,28 @@ router = APIRouter()
 class AnalysisRequest(BaseModel):
     youtube_url: str = Field(..., min_length=3)
     video_count: int = Field(default=8, ge=1, le=25)
+    # Rebuild the report as of this moment from stored snapshots (no API calls)
+    as_of: Optional[datetime] = None
+
+
+class BatchAnalysisRequest(BaseModel):
+    inputs: List[str] = Field(..., min_length=1, max_length=1000)
+    video_count: int = Field(default=8, ge=1, le=25)
+    concurrency: int = Field(default=DEFAULT_CONCURRENCY, ge=1, le=32)
+
+
+class JobRequest(BaseModel):
+    kind: str = Field(..., pattern="^(" + "|".join(JOB_KINDS) + ")$")
+    youtube_url: Optional[str] = Field(default=None, min_length=3)
+    inputs: Optional[List[str]] = Field(default=None, min_length=1, max_length=10000)
+    video_count: int = Field(default=8, ge=1, le=25)
+    days: int = Field(default=365, ge=1, le=3650)
+    max_videos: int = Field(default=2000, ge=1, le=20000)
+
+
+class SaveReportRequest(BaseModel):
+    youtube_url: str = Field(..., min_length=3)
+    video_count: int = Field(default=8, ge=1, le=25)
 
 
 # ---------- ROUTES ----------
@@ -25,21 +63,235 @@ def health():
 
 
 @router.post("/analysis")
-def analyse(req: AnalysisRequest):
+async def analyse(req: AnalysisRequest):
     """
     Run YouTube influencer analysis.
     """
     try:
-        return run_youtube_analysis(
+        return await run_youtube_analysis_async(
             req.youtube_url,
             video_count=req.video_count,
+            as_of=req.as_of,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except QuotaExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except YouTubeAPIError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    except Exception:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/analysis/stream")
+async def analyse_stream(
+    youtube_url: str = Query(..., min_length=3),
+    video_count: int = Query(default=8, ge=1, le=25),
+    save: bool = False,
+):
+    """
+    Server-Sent Events variant of /analysis. Emits `channel`, `videos`,
+    `metrics_report` and `analysis` events as each stage finishes, or a single
+    `error` event ({"status": int, "detail": str}) on failure.
+    With save=true the result is stored and a final `saved` event carries the
+    report summary.
+    """
+
+    def _event(name: str, payload) -> str:
+        return f"event: {name}\ndata: {json.dumps(payload, default=json_default)}\n\n"
+
+    async def _events():
+        try:
+            result = {}
+            async for name, payload in iter_youtube_analysis_events(
+                youtube_url, video_count=video_count
+            ):
+                result[name] = payload
+                yield _event(name, payload)
+            if save:
+                saved = await asyncio.to_thread(get_report_store().save, result)
+                yield _event("saved", saved)
+        except ValueError as e:
+            yield _event("error", {"status": 400, "detail": str(e)})
+        except QuotaExceededError as e:
+            yield _event("error", {"status": 429, "detail": str(e)})
+        except YouTubeAPIError as e:
+            yield _event("error", {"status": 502, "detail": str(e)})
+        except Exception:
+            yield _event("error", {"status": 500, "detail": "Internal server error"})
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/analysis/windows")
+async def analyse_windows(
+    youtube_url: str = Query(..., min_length=3),
+    video_count: int = Query(default=25, ge=1, le=25),
+):
+    """
+    Rolling 7/30/90/365-day metrics (uploads, cadence, median views,
+    engagement, loyalty) for a creator. The first request runs one analysis
+    and seeds the windows from it plus stored snapshots; later ones are served
+    from incrementally updated state without calling the API.
+    """
+    try:
+        return await get_windows_async(youtube_url, video_count=video_count)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except QuotaExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except YouTubeAPIError as e:
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/analysis/batch")
+async def analyse_batch(req: BatchAnalysisRequest):
+    """
+    Analyse many creators at once. Streams NDJSON: one "result" line per unique
+    creator as soon as it is ready, then a final "summary" line.
+    """
+
+    async def _lines():
+        async for line in iter_batch_analysis(
+            req.inputs,
+            video_count=req.video_count,
+            concurrency=req.concurrency,
+        ):
+            yield json.dumps(line, default=json_default) + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
+@router.post("/reports", status_code=201)
+async def save_report(req: SaveReportRequest):
+    """
+    Run an analysis and store it server-side. Returns the report summary.
+    """
+    try:
+        result = await run_youtube_analysis_async(req.youtube_url, video_count=req.video_count)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except QuotaExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except YouTubeAPIError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    except Exception:
+        raise HTTPException(status_code=500, detail="Internal server error")
+    return await asyncio.to_thread(get_report_store().save, result)
+
+
+@router.get("/reports")
+def list_reports(
+    channel_id: Optional[str] = None,
+    tier: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    min_engagement: Optional[float] = None,
+    max_engagement: Optional[float] = None,
+    latest_per_channel: bool = False,
+    sort: str = Query(default="created_at", pattern="^(" + "|".join(SORT_COLUMNS) + ")$"),
+    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+):
+    """
+    Saved report summaries, filtered + sorted + paginated. Served entirely from
+    the local store (no YouTube calls).
+    Example:
+      /api/reports?tier=micro&sort=dashboard_score&order=desc&limit=20
+    """
+    return get_report_store().list(
+        channel_id=channel_id,
+        tier=tier,
+        min_score=min_score,
+        max_score=max_score,
+        min_engagement=min_engagement,
+        max_engagement=max_engagement,
+        latest_per_channel=latest_per_channel,
+        sort=sort,
+        descending=order == "desc",
+        limit=limit,
+        offset=offset,
+    )
+
+
+@router.get("/reports/{report_id}")
+def get_report(report_id: int):
+    """
+    One saved report, including the full stored analysis result.
+    """
+    report = get_report_store().get(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return report
+
+
+@router.delete("/reports/{report_id}", status_code=204)
+def delete_report(report_id: int):
+    if not get_report_store().delete(report_id):
+        raise HTTPException(status_code=404, detail="Report not found")
+
+
+@router.post("/jobs", status_code=202)
+def create_job(req: JobRequest):
+    """
+    Queue a long-running job ("analysis", "batch", "history", "archive" or "refresh").
+    Poll GET /jobs/{id} for progress and the result.
+    """
+    if req.kind == "batch":
+        params = {"inputs": req.inputs or [], "video_count": req.video_count}
+    elif req.kind == "history":
+        params = {"youtube_input": req.youtube_url, "days": req.days, "max_videos": req.max_videos}
+    elif req.kind in ("archive", "refresh"):
+        params = {}
+    else:
+        params = {"youtube_input": req.youtube_url, "video_count": req.video_count}
+
+    try:
+        return submit_job(req.kind, params)
+    except JobError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/jobs/{job_id}")
+def get_job(
+    job_id: str,
+    include_items: bool = False,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+):
+    """
+    Job status + progress. Batch jobs can page through per-creator results
+    with include_items=true.
+    """
+    store = get_job_store()
+    job = store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if include_items and job["kind"] == "batch":
+        job["items"] = [
+            {"index": idx, **item} for idx, item in store.items(job_id, offset, limit).items()
+        ]
+    return job
+
+
+@router.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str):
+    """
+    Cancel a queued job, or ask a running one to stop after its current step.
+    """
+    job = get_job_store().request_cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
 @router.get("/fx")
 def fx(base: str = "USD", symbols: str = "ZAR,EUR,GBP"):
     """
@@ -53,3 +305,10 @@ def fx(base: str = "USD", symbols: str = "ZAR,EUR,GBP"):
     except FXError as e:
         raise HTTPException(status_code=502, detail=str(e))
 
+
+@router.get("/quota")
+def quota(day: str = ""):
+    """
+    YouTube API quota usage for a quota day (default: today, Pacific time).
+    """
+    return get_quota_ledger().usage(day or None)
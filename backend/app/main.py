@@ -1,9 +1,29 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import router as api_router
+from src.services.jobs import get_job_runner
+from src.youtube.async_client import close_async_client
+from src.youtube.pool import reset_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Starting / stopping the runner touches SQLite and joins threads: keep
+    # both off the event loop
+    await asyncio.to_thread(get_job_runner().start)
+    try:
+        yield
+    finally:
+        await asyncio.to_thread(get_job_runner().stop)
+        reset_pool()
+        await close_async_client()
 
-app = FastAPI(title="Influencer Intel API", version="0.1.0")
+
+app = FastAPI(title="Influencer Intel API", version="0.1.0", lifespan=lifespan)
 
 # MVP CORS: allow local dev frontends
 app.add_middleware(
@@ -20,3 +40,4 @@ app.add_middleware(
 
 # All routes live under /api/...
 app.include_router(api_router, prefix="/api")
+
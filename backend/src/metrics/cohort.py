@@ -0,0 +1,75 @@
+"""
+Cohort-scale report computation: score thousands of channels in one pass.
+
+Channels are laid out CSR-style: every video of every channel in one set of
+flat columns, plus offsets so channel i owns rows offsets[i]:offsets[i + 1].
+All reductions (sums, medians, stdevs, short/long splits, velocity) run
+grouped over that layout (see engine.cohort_fields); only the final per-channel
+dict assembly is a Python loop.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .engine import VideoColumns, cohort_fields
+from .metrics import InfluencerMetrics
+
+
+def concat_columns(parts: Sequence[VideoColumns]) -> VideoColumns:
+    if not parts:
+        return VideoColumns.from_videos([])
+    return VideoColumns(
+        views=np.concatenate([p.views for p in parts]),
+        likes=np.concatenate([p.likes for p in parts]),
+        comments=np.concatenate([p.comments for p in parts]),
+        duration_s=np.concatenate([p.duration_s for p in parts]),
+        published_us=np.concatenate([p.published_us for p in parts]),
+    )
+
+
+def cohort_reports(
+    channels: Sequence[InfluencerMetrics], now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    get_performance_report() for every channel, computed in one vectorized
+    pass. `now` (default: the current time) is the reference for 7-day
+    velocity and is shared by the whole cohort.
+    """
+    if not channels:
+        return []
+    columns = concat_columns([VideoColumns.from_videos(c.video_data) for c in channels])
+    offsets = np.concatenate([[0], np.cumsum([len(c.video_data) for c in channels])])
+    fields = cohort_fields(columns, offsets, [c.sub_count for c in channels], now=now)
+    return [c.report_from_fields(f) for c, f in zip(channels, fields)]
+
+
+def cohort_reports_from_arrays(
+    columns: VideoColumns,
+    offsets: Sequence[int],
+    channels: Sequence[Mapping[str, Any]],
+    now: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Same as cohort_reports, for data already in columnar form (e.g. loaded
+    from the snapshot archive): `columns` holds all videos back to back and
+    `channels[i]` ({"channel_name", "sub_count", "channel_url", "region"})
+    describes rows offsets[i]:offsets[i + 1].
+    """
+    if len(offsets) != len(channels) + 1:
+        raise ValueError("offsets must have exactly one more entry than channels.")
+    fields = cohort_fields(columns, offsets, [int(c.get("sub_count", 0)) for c in channels], now=now)
+    reports: List[Dict[str, Any]] = []
+    for channel, f in zip(channels, fields):
+        metrics = InfluencerMetrics(
+            channel_name=channel.get("channel_name", ""),
+            sub_count=int(channel.get("sub_count", 0)),
+            video_data=[],
+            region=channel.get("region", "Global"),
+            channel_url=channel.get("channel_url", ""),
+        )
+        reports.append(metrics.report_from_fields(f))
+    return reports
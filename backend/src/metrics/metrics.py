@@ -1,20 +1,37 @@
 from __future__ import annotations
 
-import statistics
+import copy
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
-
-import isodate
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+from .engine import VideoColumns, performance_fields
+
+# Memoized state (see __setattr__): which caches each field invalidates.
+# video_data and benchmarks must be reassigned, not mutated in place, to be
+# picked up.
+_COLUMN_CACHES = ("_columns", "_totals", "_report")
+_REPORT_CACHES = ("_report",)
+_INVALIDATES: Dict[str, tuple] = {
+    "video_data": _COLUMN_CACHES,
+    "sub_count": _REPORT_CACHES,
+    "as_of": _REPORT_CACHES,
+    "channel_name": _REPORT_CACHES,
+    "channel_url": _REPORT_CACHES,
+    "benchmarks": _REPORT_CACHES,
+}
 
 
 @dataclass
 class InfluencerMetrics:
     channel_name: str
     sub_count: int
-    video_data: List[Dict[str, Any]]
+    # list of video dicts / VideoRecords, or a VideoBatch (columns used as-is)
+    video_data: Sequence[Mapping[str, Any]]
     region: str = "Global"
     channel_url: str = ""
+    # Reference time for time-relative metrics (velocity); None = now
+    as_of: Optional[datetime] = None
 
     def __post_init__(self) -> None:
         # Benchmarks (later can be region-based)
@@ -26,122 +43,50 @@ class InfluencerMetrics:
             "cpm": 40.0,
         }
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        for cache in _INVALIDATES.get(name, ()):
+            self.__dict__.pop(cache, None)
+
+    # ---------------- MEMOIZED STATE ----------------
+    def _get_columns(self) -> VideoColumns:
+        columns = self.__dict__.get("_columns")
+        if columns is None:
+            columns = VideoColumns.from_videos(self.video_data)
+            self.__dict__["_columns"] = columns
+        return columns
+
+    def _get_totals(self) -> Dict[str, int]:
+        totals = self.__dict__.get("_totals")
+        if totals is None:
+            columns = self._get_columns()
+            totals = {
+                "views": int(columns.views.sum()),
+                "engagements": int(columns.likes.sum()) + int(columns.comments.sum()),
+            }
+            self.__dict__["_totals"] = totals
+        return totals
+
     # ---------------- CORE PERFORMANCE METRICS ----------------
     def get_performance_report(self) -> Dict[str, Any]:
-        if not self.video_data:
+        # Computed once per video_data / sub_count (etc.); with as_of unset,
+        # velocity is measured from the first call.
+        report = self.__dict__.get("_report")
+        if report is None:
+            # Columnar pass over all videos (see engine.py)
+            fields = performance_fields(self._get_columns(), self.sub_count, now=self.as_of)
+            report = self.report_from_fields(fields)
+            self.__dict__["_report"] = report
+        # Deep copy: callers may edit nested dicts (short_long_split, benchmarks)
+        return copy.deepcopy(report)
+
+    def report_from_fields(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Full report from precomputed engine fields (also used by cohort.py).
+        """
+        if not fields:
             return {}
 
-        # Normalize numeric fields safely
-        normalized: List[Dict[str, Any]] = []
-        for v in self.video_data:
-            vv = dict(v)
-            vv["views"] = self._to_int(v.get("views", 0))
-            vv["likes"] = self._to_int(v.get("likes", 0))
-            vv["comments"] = self._to_int(v.get("comments", 0))
-            normalized.append(vv)
-
-        views = [v["views"] for v in normalized]
-        likes = [v["likes"] for v in normalized]
-        comments = [v["comments"] for v in normalized]
-
-        total_views = sum(views)
-        total_likes = sum(likes)
-        total_comments = sum(comments)
-
-        mean_views = statistics.mean(views) if views else 0.0
-        median_views = statistics.median(views) if views else 0.0
-
-        engagement_rate_percent = (
-            (total_likes + total_comments) / total_views * 100.0
-            if total_views
-            else 0.0
-        )
-        like_rate_percent = (total_likes / total_views * 100.0) if total_views else 0.0
-        comment_rate_percent = (
-            (total_comments / total_views * 100.0) if total_views else 0.0
-        )
-
-        # Engagement consistency (stdev of per-video engagement rate; lower = more consistent)
-        per_video_engagement = [
-            ((v["likes"] + v["comments"]) / v["views"] * 100.0) if v["views"] else 0.0
-            for v in normalized
-        ]
-        engagement_consistency = (
-            round(statistics.stdev(per_video_engagement), 2)
-            if len(per_video_engagement) > 1
-            else 0.0
-        )
-
-        # Loyalty: median views as % of subs
-        loyalty_percent = (
-            (median_views / self.sub_count * 100.0) if self.sub_count else 0.0
-        )
-
-        # Views per sub: mean views as % of subs (needed by benchmarks)
-        views_per_sub_percent = (
-            (mean_views / self.sub_count * 100.0) if self.sub_count else 0.0
-        )
-
-        # Risk classification via volatility ratio
-        volatility_ratio = (mean_views / median_views) if median_views else 0.0
-        if volatility_ratio > 1.5:
-            risk_level = "High (Viral Reliant)"
-        elif volatility_ratio > 1.2:
-            risk_level = "Moderate"
-        else:
-            risk_level = "Low (Consistent)"
-
-        # Short vs Long split
-        short_views: List[int] = []
-        long_views: List[int] = []
-        short_count = 0
-        long_count = 0
-
-        for v in normalized:
-            duration_raw = v.get("duration")
-            if not duration_raw:
-                continue
-            try:
-                duration_s = isodate.parse_duration(duration_raw).total_seconds()
-            except (TypeError, ValueError, isodate.ISO8601Error):
-                continue
-
-            if duration_s < 420:  # < 7 minutes
-                short_count += 1
-                short_views.append(v["views"])
-            else:
-                long_count += 1
-                long_views.append(v["views"])
-
-        denom = max(short_count + long_count, 1)
-        short_long_split = {
-            "short_count": short_count,
-            "long_count": long_count,
-            "short_percent": round(short_count / denom * 100.0, 2),
-            "short_avg_views": int(statistics.mean(short_views)) if short_views else 0,
-            "long_avg_views": int(statistics.mean(long_views)) if long_views else 0,
-        }
-
-        # Velocity (views from last 7 days)
-        velocity_views_7d = 0
-        now = datetime.now(timezone.utc)
-
-        for v in normalized:
-            published_raw = v.get("publishedAt")
-            if not published_raw:
-                continue
-            try:
-                published = datetime.fromisoformat(published_raw.replace("Z", "+00:00"))
-            except ValueError:
-                continue
-
-            if published >= now - timedelta(days=7):
-                velocity_views_7d += v["views"]
-
-        velocity_percent_7d = (
-            round(velocity_views_7d / total_views * 100.0, 2) if total_views else 0.0
-        )
-
         report: Dict[str, Any] = {
             # Channel identity (useful for DB saving + API)
             "channel_name": self.channel_name,
@@ -149,34 +94,34 @@ class InfluencerMetrics:
             "sub_count": int(self.sub_count),
 
             # Core rollups
-            "mean_views": int(mean_views),
-            "median_views": int(median_views),
-            "total_views": int(total_views),
+            "mean_views": fields["mean_views"],
+            "median_views": fields["median_views"],
+            "total_views": fields["total_views"],
 
             # Risk / distribution
-            "risk_level": risk_level,
-            "volatility_ratio": round(volatility_ratio, 2),
+            "risk_level": fields["risk_level"],
+            "volatility_ratio": fields["volatility_ratio"],
 
             # Rates (STANDARDIZED KEYS)
-            "engagement_rate_percent": round(engagement_rate_percent, 2),
-            "like_rate_percent": round(like_rate_percent, 2),
-            "comment_rate_percent": round(comment_rate_percent, 2),
+            "engagement_rate_percent": fields["engagement_rate_percent"],
+            "like_rate_percent": fields["like_rate_percent"],
+            "comment_rate_percent": fields["comment_rate_percent"],
 
             # Consistency + loyalty + views/sub (STANDARDIZED)
-            "engagement_consistency": float(engagement_consistency),
-            "loyalty_percent": round(loyalty_percent, 2),
-            "views_per_sub_percent": round(views_per_sub_percent, 2),
+            "engagement_consistency": fields["engagement_consistency"],
+            "loyalty_percent": fields["loyalty_percent"],
+            "views_per_sub_percent": fields["views_per_sub_percent"],
 
             # Format + momentum
-            "short_long_split": short_long_split,
-            "velocity_views_7d": int(velocity_views_7d),
-            "velocity_percent_7d": float(velocity_percent_7d),
+            "short_long_split": fields["short_long_split"],
+            "velocity_views_7d": fields["velocity_views_7d"],
+            "velocity_percent_7d": fields["velocity_percent_7d"],
 
             # Benchmarks reference
-            "benchmarks": self.benchmarks,
+            "benchmarks": dict(self.benchmarks),
 
             # Convenience
-            "sample_size": len(normalized),
+            "sample_size": fields["sample_size"],
         }
 
         # Include dashboard score (computed from this report)
@@ -189,18 +134,15 @@ class InfluencerMetrics:
 
     # ---------------- MONETISATION ----------------
     def calculate_CPM(self, client_cost: float) -> float:
-        total_views = sum(self._to_int(v.get("views", 0)) for v in self.video_data)
+        total_views = self._get_totals()["views"]
         return round(client_cost / max(total_views / 1000.0, 1.0), 2)
 
     def calculate_CPV(self, client_cost: float) -> float:
-        total_views = sum(self._to_int(v.get("views", 0)) for v in self.video_data)
+        total_views = self._get_totals()["views"]
         return round(client_cost / max(float(total_views), 1.0), 4)
 
     def calculate_CPE(self, client_cost: float) -> float:
-        total_engagements = sum(
-            self._to_int(v.get("likes", 0)) + self._to_int(v.get("comments", 0))
-            for v in self.video_data
-        )
+        total_engagements = self._get_totals()["engagements"]
         return round(client_cost / max(float(total_engagements), 1.0), 4)
 
     def calculate_talent_cost(self, client_cost: float, agency_margin_percent: float) -> float:
@@ -0,0 +1,329 @@
+"""
+Streaming (online) version of InfluencerMetrics.get_performance_report.
+
+A MetricsAccumulator takes videos one at a time, or a page / VideoBatch at a
+time, in constant-ish memory, and produces the same report keys without
+holding the video list:
+
+- counts, totals, the short/long split and 7-day velocity are exact sums
+- engagement consistency (stdev of per-video engagement rate) uses Welford's
+  running mean / M2
+- median views comes from a KLL quantile sketch. It is exact until the
+  sketch first compacts (k videos); after that its rank error is ~1.7 / k.
+
+Accumulators merge (Chan et al. for the moments, KLL merge for the sketch),
+so a long history can be split into shards (e.g. one per year, or one per
+stored job), reduced in parallel and combined (see reduce_shards).
+
+This is a library API; the app's own reports still score the full video list
+(the history job builds one VideoBatch) so their median stays exact.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from src.models.video import VideoBatch, VideoRecord
+from src.utils.timeparse import NO_DATE, to_epoch_us
+
+from .engine import SHORT_MAX_SECONDS, VELOCITY_WINDOW, fields_from_aggregates
+from .metrics import InfluencerMetrics
+
+DEFAULT_SKETCH_K = 200
+
+_WINDOW_US = VELOCITY_WINDOW // timedelta(microseconds=1)
+
+
+class QuantileSketch:
+    """
+    KLL sketch over integers: a stack of compactors where an item at level h
+    stands for 2**h inputs. A full level is sorted and every other item
+    (random offset) is promoted, so memory stays O(k log(n / k)).
+    """
+
+    def __init__(self, k: int = DEFAULT_SKETCH_K, seed: int = 0) -> None:
+        if k < 8:
+            raise ValueError("k must be at least 8.")
+        self.k = k
+        self.n = 0
+        self._levels: List[List[int]] = [[]]
+        self._exact = True
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        # Top level holds k items; each level below holds 2/3 as many
+        depth = len(self._levels) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self._levels):
+            level = self._levels[h]
+            if len(level) >= self._capacity(h):
+                if h + 1 == len(self._levels):
+                    self._levels.append([])
+                level.sort()
+                # An odd item out stays at this level
+                keep = [level.pop()] if len(level) % 2 else []
+                self._levels[h + 1].extend(level[self._rng.randrange(2)::2])
+                self._levels[h] = keep
+                self._exact = False
+            h += 1
+
+    def update(self, value: int) -> None:
+        self._levels[0].append(value)
+        self.n += 1
+        if len(self._levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def extend(self, values: Iterable[int]) -> None:
+        values = list(values)
+        start = 0
+        while start < len(values):
+            room = max(self._capacity(0) - len(self._levels[0]), 1)
+            chunk = values[start:start + room]
+            self._levels[0].extend(chunk)
+            self.n += len(chunk)
+            start += len(chunk)
+            if len(self._levels[0]) >= self._capacity(0):
+                self._compress()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for h, items in enumerate(other._levels):
+            self._levels[h].extend(items)
+        self.n += other.n
+        self._exact = self._exact and other._exact
+        self._compress()
+        return self
+
+    @property
+    def exact(self) -> bool:
+        return self._exact
+
+    def quantile(self, q: float) -> int:
+        """
+        Smallest stored value whose weighted rank reaches q * n.
+        """
+        if self.n == 0:
+            raise ValueError("quantile of an empty sketch")
+        weighted = sorted(
+            (value, 1 << h) for h, level in enumerate(self._levels) for value in level
+        )
+        target = q * self.n
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen >= target:
+                return value
+        return weighted[-1][0]
+
+    def median_parts(self) -> Tuple[int, int]:
+        """
+        (lo, hi) middle elements like engine.group_median_parts: exact while
+        nothing has been compacted, otherwise the sketch median twice.
+        """
+        if self.n == 0:
+            return 0, 0
+        if self._exact:
+            ordered = sorted(self._levels[0])
+            return ordered[(self.n - 1) // 2], ordered[self.n // 2]
+        median = self.quantile(0.5)
+        return median, median
+
+
+class MetricsAccumulator:
+    """
+    Online InfluencerMetrics: add() / add_batch() videos, merge() shards,
+    then report() or fields(). `now` fixes the 7-day velocity reference
+    (default: the time the accumulator is created).
+    """
+
+    def __init__(self, now: Optional[datetime] = None, sketch_k: int = DEFAULT_SKETCH_K) -> None:
+        self.now_us = to_epoch_us(now or datetime.now(timezone.utc))
+        self.n = 0
+        self.total_views = 0
+        self.total_likes = 0
+        self.total_comments = 0
+        self.short_count = 0
+        self.long_count = 0
+        self.short_views = 0
+        self.long_views = 0
+        self.velocity_views = 0
+        # Welford state for the per-video engagement rate
+        self._eng_mean = 0.0
+        self._eng_m2 = 0.0
+        self.views_sketch = QuantileSketch(k=sketch_k)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _merge_moments(self, n: int, mean: float, m2: float) -> None:
+        # Chan et al. parallel combination of (count, mean, M2)
+        if n == 0:
+            return
+        total = self.n + n
+        delta = mean - self._eng_mean
+        self._eng_mean += delta * n / total
+        self._eng_m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+
+    def add(self, video: Mapping[str, Any]) -> None:
+        """
+        One video (VideoRecord or video dict).
+        """
+        record = VideoRecord.from_mapping(video)
+        views = record.views
+        rate = (record.likes + record.comments) / views * 100.0 if views != 0 else 0.0
+
+        # Welford step
+        self.n += 1
+        delta = rate - self._eng_mean
+        self._eng_mean += delta / self.n
+        self._eng_m2 += delta * (rate - self._eng_mean)
+
+        self.total_views += views
+        self.total_likes += record.likes
+        self.total_comments += record.comments
+        if not math.isnan(record.duration_s):
+            if record.duration_s < SHORT_MAX_SECONDS:
+                self.short_count += 1
+                self.short_views += views
+            else:
+                self.long_count += 1
+                self.long_views += views
+        if record.published_us != NO_DATE and record.published_us >= self.now_us - _WINDOW_US:
+            self.velocity_views += views
+        self.views_sketch.update(views)
+
+    def add_batch(self, videos: Iterable[Mapping[str, Any]]) -> None:
+        """
+        A page of videos at once; a VideoBatch is reduced with array ops.
+        """
+        batch = VideoBatch.from_records(videos)
+        if len(batch) == 0:
+            return
+        views, likes, comments = batch.views, batch.likes, batch.comments
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = np.where(views != 0, (likes + comments) / views * 100.0, 0.0)
+        mean = float(rates.mean())
+        self._merge_moments(len(batch), mean, float(((rates - mean) ** 2).sum()))
+
+        self.total_views += int(views.sum())
+        self.total_likes += int(likes.sum())
+        self.total_comments += int(comments.sum())
+        known = ~np.isnan(batch.duration_s)
+        short = known & (batch.duration_s < SHORT_MAX_SECONDS)
+        long_ = known & ~short
+        self.short_count += int(short.sum())
+        self.long_count += int(long_.sum())
+        self.short_views += int(views[short].sum())
+        self.long_views += int(views[long_].sum())
+        recent = (batch.published_us != NO_DATE) & (batch.published_us >= self.now_us - _WINDOW_US)
+        self.velocity_views += int(views[recent].sum())
+        self.views_sketch.extend(views.tolist())
+
+    def add_all(self, pages: Iterable[Iterable[Mapping[str, Any]]]) -> "MetricsAccumulator":
+        """
+        Consume pages (e.g. UploadPage.videos from client.iter_upload_pages).
+        """
+        for page in pages:
+            self.add_batch(getattr(page, "videos", page))
+        return self
+
+    def merge(self, other: "MetricsAccumulator") -> "MetricsAccumulator":
+        if other.now_us != self.now_us:
+            raise ValueError("Cannot merge accumulators with different reference times.")
+        self._merge_moments(other.n, other._eng_mean, other._eng_m2)
+        self.total_views += other.total_views
+        self.total_likes += other.total_likes
+        self.total_comments += other.total_comments
+        self.short_count += other.short_count
+        self.long_count += other.long_count
+        self.short_views += other.short_views
+        self.long_views += other.long_views
+        self.velocity_views += other.velocity_views
+        self.views_sketch.merge(other.views_sketch)
+        return self
+
+    def engagement_stdev(self) -> float:
+        return math.sqrt(self._eng_m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def fields(self, sub_count: int) -> Dict[str, Any]:
+        """
+        Same dict as engine.performance_fields ({} when empty).
+        """
+        median_lo, median_hi = self.views_sketch.median_parts()
+        return fields_from_aggregates(
+            self.n,
+            int(sub_count),
+            self.total_views,
+            self.total_likes,
+            self.total_comments,
+            median_lo,
+            median_hi,
+            self.engagement_stdev(),
+            self.short_count,
+            self.long_count,
+            self.short_views,
+            self.long_views,
+            self.velocity_views,
+        )
+
+    def report(
+        self,
+        channel_name: str = "",
+        sub_count: int = 0,
+        channel_url: str = "",
+        region: str = "Global",
+    ) -> Dict[str, Any]:
+        """
+        Same keys as InfluencerMetrics.get_performance_report ({} when empty).
+        """
+        metrics = InfluencerMetrics(
+            channel_name=channel_name,
+            sub_count=int(sub_count),
+            video_data=[],
+            region=region,
+            channel_url=channel_url,
+        )
+        return metrics.report_from_fields(self.fields(sub_count))
+
+
+def reduce_shards(
+    shards: Iterable[Iterable[Iterable[Mapping[str, Any]]]],
+    now: Optional[datetime] = None,
+    max_workers: int = 4,
+    sketch_k: int = DEFAULT_SKETCH_K,
+) -> MetricsAccumulator:
+    """
+    Accumulate each shard (an iterable of pages, e.g. one year of uploads) on
+    its own worker, then merge. Every shard shares one reference time.
+
+    Shards are usually lazy page iterators over the API or a store, so most of
+    a shard's time is spent waiting on I/O and up to `max_workers` of them are
+    read concurrently; max_workers=1 reduces them one after another in the
+    calling thread. Accumulators are merged in shard order.
+    """
+    now = now or datetime.now(timezone.utc)
+
+    def _reduce(shard: Iterable[Iterable[Mapping[str, Any]]]) -> MetricsAccumulator:
+        return MetricsAccumulator(now=now, sketch_k=sketch_k).add_all(shard)
+
+    result = MetricsAccumulator(now=now, sketch_k=sketch_k)
+    if max_workers <= 1:
+        for shard in shards:
+            result.merge(_reduce(shard))
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for acc in pool.map(_reduce, shards):
+            result.merge(acc)
+    return result
@@ -0,0 +1,209 @@
+"""
+Rolling-window metrics (7 / 30 / 90 / 365 days) for one channel.
+
+RollingWindows keeps running state per window instead of rescanning the video
+list: per-window sums (uploads, views, likes, comments) plus a sorted list of
+member views for the median and of member publish times for the upload
+cadence. A video enters the windows it was published in
+when it is upserted, its counters are swapped in place when a newer snapshot
+arrives, and advance() evicts uploads that have aged out (a heap per window,
+oldest first). Reading a window is O(1).
+
+Windows are defined on publish time: "30d" covers the uploads published in
+the last 30 days, with their latest known stats.
+"""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from src.models.video import VideoRecord
+from src.utils.timeparse import NO_DATE, to_epoch_us
+
+WINDOW_DAYS: Tuple[int, ...] = (7, 30, 90, 365)
+
+_DAY_US = timedelta(days=1) // timedelta(microseconds=1)
+
+
+class _Window:
+    __slots__ = (
+        "days", "span_us", "members", "heap", "sorted_views", "sorted_published",
+        "uploads", "views", "likes", "comments",
+    )
+
+    def __init__(self, days: int) -> None:
+        self.days = days
+        self.span_us = days * _DAY_US
+        self.members: Dict[str, int] = {}  # video_id -> published_us
+        self.heap: List[Tuple[int, str]] = []  # (published_us, video_id); may hold stale entries
+        self.sorted_views: List[int] = []
+        self.sorted_published: List[int] = []
+        self.uploads = 0
+        self.views = 0
+        self.likes = 0
+        self.comments = 0
+
+    def add(self, video_id: str, published_us: int, counters: Tuple[int, int, int]) -> None:
+        self.members[video_id] = published_us
+        heapq.heappush(self.heap, (published_us, video_id))
+        insort(self.sorted_published, published_us)
+        self._apply(counters, 1)
+
+    def discard(self, video_id: str, counters: Tuple[int, int, int]) -> None:
+        # The heap entry goes stale and is skipped when it surfaces
+        published_us = self.members.pop(video_id)
+        del self.sorted_published[bisect_left(self.sorted_published, published_us)]
+        self._apply(counters, -1)
+
+    def _apply(self, counters: Tuple[int, int, int], sign: int) -> None:
+        views, likes, comments = counters
+        self.uploads += sign
+        self.views += sign * views
+        self.likes += sign * likes
+        self.comments += sign * comments
+        if sign > 0:
+            insort(self.sorted_views, views)
+        else:
+            del self.sorted_views[bisect_left(self.sorted_views, views)]
+
+
+class RollingWindows:
+    """
+    Incrementally maintained per-window metrics for one channel.
+    `now` is the window reference (default: current time); move it forward
+    with advance().
+    """
+
+    def __init__(
+        self,
+        sub_count: int = 0,
+        now: Optional[datetime] = None,
+        days: Sequence[int] = WINDOW_DAYS,
+    ) -> None:
+        self.sub_count = int(sub_count)
+        self.now_us = to_epoch_us(now or datetime.now(timezone.utc))
+        self._windows = {d: _Window(d) for d in days}
+        # video_id -> (published_us, (views, likes, comments))
+        self._videos: Dict[str, Tuple[int, Tuple[int, int, int]]] = {}
+
+    @classmethod
+    def from_videos(
+        cls,
+        videos: Iterable[Mapping[str, Any]],
+        sub_count: int = 0,
+        now: Optional[datetime] = None,
+        days: Sequence[int] = WINDOW_DAYS,
+    ) -> "RollingWindows":
+        windows = cls(sub_count=sub_count, now=now, days=days)
+        windows.upsert_many(videos)
+        return windows
+
+    @classmethod
+    def from_metrics(cls, metrics: Any, days: Sequence[int] = WINDOW_DAYS) -> "RollingWindows":
+        """
+        Seed from an InfluencerMetrics (its videos, sub_count and as_of).
+        """
+        return cls.from_videos(metrics.video_data, metrics.sub_count, now=metrics.as_of, days=days)
+
+    def __len__(self) -> int:
+        return len(self._videos)
+
+    # ---------------- UPDATES ----------------
+
+    def upsert(self, video: Mapping[str, Any]) -> None:
+        """
+        Add an upload, or replace its counters with a newer snapshot.
+        Videos without an ID or a usable publish date are ignored.
+        """
+        record = VideoRecord.from_mapping(video)
+        if not record.video_id or record.published_us == NO_DATE:
+            return
+        video_id, published_us = record.video_id, record.published_us
+        counters = (record.views, record.likes, record.comments)
+
+        previous = self._videos.get(video_id)
+        if previous is not None:
+            if previous == (published_us, counters):
+                return
+            self.remove(video_id)
+
+        self._videos[video_id] = (published_us, counters)
+        for window in self._windows.values():
+            if published_us >= self.now_us - window.span_us:
+                window.add(video_id, published_us, counters)
+
+    def upsert_many(self, videos: Iterable[Mapping[str, Any]]) -> None:
+        for video in videos:
+            self.upsert(video)
+
+    def remove(self, video_id: str) -> None:
+        """
+        Forget an upload (e.g. deleted or made private).
+        """
+        previous = self._videos.pop(video_id, None)
+        if previous is None:
+            return
+        for window in self._windows.values():
+            if video_id in window.members:
+                window.discard(video_id, previous[1])
+
+    def set_sub_count(self, sub_count: int) -> None:
+        self.sub_count = int(sub_count)
+
+    def advance(self, now: Optional[datetime] = None) -> None:
+        """
+        Move the reference time forward and evict uploads that aged out.
+        Each upload leaves each window once, so this is amortized O(log n).
+        """
+        now_us = to_epoch_us(now or datetime.now(timezone.utc))
+        if now_us <= self.now_us:
+            return
+        self.now_us = now_us
+        for window in self._windows.values():
+            cutoff = now_us - window.span_us
+            while window.heap and window.heap[0][0] < cutoff:
+                published_us, video_id = heapq.heappop(window.heap)
+                if window.members.get(video_id) == published_us:
+                    window.discard(video_id, self._videos[video_id][1])
+
+    # ---------------- READS (O(1)) ----------------
+
+    def window(self, days: int) -> Dict[str, Any]:
+        w = self._windows.get(days)
+        if w is None:
+            raise ValueError(f"Unknown window '{days}'. Expected one of: {', '.join(map(str, self._windows))}.")
+
+        n = w.uploads
+        if n:
+            mid = n // 2
+            # statistics.median: the middle element, or the mean of the middle two
+            median_views = w.sorted_views[mid] if n % 2 else (w.sorted_views[mid - 1] + w.sorted_views[mid]) / 2
+        else:
+            median_views = 0
+        sub_count = self.sub_count
+        # Mean gap between consecutive uploads = (newest - oldest) / (n - 1)
+        if n >= 2:
+            span_days = (w.sorted_published[-1] - w.sorted_published[0]) / _DAY_US
+            avg_gap_days = round(span_days / (n - 1), 2)
+        else:
+            avg_gap_days = 0.0
+
+        return {
+            "days": days,
+            "uploads": n,
+            "uploads_per_week": round(n / days * 7.0, 2),
+            "avg_days_between_uploads": avg_gap_days,
+            "total_views": w.views,
+            "median_views": int(median_views),
+            "engagement_rate_percent": round((w.likes + w.comments) / w.views * 100.0, 2) if w.views else 0.0,
+            "loyalty_percent": round(median_views / sub_count * 100.0, 2) if sub_count else 0.0,
+        }
+
+    def windows(self) -> Dict[str, Dict[str, Any]]:
+        """
+        {"7d": {...}, "30d": {...}, ...} for every configured window.
+        """
+        return {f"{days}d": self.window(days) for days in self._windows}
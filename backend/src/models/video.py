@@ -0,0 +1,323 @@
+"""
+src/models/video.py
+Compact in-memory representations of YouTube videos.
+
+VideoRecord  one video with the same keys client._video_from_item has always
+             produced, but slotted instead of a dict. It is a read-only
+             Mapping, so v["views"], v.get(...), dict(v) and FastAPI's encoder
+             keep working unchanged.
+
+VideoBatch   many videos as columns: views / likes / comments / duration
+             seconds / publish time are typed NumPy arrays (read by the
+             metrics engine without copying), strings are packed into one
+             UTF-8 buffer per column. Indexing yields VideoRecords, so a batch
+             stands in for a list of video dicts.
+
+Neither is converted back to dicts until it is serialized; pass
+default=json_default to json.dumps.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from src.utils.timeparse import NO_DATE, duration_seconds, parse_durations, parse_timestamps, timestamp_us
+
+VIDEO_FIELDS: Tuple[str, ...] = (
+    "video_id",
+    "title",
+    "publishedAt",
+    "views",
+    "likes",
+    "comments",
+    "duration",
+)
+
+_STRING_FIELDS = ("video_id", "title", "publishedAt", "duration")
+_COUNT_FIELDS = ("views", "likes", "comments")
+
+
+def _to_int(val: Any, default: int = 0) -> int:
+    try:
+        return int(val)
+    except (TypeError, ValueError):
+        return default
+
+
+class VideoRecord(Mapping):
+    """
+    One video: {"video_id", "title", "publishedAt", "views", "likes",
+    "comments", "duration"} in slots (no per-instance dict).
+
+    duration / publishedAt are parsed once, here, into duration_s (seconds,
+    NaN = unknown) and published_us (epoch µs, timeparse.NO_DATE = unknown).
+    Those two are attributes only, not mapping keys, so the JSON shape is
+    unchanged.
+    """
+
+    __slots__ = VIDEO_FIELDS + ("duration_s", "published_us")
+
+    def __init__(
+        self,
+        video_id: str = "",
+        title: str = "",
+        publishedAt: str = "",
+        views: Any = 0,
+        likes: Any = 0,
+        comments: Any = 0,
+        duration: str = "",
+    ) -> None:
+        self.video_id = video_id or ""
+        self.title = title or ""
+        self.publishedAt = publishedAt or ""
+        self.views = _to_int(views)
+        self.likes = _to_int(likes)
+        self.comments = _to_int(comments)
+        self.duration = duration or ""
+        self.duration_s = duration_seconds(self.duration) if isinstance(self.duration, str) else math.nan
+        self.published_us = timestamp_us(self.publishedAt)
+
+    @classmethod
+    def _from_columns(cls, values: Tuple[Any, ...], duration_s: float, published_us: int) -> "VideoRecord":
+        """
+        Rebuild from already-parsed values (VideoBatch rows) without parsing again.
+        """
+        record = cls.__new__(cls)
+        for name, value in zip(VIDEO_FIELDS, values):
+            setattr(record, name, value)
+        record.duration_s = duration_s
+        record.published_us = published_us
+        return record
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "VideoRecord":
+        if isinstance(data, VideoRecord):
+            return data
+        return cls(**{k: data.get(k) for k in VIDEO_FIELDS})
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in VIDEO_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(VIDEO_FIELDS)
+
+    def __len__(self) -> int:
+        return len(VIDEO_FIELDS)
+
+    def __reduce__(self):
+        return (VideoRecord, tuple(getattr(self, k) for k in VIDEO_FIELDS))
+
+    def __repr__(self) -> str:
+        return f"VideoRecord({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in VIDEO_FIELDS}
+
+
+class _RawVideo:
+    """
+    A video dict normalized like VideoRecord but not parsed yet: VideoBatch
+    parses the duration / publishedAt columns in bulk.
+    """
+
+    __slots__ = VIDEO_FIELDS + ("duration_s", "published_us")
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        self.video_id = data.get("video_id") or ""
+        self.title = data.get("title") or ""
+        self.publishedAt = data.get("publishedAt") or ""
+        self.views = _to_int(data.get("views"))
+        self.likes = _to_int(data.get("likes"))
+        self.comments = _to_int(data.get("comments"))
+        self.duration = data.get("duration") or ""
+        self.duration_s = math.nan
+        self.published_us = NO_DATE
+
+
+class _StringColumn:
+    """
+    Strings packed into one UTF-8 buffer plus int64 end offsets.
+    """
+
+    __slots__ = ("_buf", "_ends")
+
+    def __init__(self, buf: bytes, ends: np.ndarray) -> None:
+        self._buf = buf
+        self._ends = ends
+
+    @classmethod
+    def from_strings(cls, values: Iterable[str]) -> "_StringColumn":
+        encoded = [v.encode("utf-8") for v in values]
+        ends = np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)))
+        return cls(b"".join(encoded), ends)
+
+    def __len__(self) -> int:
+        return int(self._ends.shape[0])
+
+    def _start(self, i: int) -> int:
+        return int(self._ends[i - 1]) if i else 0
+
+    def __getitem__(self, i: int) -> str:
+        return self._buf[self._start(i):int(self._ends[i])].decode("utf-8")
+
+    def slice(self, start: int, stop: int) -> "_StringColumn":
+        if stop <= start:
+            return _StringColumn(b"", np.zeros(0, dtype=np.int64))
+        base = self._start(start)
+        return _StringColumn(self._buf[base:int(self._ends[stop - 1])], self._ends[start:stop] - base)
+
+    def take(self, indices: np.ndarray) -> "_StringColumn":
+        return _StringColumn.from_strings(self[int(i)] for i in indices)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buf) + self._ends.nbytes
+
+
+class VideoBatch(Sequence):
+    """
+    Column store of videos. views / likes / comments / published_us are
+    int64, duration_s is float64 (NaN = unknown duration), published_us uses
+    timeparse.NO_DATE for an unknown publish date.
+    """
+
+    __slots__ = (
+        "views",
+        "likes",
+        "comments",
+        "duration_s",
+        "published_us",
+        "_strings",
+    )
+
+    def __init__(
+        self,
+        strings: Dict[str, _StringColumn],
+        views: np.ndarray,
+        likes: np.ndarray,
+        comments: np.ndarray,
+        duration_s: np.ndarray,
+        published_us: np.ndarray,
+    ) -> None:
+        self._strings = strings
+        self.views = views
+        self.likes = likes
+        self.comments = comments
+        self.duration_s = duration_s
+        self.published_us = published_us
+
+    @classmethod
+    def from_records(cls, videos: Iterable[Mapping[str, Any]]) -> "VideoBatch":
+        """
+        Pack VideoRecords or plain video dicts (e.g. loaded from JSON).
+        Records bring their parsed duration / publish time along; the dicts'
+        columns are parsed in bulk (timeparse.parse_durations / parse_timestamps).
+        """
+        if isinstance(videos, VideoBatch):
+            return videos
+        rows = [v if isinstance(v, VideoRecord) else _RawVideo(v) for v in videos]
+        n = len(rows)
+        strings = {
+            name: _StringColumn.from_strings(getattr(r, name) for r in rows)
+            for name in _STRING_FIELDS
+        }
+        duration_s = np.fromiter((r.duration_s for r in rows), dtype=np.float64, count=n)
+        published_us = np.fromiter((r.published_us for r in rows), dtype=np.int64, count=n)
+        raw = [i for i, r in enumerate(rows) if isinstance(r, _RawVideo)]
+        if raw:
+            duration_s[raw] = parse_durations([rows[i].duration for i in raw])
+            published_us[raw] = parse_timestamps([rows[i].publishedAt for i in raw])
+        return cls(
+            strings,
+            views=np.fromiter((r.views for r in rows), dtype=np.int64, count=n),
+            likes=np.fromiter((r.likes for r in rows), dtype=np.int64, count=n),
+            comments=np.fromiter((r.comments for r in rows), dtype=np.int64, count=n),
+            duration_s=duration_s,
+            published_us=published_us,
+        )
+
+    def __len__(self) -> int:
+        return int(self.views.shape[0])
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[VideoRecord, "VideoBatch"]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return self.take(np.arange(start, stop, step))
+            return VideoBatch(
+                {name: col.slice(start, stop) for name, col in self._strings.items()},
+                self.views[start:stop],
+                self.likes[start:stop],
+                self.comments[start:stop],
+                self.duration_s[start:stop],
+                self.published_us[start:stop],
+            )
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("VideoBatch index out of range")
+        return VideoRecord._from_columns(
+            (
+                self._strings["video_id"][index],
+                self._strings["title"][index],
+                self._strings["publishedAt"][index],
+                int(self.views[index]),
+                int(self.likes[index]),
+                int(self.comments[index]),
+                self._strings["duration"][index],
+            ),
+            float(self.duration_s[index]),
+            int(self.published_us[index]),
+        )
+
+    def take(self, indices: np.ndarray) -> "VideoBatch":
+        """
+        New batch with the rows at `indices`, in that order.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        return VideoBatch(
+            {name: col.take(indices) for name, col in self._strings.items()},
+            self.views[indices],
+            self.likes[indices],
+            self.comments[indices],
+            self.duration_s[indices],
+            self.published_us[indices],
+        )
+
+    def to_records(self) -> List[VideoRecord]:
+        return [self[i] for i in range(len(self))]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [self[i].to_dict() for i in range(len(self))]
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by the columns (strings + arrays).
+        """
+        arrays = (self.views, self.likes, self.comments, self.duration_s, self.published_us)
+        return sum(col.nbytes for col in self._strings.values()) + sum(a.nbytes for a in arrays)
+
+    def __repr__(self) -> str:
+        return f"VideoBatch({len(self)} videos)"
+
+
+def json_default(obj: Any) -> Any:
+    """
+    json.dumps(..., default=json_default): serializes VideoRecord /
+    VideoBatch (and NumPy scalars) only when the JSON is actually written.
+    """
+    if isinstance(obj, VideoRecord):
+        return obj.to_dict()
+    if isinstance(obj, VideoBatch):
+        return obj.to_dicts()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
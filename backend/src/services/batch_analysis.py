@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from src.services.youtube_analysis import _analysis_key, run_channel_analysis_async
+from src.youtube.client import YouTubeAPIError, get_channel_stats_many
+from src.youtube.quota import QuotaExceededError, tenant_scope
+
+DEFAULT_CONCURRENCY = int(os.getenv("BATCH_ANALYSIS_CONCURRENCY", "8"))
+
+# Quota tenant for batch work (keeps the interactive reserve untouched)
+_TENANT = "batch"
+
+
+def dedupe_inputs(inputs: List[str]) -> List[Dict[str, Any]]:
+    """
+    Group raw inputs that point at the same creator (via extract_identifier and
+    the resolution index). Keeps first-seen order.
+
+    Returns: [{"input": first raw input, "inputs": [...], "indexes": [...]}]
+    """
+    groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for i, raw in enumerate(inputs):
+        key = _analysis_key(raw)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = {"input": raw, "inputs": [raw], "indexes": [i]}
+        else:
+            group["inputs"].append(raw)
+            group["indexes"].append(i)
+    return list(groups.values())
+
+
+def _lookup_channels(raw_inputs: List[str]) -> List[Dict[str, Any]]:
+    with tenant_scope(_TENANT):
+        return get_channel_stats_many(raw_inputs)
+
+
+async def iter_batch_analysis(
+    inputs: List[str],
+    video_count: int = 8,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Analyse many creators, yielding one JSON-friendly line per unique creator
+    as soon as it is ready (completion order, not input order):
+
+        {"type": "result", "input": str, "inputs": [...], "indexes": [...],
+         "ok": bool, "result": {...} | None, "error": str | None}
+
+    followed by {"type": "summary", "total": int, "ok": int, "failed": int}.
+
+    Channel stats are fetched in batches of 50 first; per-creator video fetches
+    then run with at most `concurrency` in flight. A failing item never aborts
+    the batch.
+    """
+    # One resolution-index lookup per input (SQLite): off the event loop
+    groups = await asyncio.to_thread(dedupe_inputs, inputs)
+    if not groups:
+        yield {"type": "summary", "total": 0, "ok": 0, "failed": 0}
+        return
+
+    try:
+        lookups = await asyncio.to_thread(_lookup_channels, [g["input"] for g in groups])
+    except (ValueError, QuotaExceededError) as e:
+        lookups = [{"channel": None, "error": str(e)} for _ in groups]
+    except Exception as e:
+        print(f"[Batch analysis error] channel lookup: {e}")
+        lookups = [{"channel": None, "error": "Channel lookup failed."} for _ in groups]
+
+    semaphore = asyncio.Semaphore(max(int(concurrency), 1))
+
+    async def _analyse(group: Dict[str, Any], lookup: Dict[str, Any]) -> Dict[str, Any]:
+        line: Dict[str, Any] = {
+            "type": "result",
+            "input": group["input"],
+            "inputs": group["inputs"],
+            "indexes": group["indexes"],
+            "ok": False,
+            "result": None,
+            "error": None,
+        }
+        if lookup.get("channel") is None:
+            line["error"] = lookup.get("error") or "Could not resolve a YouTube channel."
+            return line
+
+        async with semaphore:
+            try:
+                with tenant_scope(_TENANT):
+                    line["result"] = await run_channel_analysis_async(
+                        lookup["channel"], video_count=video_count
+                    )
+                line["ok"] = True
+            except (ValueError, QuotaExceededError, YouTubeAPIError) as e:
+                line["error"] = str(e)
+            except Exception as e:
+                print(f"[Batch analysis error] {group['input']}: {e}")
+                line["error"] = "Internal error while analysing this creator."
+        return line
+
+    tasks = [
+        asyncio.ensure_future(_analyse(group, lookup))
+        for group, lookup in zip(groups, lookups)
+    ]
+    ok = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            line = await next_done
+            ok += int(line["ok"])
+            yield line
+    finally:
+        # Client went away: don't leave orphaned fetches running
+        for task in tasks:
+            task.cancel()
+
+    yield {"type": "summary", "total": len(groups), "ok": ok, "failed": len(groups) - ok}
@@ -0,0 +1,516 @@
+"""
+Background jobs for work that doesn't fit in an HTTP request.
+
+Jobs live in SQLite (no external broker) and are executed by a local pool of
+worker threads started with the API. Kinds:
+
+- "analysis": one run_youtube_analysis            params: youtube_input, video_count
+- "batch":    many creators, one item per input    params: inputs, video_count
+- "history":  deep upload history + report         params: youtube_input, days, max_videos
+                                                    (+ published_after, set at submit)
+- "archive":  move old snapshots to day partitions params: (none)
+- "refresh":  re-fetch stored video stats past due params: (none)
+
+The runner also queues a "refresh" job every JOB_REFRESH_SECONDS (0 = off),
+unless one is already queued or running.
+
+Progress is tracked as (progress_done, progress_total). Batch items and history
+pages are persisted as they complete, so a job interrupted by a restart is
+re-queued and resumes where it stopped instead of starting over.
+A claimed job carries its runner's owner id and a lease that the runner renews
+while it is alive (JOB_LEASE_SECONDS); only jobs whose lease has expired are
+re-queued, so several API processes can share one jobs database.
+Cancellation is cooperative: running jobs stop at the next item / page.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from src.services.youtube_analysis import build_result, run_channel_analysis, run_youtube_analysis
+from src.models.video import VideoBatch, json_default
+from src.utils.db import connect
+from src.youtube.archive import archive_until
+from src.youtube.client import YouTubeAPIError, get_channel_stats, get_channel_stats_many, iter_upload_pages
+from src.youtube.quota import QuotaExceededError, tenant_scope
+from src.youtube.sync import refresh_due_videos
+
+JOB_KINDS = ("analysis", "batch", "history", "archive", "refresh")
+
+_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+_REFRESH_SECONDS = float(os.getenv("JOB_REFRESH_SECONDS", "3600"))
+_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+# Quota tenant for job work
+_TENANT = "batch"
+
+# Batch inputs looked up per get_channel_stats_many call (one channels().list)
+_LOOKUP_CHUNK = 50
+
+
+class JobError(Exception):
+    pass
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+class JobStore:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._conn = connect("jobs")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id               TEXT PRIMARY KEY,
+                kind             TEXT NOT NULL,
+                params           TEXT NOT NULL,
+                status           TEXT NOT NULL,
+                progress_done    INTEGER NOT NULL DEFAULT 0,
+                progress_total   INTEGER NOT NULL DEFAULT 0,
+                result           TEXT,
+                error            TEXT,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                created_at       REAL NOT NULL,
+                started_at       REAL,
+                finished_at      REAL,
+                owner            TEXT,
+                lease_until      REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id  TEXT NOT NULL,
+                idx     INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (job_id, idx)
+            );
+            """
+        )
+        columns = {r["name"] for r in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "owner" not in columns:
+            # Jobs tables created before leases; running rows count as expired
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN lease_until REAL")
+
+    def create(self, kind: str, params: Dict[str, Any], total: int) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, params, status, progress_total, created_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, kind, json.dumps(params), total, time.time()),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row["id"],
+            "kind": row["kind"],
+            "params": json.loads(row["params"]),
+            "status": row["status"],
+            "progress": {"done": row["progress_done"], "total": row["progress_total"]},
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "cancel_requested": bool(row["cancel_requested"]),
+            "created_at": _iso(row["created_at"]),
+            "started_at": _iso(row["started_at"]),
+            "finished_at": _iso(row["finished_at"]),
+        }
+
+    def claim_next(self, owner: str, lease_seconds: float = _LEASE_SECONDS) -> Optional[Dict[str, Any]]:
+        """
+        Atomically move the oldest queued job to "running", leased to `owner`.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    now = time.time()
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', started_at = COALESCE(started_at, ?), "
+                        "owner = ?, lease_until = ? WHERE id = ?",
+                        (now, owner, now + lease_seconds, row["id"]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(row["id"]) if row is not None else None
+
+    def set_progress(self, job_id: str, done: int, total: Optional[int] = None) -> None:
+        with self._lock:
+            if total is None:
+                self._conn.execute("UPDATE jobs SET progress_done = ? WHERE id = ?", (done, job_id))
+            else:
+                self._conn.execute(
+                    "UPDATE jobs SET progress_done = ?, progress_total = ? WHERE id = ?",
+                    (done, total, job_id),
+                )
+
+    def finish(
+        self,
+        job_id: str,
+        status: str,
+        result: Any = None,
+        error: Optional[str] = None,
+        owner: Optional[str] = None,
+    ) -> None:
+        """
+        With `owner`, only applies while that runner still holds the job (its
+        lease may have expired and the job been claimed by another runner).
+        """
+        sql = "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_until = NULL WHERE id = ?"
+        params: List[Any] = [
+            status,
+            json.dumps(result, default=json_default) if result is not None else None,
+            error,
+            time.time(),
+            job_id,
+        ]
+        if owner is not None:
+            sql += " AND owner = ?"
+            params.append(owner)
+        with self._lock:
+            self._conn.execute(sql, params)
+
+    def request_cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', cancel_requested = 1, finished_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id),
+            )
+            self._conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+        return self.get(job_id)
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def has_pending(self, kind: str) -> bool:
+        """
+        Whether a job of this kind is queued or running.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM jobs WHERE kind = ? AND status IN ('queued', 'running') LIMIT 1",
+                (kind,),
+            ).fetchone()
+        return row is not None
+
+    def renew_leases(self, owner: str, lease_seconds: float = _LEASE_SECONDS) -> None:
+        """
+        Heartbeat: extend the lease of every job `owner` is running.
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE owner = ? AND status = 'running'",
+                (time.time() + lease_seconds, owner),
+            )
+
+    def requeue_expired(self) -> int:
+        """
+        Running jobs whose runner stopped renewing the lease (crashed or killed
+        process) go back to the queue. Jobs of live runners are left alone.
+        """
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, lease_until = NULL "
+                "WHERE status = 'running' AND (lease_until IS NULL OR lease_until < ?)",
+                (time.time(),),
+            )
+            return cur.rowcount
+
+    def put_item(self, job_id: str, idx: int, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_items (job_id, idx, payload) VALUES (?, ?, ?)",
+                (job_id, idx, json.dumps(payload, default=json_default)),
+            )
+
+    def items(self, job_id: str, offset: int = 0, limit: int = -1) -> Dict[int, Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, payload FROM job_items WHERE job_id = ? ORDER BY idx LIMIT ? OFFSET ?",
+                (job_id, limit, offset),
+            ).fetchall()
+        return {r["idx"]: json.loads(r["payload"]) for r in rows}
+
+
+_store: Optional[JobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = JobStore()
+    return _store
+
+
+# ---------------- HANDLERS ----------------
+
+def _check_cancel(store: JobStore, job_id: str) -> None:
+    if store.is_cancel_requested(job_id):
+        raise JobCancelled()
+
+
+def _run_analysis_job(store: JobStore, job: Dict[str, Any]) -> Any:
+    params = job["params"]
+    result = run_youtube_analysis(params["youtube_input"], video_count=params["video_count"])
+    store.set_progress(job["id"], 1)
+    return result
+
+
+def _run_batch_job(store: JobStore, job: Dict[str, Any]) -> Any:
+    params = job["params"]
+    inputs: List[str] = params["inputs"]
+    done = store.items(job["id"])
+    pending = [i for i in range(len(inputs)) if i not in done]
+
+    # Looked up chunk by chunk as the job goes, so a resumed job only looks
+    # up what is left; lookup errors (quota included) land on their items
+    completed = len(done)
+    for start in range(0, len(pending), _LOOKUP_CHUNK):
+        chunk = pending[start:start + _LOOKUP_CHUNK]
+        _check_cancel(store, job["id"])
+        lookups = get_channel_stats_many([inputs[i] for i in chunk])
+
+        for i, lookup in zip(chunk, lookups):
+            _check_cancel(store, job["id"])
+
+            item: Dict[str, Any] = {"input": inputs[i], "ok": False, "result": None, "error": None}
+            if lookup.get("channel") is None:
+                item["error"] = lookup.get("error") or "Could not resolve a YouTube channel."
+            else:
+                try:
+                    item["result"] = run_channel_analysis(lookup["channel"], video_count=params["video_count"])
+                    item["ok"] = True
+                except (ValueError, QuotaExceededError, YouTubeAPIError) as e:
+                    item["error"] = str(e)
+                except Exception as e:
+                    print(f"[Job {job['id']}] item {i} failed: {e}")
+                    item["error"] = "Internal error while analysing this creator."
+
+            store.put_item(job["id"], i, item)
+            completed += 1
+            store.set_progress(job["id"], completed)
+
+    ok = sum(1 for item in store.items(job["id"]).values() if item.get("ok"))
+    return {"total": len(inputs), "ok": ok, "failed": len(inputs) - ok}
+
+
+def _run_history_job(store: JobStore, job: Dict[str, Any]) -> Any:
+    params = job["params"]
+    channel = get_channel_stats(params["youtube_input"])
+    if not channel:
+        raise ValueError("Could not resolve a YouTube channel from the provided input.")
+
+    # Fixed at submit so a resumed job keeps the same cutoff; jobs queued
+    # before that was stored fall back to their creation time.
+    if params.get("published_after"):
+        published_after = datetime.fromisoformat(params["published_after"])
+    else:
+        published_after = datetime.fromisoformat(job["created_at"]) - timedelta(days=int(params["days"]))
+    max_videos = int(params["max_videos"])
+
+    # Resume from the pages persisted before an interruption
+    pages = store.items(job["id"])
+    videos: List[Dict[str, Any]] = [v for idx in sorted(pages) for v in pages[idx]["videos"]]
+    next_idx = max(pages) + 1 if pages else 0
+    page_token = pages[next_idx - 1]["next_page_token"] if pages else None
+    finished = bool(pages) and page_token is None
+
+    if not finished and len(videos) < max_videos:
+        for page in iter_upload_pages(
+            channel.get("uploads_playlist_id", ""),
+            published_after=published_after,
+            max_videos=max_videos - len(videos),
+            page_token=page_token,
+        ):
+            _check_cancel(store, job["id"])
+            store.put_item(
+                job["id"],
+                next_idx,
+                {"videos": page.videos, "next_page_token": page.next_page_token},
+            )
+            next_idx += 1
+            videos.extend(page.videos)
+            store.set_progress(job["id"], len(videos))
+
+    store.set_progress(job["id"], len(videos), len(videos))
+    # Deep histories are scored from one column batch, not thousands of dicts
+    return build_result(channel, VideoBatch.from_records(videos))
+
+
+def _run_archive_job(store: JobStore, job: Dict[str, Any]) -> Any:
+    written = archive_until()
+    store.set_progress(job["id"], 1)
+    return {"partitions": [p.name for p in written]}
+
+
+def _run_refresh_job(store: JobStore, job: Dict[str, Any]) -> Any:
+    refreshed = refresh_due_videos()
+    store.set_progress(job["id"], 1)
+    return {"refreshed": refreshed}
+
+
+_HANDLERS: Dict[str, Callable[[JobStore, Dict[str, Any]], Any]] = {
+    "analysis": _run_analysis_job,
+    "batch": _run_batch_job,
+    "history": _run_history_job,
+    "archive": _run_archive_job,
+    "refresh": _run_refresh_job,
+}
+
+
+# ---------------- WORKER POOL ----------------
+
+class JobRunner:
+    def __init__(self, store: JobStore, workers: int = _WORKERS) -> None:
+        self.store = store
+        self.workers = max(workers, 1)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        self._requeue_expired()
+        t = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        t.start()
+        self._threads.append(t)
+        for n in range(self.workers):
+            t = threading.Thread(target=self._loop, name=f"job-worker-{n}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        if _REFRESH_SECONDS > 0:
+            t = threading.Thread(target=self._schedule_refresh, name="job-refresh", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def _requeue_expired(self) -> None:
+        requeued = self.store.requeue_expired()
+        if requeued:
+            print(f"[Jobs] resuming {requeued} interrupted job(s)")
+            self.notify()
+
+    def _heartbeat(self) -> None:
+        # Renew well inside the lease, and pick up jobs of runners that died
+        while not self._stop.wait(_LEASE_SECONDS / 3):
+            try:
+                self.store.renew_leases(self.owner)
+                self._requeue_expired()
+            except Exception as e:
+                print(f"[Jobs] heartbeat failed: {e}")
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            job = self.store.claim_next(self.owner)
+            if job is None:
+                self._wake.wait(_POLL_SECONDS)
+                self._wake.clear()
+                continue
+            self._run(job)
+
+    def _schedule_refresh(self) -> None:
+        while not self._stop.wait(_REFRESH_SECONDS):
+            if not self.store.has_pending("refresh"):
+                self.store.create("refresh", {}, 1)
+                self.notify()
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        handler = _HANDLERS[job["kind"]]
+        try:
+            with tenant_scope(_TENANT):
+                result = handler(self.store, job)
+            self.store.finish(job["id"], "succeeded", result=result, owner=self.owner)
+        except JobCancelled:
+            self.store.finish(job["id"], "cancelled", owner=self.owner)
+        except (ValueError, QuotaExceededError, YouTubeAPIError) as e:
+            self.store.finish(job["id"], "failed", error=str(e), owner=self.owner)
+        except Exception as e:
+            print(f"[Job {job['id']}] failed: {e}")
+            self.store.finish(job["id"], "failed", error="Internal error", owner=self.owner)
+
+
+_runner: Optional[JobRunner] = None
+
+
+def get_job_runner() -> JobRunner:
+    global _runner
+    if _runner is None:
+        _runner = JobRunner(get_job_store())
+    return _runner
+
+
+def submit_job(kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate + enqueue a job. Raises JobError for bad input.
+    """
+    if kind not in JOB_KINDS:
+        raise JobError(f"Unknown job kind '{kind}'. Expected one of: {', '.join(JOB_KINDS)}.")
+
+    if kind == "batch":
+        if not params.get("inputs"):
+            raise JobError("Batch jobs need a non-empty 'inputs' list.")
+        total = len(params["inputs"])
+    elif kind == "history":
+        if not params.get("youtube_input"):
+            raise JobError("History jobs need 'youtube_input'.")
+        cutoff = datetime.now(timezone.utc) - timedelta(days=int(params["days"]))
+        params = {**params, "published_after": cutoff.isoformat()}
+        total = int(params["max_videos"])
+    elif kind in ("archive", "refresh"):
+        total = 1
+    else:
+        if not params.get("youtube_input"):
+            raise JobError("Analysis jobs need 'youtube_input'.")
+        total = 1
+
+    job = get_job_store().create(kind, params, total)
+    get_job_runner().notify()
+    return job
@@ -0,0 +1,207 @@
+"""
+Server-side store for saved analysis results (the Saved page).
+
+One row per saved run_youtube_analysis output. The headline numbers are copied
+into indexed columns so listing / filtering / sorting never decodes the full
+report JSON and never touches the YouTube API.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.models.video import json_default
+from src.utils.db import connect
+
+# Public sort keys -> column
+SORT_COLUMNS: Dict[str, str] = {
+    "created_at": "created_at",
+    "dashboard_score": "dashboard_score",
+    "engagement_rate_percent": "engagement_rate_percent",
+    "subscribers": "subscribers",
+    "median_views": "median_views",
+    "channel_name": "channel_name",
+}
+
+_SUMMARY_COLUMNS = (
+    "id, channel_id, channel_name, channel_url, region, tier, subscribers, "
+    "dashboard_score, engagement_rate_percent, median_views, mean_views, "
+    "video_count, created_at"
+)
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+def _summary(row: Any) -> Dict[str, Any]:
+    out = dict(row)
+    out["created_at"] = _iso(out["created_at"])
+    return out
+
+
+class ReportStore:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._conn = connect("reports")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS reports (
+                id                      INTEGER PRIMARY KEY AUTOINCREMENT,
+                channel_id              TEXT NOT NULL,
+                channel_name            TEXT NOT NULL,
+                channel_url             TEXT NOT NULL,
+                region                  TEXT NOT NULL,
+                tier                    TEXT NOT NULL,
+                subscribers             INTEGER NOT NULL,
+                dashboard_score         REAL NOT NULL,
+                engagement_rate_percent REAL NOT NULL,
+                median_views            REAL NOT NULL,
+                mean_views              REAL NOT NULL,
+                video_count             INTEGER NOT NULL,
+                created_at              REAL NOT NULL,
+                result                  TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_reports_channel ON reports (channel_id, created_at);
+            CREATE INDEX IF NOT EXISTS idx_reports_tier ON reports (tier, created_at);
+            CREATE INDEX IF NOT EXISTS idx_reports_score ON reports (dashboard_score);
+            CREATE INDEX IF NOT EXISTS idx_reports_engagement ON reports (engagement_rate_percent);
+            CREATE INDEX IF NOT EXISTS idx_reports_created ON reports (created_at);
+            """
+        )
+
+    def save(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store one run_youtube_analysis output; returns its summary row.
+        """
+        channel = result.get("channel") or {}
+        report = result.get("metrics_report") or {}
+        analysis = result.get("analysis") or {}
+        tier = (analysis.get("channel") or {}).get("tier") or "tiny"
+
+        values = (
+            channel.get("channel_id", ""),
+            channel.get("channel_name", ""),
+            channel.get("channel_url", ""),
+            channel.get("region", "Global"),
+            tier,
+            int(channel.get("subscribers", 0)),
+            float(report.get("dashboard_score", 0.0)),
+            float(report.get("engagement_rate_percent", 0.0)),
+            float(report.get("median_views", 0.0)),
+            float(report.get("mean_views", 0.0)),
+            len(result.get("videos") or []),
+            time.time(),
+            json.dumps(result, default=json_default),
+        )
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO reports (channel_id, channel_name, channel_url, region, tier, "
+                "subscribers, dashboard_score, engagement_rate_percent, median_views, "
+                "mean_views, video_count, created_at, result) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                values,
+            )
+            row = self._conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM reports WHERE id = ?", (cur.lastrowid,)
+            ).fetchone()
+        return _summary(row)
+
+    def get(self, report_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Summary + the full stored result.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS}, result FROM reports WHERE id = ?", (report_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        out = _summary(row)
+        out["result"] = json.loads(out["result"])
+        return out
+
+    def delete(self, report_id: int) -> bool:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM reports WHERE id = ?", (report_id,))
+        return cur.rowcount > 0
+
+    def list(
+        self,
+        channel_id: Optional[str] = None,
+        tier: Optional[str] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        min_engagement: Optional[float] = None,
+        max_engagement: Optional[float] = None,
+        latest_per_channel: bool = False,
+        sort: str = "created_at",
+        descending: bool = True,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Filtered, sorted page of summaries:
+            {"items": [...], "total": int, "limit": int, "offset": int}
+        """
+        column = SORT_COLUMNS.get(sort)
+        if column is None:
+            raise ValueError(f"Unknown sort '{sort}'. Expected one of: {', '.join(SORT_COLUMNS)}.")
+
+        where: List[str] = []
+        params: List[Any] = []
+        for clause, value in (
+            ("channel_id = ?", channel_id),
+            ("tier = ?", tier),
+            ("dashboard_score >= ?", min_score),
+            ("dashboard_score <= ?", max_score),
+            ("engagement_rate_percent >= ?", min_engagement),
+            ("engagement_rate_percent <= ?", max_engagement),
+        ):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        if latest_per_channel:
+            # Only the newest saved report of each creator
+            where.append(
+                "id = (SELECT r2.id FROM reports r2 WHERE r2.channel_id = reports.channel_id "
+                "ORDER BY r2.created_at DESC, r2.id DESC LIMIT 1)"
+            )
+
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+        direction = "DESC" if descending else "ASC"
+        page: Tuple[Any, ...] = (*params, int(limit), int(offset))
+
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT COUNT(*) AS n FROM reports {where_sql}", params
+            ).fetchone()["n"]
+            rows = self._conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM reports {where_sql} "
+                f"ORDER BY {column} {direction}, id {direction} LIMIT ? OFFSET ?",
+                page,
+            ).fetchall()
+
+        return {
+            "items": [_summary(r) for r in rows],
+            "total": int(total),
+            "limit": int(limit),
+            "offset": int(offset),
+        }
+
+
+_store: Optional[ReportStore] = None
+_store_lock = threading.Lock()
+
+
+def get_report_store() -> ReportStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ReportStore()
+    return _store
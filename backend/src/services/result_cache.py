@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# In-memory cache of fetched analysis inputs, keyed by resolved channel ID.
+# We store the full upload window (not the trimmed video_count), so any smaller
+# video_count can be served from the same entry.
+_CACHE: Dict[str, Dict[str, Any]] = {}
+_LOCK = threading.Lock()
+
+# Served as-is while younger than this
+_FRESH_SECONDS = float(os.getenv("ANALYSIS_CACHE_FRESH_SECONDS", str(10 * 60)))
+# Served immediately (with a background refresh) while younger than this
+_STALE_SECONDS = float(os.getenv("ANALYSIS_CACHE_STALE_SECONDS", str(24 * 3600)))
+_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "2000"))
+
+
+def get_cached_fetch(channel_id: str, video_count: int) -> Optional[Dict[str, Any]]:
+    """
+    Returns {"channel": {...}, "videos": [...], "ts": float, "stale": bool}
+    or None when there is no usable entry (missing, too old, or holding fewer
+    videos than requested while the channel has more).
+    """
+    if not channel_id:
+        return None
+    with _LOCK:
+        entry = _CACHE.get(channel_id)
+    if entry is None:
+        return None
+
+    age = time.time() - entry["ts"]
+    if age >= _STALE_SECONDS:
+        return None
+    if len(entry["videos"]) < video_count and not entry["complete"]:
+        return None
+
+    return {
+        "channel": entry["channel"],
+        "videos": entry["videos"][:video_count],
+        "ts": entry["ts"],
+        "stale": age >= _FRESH_SECONDS,
+    }
+
+
+def put_cached_fetch(
+    channel: Dict[str, Any], videos: List[Dict[str, Any]], requested: int
+) -> None:
+    """
+    `requested` is how many videos were asked for; fewer back means the
+    channel has no more uploads, so the entry covers every video_count.
+    Empty fetches are not cached: they can't be told apart from a failed or
+    not-yet-propagated upload list, and would pin "no videos" for the TTL.
+    """
+    channel_id = channel.get("channel_id", "")
+    if not channel_id or not videos:
+        return
+    with _LOCK:
+        if len(_CACHE) >= _MAX_ENTRIES and channel_id not in _CACHE:
+            oldest = min(_CACHE, key=lambda k: _CACHE[k]["ts"])
+            _CACHE.pop(oldest, None)
+        _CACHE[channel_id] = {
+            "ts": time.time(),
+            "channel": channel,
+            "videos": list(videos),
+            "complete": len(videos) < requested,
+        }
+
+
+def invalidate(channel_id: str) -> None:
+    with _LOCK:
+        _CACHE.pop(channel_id, None)
@@ -0,0 +1,157 @@
+"""
+Live rolling-window metrics (see src/metrics/windows.py) for recently viewed
+channels.
+
+A channel is seeded once from the snapshot store (every upload we have seen,
+with its latest stats) plus the videos of the analysis that asked for it.
+After that it is kept current by the snapshot listener: every videos() /
+channels() response fetched for any reason (analyses, the scheduled refresh
+job) updates the tracked channels, so serving the windows never rescans
+history or re-runs the analysis (see get_windows_async).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from src.metrics.windows import RollingWindows
+from src.services.youtube_analysis import _stored_channel_id, run_youtube_analysis_async
+from src.youtube.client import _video_from_item
+from src.youtube.snapshots import get_snapshot_store, subscribe
+
+# Channels kept in memory (least recently served are dropped first)
+_MAX_CHANNELS = int(os.getenv("ROLLING_WINDOW_MAX_CHANNELS", "1000"))
+# Upper bound on stored uploads used to seed one channel
+_SEED_VIDEOS = 5000
+
+
+class WindowRegistry:
+    def __init__(self, max_channels: int = _MAX_CHANNELS) -> None:
+        self._lock = threading.Lock()
+        self._channels: "OrderedDict[str, RollingWindows]" = OrderedDict()
+        # channel_id -> channel payload of the analysis that seeded it
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        self._max_channels = max_channels
+
+    def _seed(
+        self, channel_id: str, sub_count: int, videos: Iterable[Mapping[str, Any]]
+    ) -> RollingWindows:
+        windows = RollingWindows(sub_count=sub_count)
+        try:
+            stored = get_snapshot_store().videos_as_of(channel_id, windows.now_us / 1_000_000, _SEED_VIDEOS)
+        except Exception as e:
+            print(f"[Snapshot store error] {e}")
+            stored = []
+        windows.upsert_many(stored)
+        windows.upsert_many(videos)
+        return windows
+
+    def windows_for(
+        self, channel: Mapping[str, Any], videos: Iterable[Mapping[str, Any]] = ()
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Current windows of `channel` (a _channel_from_item dict), tracking it
+        from now on if it is not tracked yet. `videos` (e.g. the analysis
+        that triggered this) only seed a new channel; tracked channels are
+        already updated by observe().
+        """
+        channel_id = channel.get("channel_id", "")
+        sub_count = int(channel.get("subscribers", 0))
+        with self._lock:
+            windows = self._channels.get(channel_id)
+        if windows is None:
+            seeded = self._seed(channel_id, sub_count, videos)  # DB read outside the lock
+            with self._lock:
+                windows = self._channels.setdefault(channel_id, seeded)
+
+        with self._lock:
+            self._channels.move_to_end(channel_id)
+            self._payloads[channel_id] = dict(channel)
+            while len(self._channels) > self._max_channels:
+                evicted, _ = self._channels.popitem(last=False)
+                self._payloads.pop(evicted, None)
+            windows.set_sub_count(sub_count)
+            windows.advance()
+            return windows.windows()
+
+    def get(self, channel_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Windows of an already tracked channel, or None.
+        """
+        with self._lock:
+            windows = self._channels.get(channel_id)
+            if windows is None:
+                return None
+            windows.advance()
+            return windows.windows()
+
+    def tracked(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        """
+        {"channel": {...}, "windows": {...}} for a tracked channel, or None.
+        """
+        with self._lock:
+            windows = self._channels.get(channel_id)
+            payload = self._payloads.get(channel_id)
+            if windows is None or payload is None:
+                return None
+            self._channels.move_to_end(channel_id)
+            windows.advance()
+            return {
+                "channel": {**payload, "subscribers": windows.sub_count},
+                "windows": windows.windows(),
+            }
+
+    def observe(self, endpoint: str, items: List[Dict[str, Any]]) -> None:
+        """
+        Snapshot listener: fold fresh API items into tracked channels.
+        """
+        with self._lock:
+            if not self._channels:
+                return
+            for item in items:
+                stats = item.get("statistics")
+                if not stats:
+                    continue
+                if endpoint == "channels":
+                    windows = self._channels.get(item.get("id", ""))
+                    if windows is not None and "subscriberCount" in stats:
+                        windows.set_sub_count(int(stats.get("subscriberCount") or 0))
+                else:
+                    windows = self._channels.get(item.get("snippet", {}).get("channelId", ""))
+                    if windows is not None:
+                        windows.upsert(_video_from_item(item))
+
+
+_registry: Optional[WindowRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_window_registry() -> WindowRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = WindowRegistry()
+                subscribe(_registry.observe)
+    return _registry
+
+
+async def get_windows_async(youtube_input: str, video_count: int = 25) -> Dict[str, Any]:
+    """
+    {"channel": {...}, "windows": {...}} for a creator. A tracked channel is
+    served from the registry; otherwise one analysis run fetches and seeds it.
+    """
+    registry = get_window_registry()
+    channel_id = await asyncio.to_thread(_stored_channel_id, youtube_input)
+    if channel_id:
+        tracked = registry.tracked(channel_id)
+        if tracked is not None:
+            return tracked
+
+    result = await run_youtube_analysis_async(youtube_input, video_count=video_count)
+    windows = await asyncio.to_thread(registry.windows_for, result["channel"], result["videos"])
+    return {"channel": result["channel"], "windows": windows}
@@ -1,19 +1,70 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import asyncio
+import threading
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
+from src.youtube import async_client
 from src.youtube.client import get_channel_stats, get_recent_videos
+from src.youtube.parser import extract_identifier
+from src.youtube.resolution import get_resolution_index
+from src.youtube.snapshots import get_snapshot_store
+from src.services.result_cache import get_cached_fetch, put_cached_fetch
 from src.metrics.metrics import InfluencerMetrics
+from src.models.video import VideoBatch
 from src.analysis.analyser import build_analysis
+from src.utils.singleflight import AsyncSingleFlight, SingleFlight
 
+# Largest upload window fetched per channel (= the playlistItems page used by
+# get_recent_videos and the max video_count); smaller counts are sliced locally.
+# Fetches go through the incremental sync (src/youtube/sync.py), so a refresh
+# only lists new uploads and re-fetches stats that are due.
+_FETCH_COUNT = 25
 
-def run_youtube_analysis(youtube_input: str, video_count: int = 8) -> Dict[str, Any]:
+# Concurrent analyses of the same creator share one fetch
+_flights = SingleFlight()
+_async_flights = AsyncSingleFlight()
+
+# Channels with a stale-while-revalidate refresh in progress
+_refreshing: Set[Tuple[str, str]] = set()
+_refreshing_lock = threading.Lock()
+_refresh_tasks: Set["asyncio.Task[Any]"] = set()
+
+
+def _analysis_key(youtube_input: str) -> Tuple[str, str]:
+    """
+    Coalescing / cache key: the resolved channel ID when the resolution index
+    knows it, otherwise the normalized identifier.
+    """
+    identifier, id_type = extract_identifier(youtube_input)
+    if id_type != "channel_id":
+        known = get_resolution_index().get(identifier, id_type)
+        if known is not None and known.channel_id:
+            identifier, id_type = known.channel_id, "channel_id"
+        elif id_type in ("handle", "vanity"):
+            identifier = identifier.lower()
+    return id_type, identifier
+
+
+def _cached(key: Tuple[str, str], video_count: int) -> Optional[Dict[str, Any]]:
+    id_type, identifier = key
+    if id_type != "channel_id":
+        return None
+    return get_cached_fetch(identifier, video_count)
+
+
+def run_youtube_analysis(
+    youtube_input: str, video_count: int = 8, as_of: Optional[datetime] = None
+) -> Dict[str, Any]:
     """
     End-to-end orchestrator for the YouTube analysis MVP.
 
     Input:
         youtube_input: channel URL / handle / channel ID / video URL
         video_count: number of recent uploads to analyze
+        as_of: rebuild the report as it looked at this moment from stored
+               snapshots (no API calls); see run_analysis_as_of
 
     Output (JSON-friendly):
         {
@@ -22,13 +73,250 @@ def run_youtube_analysis(youtube_input: str, video_count: int = 8) -> Dict[str,
           "metrics_report": {...},
           "analysis": {...}
         }
+
+    The last 25 uploads are fetched once per channel and cached (see
+    result_cache.py); any video_count is then served from that window with the
+    report recomputed locally. A stale entry is served immediately while a
+    background refresh runs. Concurrent fetches of one channel are coalesced.
     """
+    if as_of is not None:
+        return run_analysis_as_of(youtube_input, as_of, video_count=video_count)
+
+    key = _analysis_key(youtube_input)
+    cached = _cached(key, video_count)
+    if cached is not None:
+        if cached["stale"]:
+            _refresh_in_background(youtube_input, key)
+        return build_result(cached["channel"], cached["videos"])
+
+    channel, videos = _flights.do(key, lambda: _fetch(youtube_input))
+    return build_result(channel, videos[:video_count])
+
+
+def _fetch(youtube_input: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
     channel = get_channel_stats(youtube_input)
     if not channel:
         raise ValueError("Could not resolve a YouTube channel from the provided input.")
 
-    videos = get_recent_videos(channel.get("uploads_playlist_id", ""), count=video_count)
+    return _fetch_videos(channel)
+
+
+def run_channel_analysis(channel: Dict[str, Any], video_count: int = 8) -> Dict[str, Any]:
+    """
+    Analysis for an already-fetched channel dict (e.g. from get_channel_stats_many),
+    skipping the channel lookup. Videos come from the result cache when fresh.
+    """
+    channel_id = channel.get("channel_id", "")
+    cached = get_cached_fetch(channel_id, video_count)
+    if cached is not None and not cached["stale"]:
+        return build_result(channel, cached["videos"])
+
+    _, videos = _flights.do(("channel_id", channel_id), lambda: _fetch_videos(channel))
+    return build_result(channel, videos[:video_count])
+
+
+def _fetch_videos(channel: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    # Raises on API errors, so a failed fetch never reaches the cache
+    videos = get_recent_videos(channel.get("uploads_playlist_id", ""), count=_FETCH_COUNT, incremental=True)
+    put_cached_fetch(channel, videos, _FETCH_COUNT)
+    return channel, videos
+
+
+def run_analysis_as_of(
+    youtube_input: str, as_of: datetime, video_count: int = 8
+) -> Dict[str, Any]:
+    """
+    Point-in-time analysis: channel + video stats are rebuilt from the
+    snapshot store (newest snapshot at or before `as_of` for each upload
+    published by then) and run through the usual metrics + analysis pipeline.
+    Makes no network calls; raises ValueError when nothing was recorded.
+    """
+    if as_of.tzinfo is None:
+        as_of = as_of.replace(tzinfo=timezone.utc)
+    ts = as_of.timestamp()
+
+    channel_id = _stored_channel_id(youtube_input)
+    store = get_snapshot_store()
+    channel = store.channel_as_of(channel_id, ts) if channel_id else None
+    if channel is None:
+        raise ValueError(f"No stored snapshots for this creator on or before {as_of.isoformat()}.")
+
+    videos = store.videos_as_of(channel_id, ts, video_count)
+    return build_result(channel, videos, as_of=as_of)
+
+
+def _stored_channel_id(youtube_input: str) -> Optional[str]:
+    """
+    Channel ID for an input without calling the API (resolution index, then
+    the snapshot store's video -> channel mapping for video URLs).
+    """
+    id_type, identifier = _analysis_key(youtube_input)
+    if id_type == "channel_id":
+        return identifier
+    if id_type == "video_id":
+        return get_snapshot_store().channel_for_video(identifier)
+    return None
+
+
+def _claim_refresh(key: Tuple[str, str]) -> bool:
+    with _refreshing_lock:
+        if key in _refreshing:
+            return False
+        _refreshing.add(key)
+        return True
+
+
+def _release_refresh(key: Tuple[str, str]) -> None:
+    with _refreshing_lock:
+        _refreshing.discard(key)
+
+
+def _refresh_in_background(youtube_input: str, key: Tuple[str, str]) -> None:
+    if not _claim_refresh(key):
+        return
+
+    def _run() -> None:
+        try:
+            _flights.do(key, lambda: _fetch(youtube_input))
+        except Exception as e:
+            print(f"[Analysis refresh failed] {e}")
+        finally:
+            _release_refresh(key)
+
+    threading.Thread(target=_run, daemon=True).start()
+
+
+async def run_youtube_analysis_async(
+    youtube_input: str, video_count: int = 8, as_of: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Same as run_youtube_analysis, but awaits the YouTube API over the shared
+    async connection pool instead of blocking a threadpool worker.
+    """
+    if as_of is not None:
+        return await asyncio.to_thread(
+            run_analysis_as_of, youtube_input, as_of, video_count
+        )
+
+    # The resolution index is SQLite-backed: keep its lookups off the event loop
+    key = await asyncio.to_thread(_analysis_key, youtube_input)
+    cached = _cached(key, video_count)
+    if cached is not None:
+        if cached["stale"]:
+            _refresh_in_background_async(youtube_input, key)
+        return build_result(cached["channel"], cached["videos"])
+
+    channel, videos = await _async_flights.do(key, lambda: _fetch_async(youtube_input))
+    return build_result(channel, videos[:video_count])
+
+
+async def _fetch_async(youtube_input: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    channel = await async_client.get_channel_stats(youtube_input)
+    if not channel:
+        raise ValueError("Could not resolve a YouTube channel from the provided input.")
+
+    return await _fetch_videos_async(channel)
+
+
+async def run_channel_analysis_async(
+    channel: Dict[str, Any], video_count: int = 8
+) -> Dict[str, Any]:
+    """
+    Analysis for an already-fetched channel dict (e.g. from get_channel_stats_many),
+    skipping the channel lookup. Videos come from the result cache when fresh.
+    """
+    channel_id = channel.get("channel_id", "")
+    cached = get_cached_fetch(channel_id, video_count)
+    if cached is not None and not cached["stale"]:
+        return build_result(channel, cached["videos"])
+
+    _, videos = await _async_flights.do(
+        ("channel_id", channel_id), lambda: _fetch_videos_async(channel)
+    )
+    return build_result(channel, videos[:video_count])
+
+
+async def _fetch_videos_async(
+    channel: Dict[str, Any]
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    videos = await async_client.get_recent_videos(
+        channel.get("uploads_playlist_id", ""), count=_FETCH_COUNT, incremental=True
+    )
+    put_cached_fetch(channel, videos, _FETCH_COUNT)
+    return channel, videos
+
+
+def _refresh_in_background_async(youtube_input: str, key: Tuple[str, str]) -> None:
+    if not _claim_refresh(key):
+        return
+
+    async def _run() -> None:
+        try:
+            await _async_flights.do(key, lambda: _fetch_async(youtube_input))
+        except Exception as e:
+            print(f"[Analysis refresh failed] {e}")
+        finally:
+            _release_refresh(key)
 
+    # Keep a reference so the task isn't garbage-collected mid-flight
+    task = asyncio.ensure_future(_run())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+async def iter_youtube_analysis_events(
+    youtube_input: str, video_count: int = 8
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Progressive run_youtube_analysis_async: yields (event, payload) pairs as each
+    stage finishes, in this order:
+
+        ("channel", {...}), ("videos", [...]), ("metrics_report", {...}), ("analysis", {...})
+
+    The channel block is available after the first API call, so a client can
+    render the creator header before the uploads arrive.
+    """
+    key = await asyncio.to_thread(_analysis_key, youtube_input)
+    cached = _cached(key, video_count)
+    if cached is not None:
+        if cached["stale"]:
+            _refresh_in_background_async(youtube_input, key)
+        channel, videos = cached["channel"], cached["videos"]
+        yield "channel", _channel_payload(channel)
+    else:
+        channel = await async_client.get_channel_stats(youtube_input)
+        if not channel:
+            raise ValueError("Could not resolve a YouTube channel from the provided input.")
+        yield "channel", _channel_payload(channel)
+
+        _, videos = await _async_flights.do(
+            ("channel_id", channel.get("channel_id", "")),
+            lambda: _fetch_videos_async(channel),
+        )
+        videos = videos[:video_count]
+
+    yield "videos", videos
+
+    report = _compute_report(channel, videos)
+    yield "metrics_report", report
+
+    yield "analysis", build_analysis(report)
+
+
+def _channel_payload(channel: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "channel_id": channel.get("channel_id", ""),
+        "channel_name": channel.get("channel_name", ""),
+        "subscribers": int(channel.get("subscribers", 0)),
+        "region": channel.get("region", "Global"),
+        "channel_url": channel.get("channel_url", ""),
+        "uploads_playlist_id": channel.get("uploads_playlist_id", ""),
+    }
+
+
+def _compute_report(
+    channel: Dict[str, Any], videos: List[Dict[str, Any]], as_of: Optional[datetime] = None
+) -> Dict[str, Any]:
     # Metrics layer (this produces the standardized keys our analyser expects)
     metrics = InfluencerMetrics(
         channel_name=channel.get("channel_name", ""),
@@ -36,24 +324,29 @@ def run_youtube_analysis(youtube_input: str, video_count: int = 8) -> Dict[str,
         video_data=videos,
         region=channel.get("region", "Global"),
         channel_url=channel.get("channel_url", ""),
+        as_of=as_of,
     )
     report = metrics.get_performance_report()
     if not report:
         raise ValueError("No video data returned for this channel (or playlist is empty).")
+    return report
+
+
+def build_result(
+    channel: Dict[str, Any], videos: List[Dict[str, Any]], as_of: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Metrics + analysis layers on top of fetched channel/video data.
+    """
+    report = _compute_report(channel, videos, as_of=as_of)
 
     # Analysis layer (benchmarks + tiering)
     analysis = build_analysis(report)
 
     return {
-        "channel": {
-            "channel_id": channel.get("channel_id", ""),
-            "channel_name": channel.get("channel_name", ""),
-            "subscribers": int(channel.get("subscribers", 0)),
-            "region": channel.get("region", "Global"),
-            "channel_url": channel.get("channel_url", ""),
-            "uploads_playlist_id": channel.get("uploads_playlist_id", ""),
-        },
-        "videos": videos,                 # raw list for frontend charting
+        "channel": _channel_payload(channel),
+        # raw list for frontend charting (records serialize lazily)
+        "videos": videos.to_records() if isinstance(videos, VideoBatch) else videos,
         "metrics_report": report,         # computed rollups
         "analysis": analysis,             # benchmark comparisons + tiering
     }
@@ -0,0 +1,39 @@
+"""
+src/utils/db.py
+Tiny helper for the local SQLite files the backend keeps (caches, indexes, stores).
+
+All files live under INFLUENCER_INTEL_DATA_DIR (default: backend/.data).
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+_DEFAULT_DATA_DIR = Path(__file__).resolve().parents[2] / ".data"
+
+
+def data_dir() -> Path:
+    path = Path(os.getenv("INFLUENCER_INTEL_DATA_DIR", str(_DEFAULT_DATA_DIR)))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def connect(name: str) -> sqlite3.Connection:
+    """
+    Open (or create) <data_dir>/<name>.sqlite3 in WAL mode.
+
+    The connection may be shared across threads; callers are expected to
+    serialise access with their own lock.
+    """
+    conn = sqlite3.connect(
+        str(data_dir() / f"{name}.sqlite3"),
+        timeout=30,
+        check_same_thread=False,
+        isolation_level=None,  # autocommit; use explicit BEGIN for batches
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
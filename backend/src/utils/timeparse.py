@@ -0,0 +1,143 @@
+"""
+src/utils/timeparse.py
+Parsing for the two time formats the YouTube API returns: ISO-8601 durations
+("PT4M13S") and RFC 3339 timestamps ("2024-05-01T12:00:00Z").
+
+Both parse to plain numbers (seconds / epoch microseconds) so they can live in
+typed arrays; NaN / NO_DATE mark values that are missing or unparseable.
+Durations in the shapes the API returns take a regex fast path (isodate only
+sees the rest); timestamp columns are parsed by NumPy in bulk. Parse at ingest
+(VideoRecord / VideoBatch do) and keep the numbers, rather than re-parsing
+strings per report or sort.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence
+
+import isodate
+import numpy as np
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+
+# Sentinel for "no usable publish date" in epoch-microsecond arrays
+NO_DATE = int(np.iinfo(np.int64).min)
+
+# What videos().list returns: "PT4M13S", "PT1H2S", "P1DT3H" (long streams),
+# "P0D" (live / upcoming). Anything else goes through isodate.
+_YT_DURATION = re.compile(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?", re.ASCII)
+
+# What snippet.publishedAt looks like: "2024-05-01T12:00:00Z" (year 0 is
+# valid for NumPy but not for datetime, so it is left to timestamp_us)
+_YT_TIMESTAMP = re.compile(r"(?!0000)\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ", re.ASCII)
+
+
+@lru_cache(maxsize=4096)
+def duration_seconds(raw: str) -> float:
+    """
+    ISO-8601 duration -> seconds; NaN when missing or unparseable.
+    """
+    if not raw:
+        return math.nan
+    if isinstance(raw, str) and raw[-1] != "T" and len(raw) > 1:
+        m = _YT_DURATION.fullmatch(raw)
+        if m is not None:
+            d, h, mi, sec = m.groups()
+            return float(
+                (int(d) * 86400 if d else 0)
+                + (int(h) * 3600 if h else 0)
+                + (int(mi) * 60 if mi else 0)
+                + (int(sec) if sec else 0)
+            )
+    try:
+        return isodate.parse_duration(raw).total_seconds()
+    except (TypeError, ValueError, isodate.ISO8601Error):
+        return math.nan
+
+
+def to_epoch_us(dt: datetime) -> int:
+    """
+    datetime -> integer epoch microseconds (naive values are taken as UTC).
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _US
+
+
+def timestamp_us(raw: Any) -> int:
+    """
+    One RFC 3339 timestamp -> epoch microseconds, NO_DATE when unusable.
+    (datetime.fromisoformat is C code and already the fastest scalar path;
+    columns should go through parse_timestamps.)
+    """
+    if not raw or not isinstance(raw, str):
+        return NO_DATE
+    try:
+        return to_epoch_us(datetime.fromisoformat(raw.replace("Z", "+00:00")))
+    except ValueError:
+        return NO_DATE
+
+
+def timestamp_seconds(raw: Any) -> Optional[float]:
+    """
+    timestamp_us in epoch seconds (datetime.timestamp() units); None when unusable.
+    """
+    us = timestamp_us(raw)
+    return None if us == NO_DATE else us / 1_000_000
+
+
+# ---------------- BULK (array in / array out) ----------------
+
+def parse_durations(raw_values: Sequence[Any]) -> np.ndarray:
+    """
+    Durations -> float64 seconds (NaN when unusable). Channels reuse a handful
+    of lengths, so each distinct string is parsed once.
+    """
+    seen: Dict[Any, float] = {}
+    out = np.empty(len(raw_values), dtype=np.float64)
+    for i, raw in enumerate(raw_values):
+        try:
+            value = seen[raw]
+        except KeyError:
+            value = seen[raw] = duration_seconds(raw)
+        except TypeError:  # unhashable junk
+            value = math.nan
+        out[i] = value
+    return out
+
+
+def _is_api_timestamp(raw: Any) -> bool:
+    return isinstance(raw, str) and _YT_TIMESTAMP.fullmatch(raw) is not None
+
+
+def parse_timestamps(raw_values: Sequence[Any]) -> np.ndarray:
+    """
+    Timestamps -> int64 epoch microseconds (NO_DATE when unusable).
+    Values in the API's "YYYY-MM-DDTHH:MM:SSZ" form are parsed by NumPy in
+    one call; only the others go through timestamp_us.
+    """
+    n = len(raw_values)
+    api = [i for i, r in enumerate(raw_values) if _is_api_timestamp(r)]
+    if api:
+        try:
+            parsed = np.array(
+                [raw_values[i][:-1] for i in api], dtype="datetime64[us]"
+            ).astype(np.int64)
+        except ValueError:
+            api = []  # something NumPy rejects: parse every value one by one
+    if not api:
+        return np.fromiter((timestamp_us(r) for r in raw_values), dtype=np.int64, count=n)
+    if len(api) == n:
+        return parsed
+    out = np.fromiter(
+        (NO_DATE if _is_api_timestamp(r) else timestamp_us(r) for r in raw_values),
+        dtype=np.int64,
+        count=n,
+    )
+    out[api] = parsed
+    return out
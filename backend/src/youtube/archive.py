@@ -0,0 +1,383 @@
+"""
+src/youtube/archive.py
+Columnar, day-partitioned archive for old statistics snapshots.
+
+Hot snapshots live in SQLite (snapshots.py). Once a UTC day is complete and
+older than SNAPSHOT_HOT_DAYS, archive_until() moves it into one file per kind
+per day:
+
+    <data_dir>/archive/<kind>/<YYYY-MM-DD>.iia
+
+Rows are grouped into one segment per channel / video (sorted by key, ts) and
+stored column by column. Inside a segment every column is delta encoded (the
+first value as-is), zigzag mapped and written as LEB128 varints, so counters
+that only creep upwards cost one or two bytes per row.
+
+File layout (little endian):
+
+    header     b"IIA1", u8 kind, u8 ncols, u32 nsegments, u32 nrows
+    directory  nsegments x (u32 key, u32 nrows, u32 offset per column)
+    data       varint bytes, column-major, offsets absolute in the file
+
+Readers mmap the file and binary-search the directory, so reading one
+channel / video decodes only its own segment. At most ARCHIVE_MAX_OPEN
+partitions stay mapped (least recently used are dropped); a map is closed
+once no reader holds it, and a partition being rewritten is unmapped first
+(a mapped file can't be replaced on Windows).
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .snapshots import SNAPSHOT_COLUMNS, get_snapshot_store
+from src.utils.db import data_dir
+
+HOT_DAYS = int(os.getenv("SNAPSHOT_HOT_DAYS", "30"))
+MAX_OPEN = max(int(os.getenv("ARCHIVE_MAX_OPEN", "64")), 1)
+
+_MAGIC = b"IIA1"
+_HEADER = struct.Struct("<4sBBII")
+_KINDS = ("channel", "video")
+
+_DAY_SECONDS = 86400
+_MAX_TS = 253402300799  # 9999-12-31, the last datetime.fromtimestamp can represent
+
+_lock = threading.Lock()
+# Signalled when a reader releases a partition or a rewrite finishes
+_released = threading.Condition(_lock)
+
+
+# ---------------- VARINT CODEC ----------------
+
+def _encode_column(values: Sequence[int], out: bytearray) -> None:
+    """
+    Delta + zigzag + LEB128 varint, appended to `out`.
+    """
+    prev = 0
+    for v in values:
+        d = v - prev
+        prev = v
+        z = (d << 1) ^ (d >> 63)
+        while z >= 0x80:
+            out.append((z & 0x7F) | 0x80)
+            z >>= 7
+        out.append(z)
+
+
+def _decode_column(buf, pos: int, count: int) -> List[int]:
+    values: List[int] = []
+    prev = 0
+    for _ in range(count):
+        z = 0
+        shift = 0
+        while True:
+            b = buf[pos]
+            pos += 1
+            z |= (b & 0x7F) << shift
+            if b < 0x80:
+                break
+            shift += 7
+        prev += (z >> 1) ^ -(z & 1)
+        values.append(prev)
+    return values
+
+
+# ---------------- PARTITION FILES ----------------
+
+def archive_dir(kind: str) -> Path:
+    path = data_dir() / "archive" / kind
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def partition_path(kind: str, day: date) -> Path:
+    return archive_dir(kind) / f"{day.isoformat()}.iia"
+
+
+def write_partition(kind: str, day: date, rows: Sequence[Tuple[int, ...]]) -> Path:
+    """
+    Write rows (key, ts, *values) sorted by (key, ts) as one day partition.
+    The file is written to a temp name and renamed, so readers never see a
+    half-written partition.
+    """
+    ncols = 1 + len(SNAPSHOT_COLUMNS[kind])  # ts + values
+
+    segments: List[Tuple[int, int, int]] = []  # (key, start, end)
+    start = 0
+    for i in range(1, len(rows) + 1):
+        if i == len(rows) or rows[i][0] != rows[start][0]:
+            segments.append((rows[start][0], start, i))
+            start = i
+
+    dir_entry = struct.Struct("<II" + "I" * ncols)
+    data_start = _HEADER.size + dir_entry.size * len(segments)
+
+    columns = [bytearray() for _ in range(ncols)]
+    offsets: List[List[int]] = []
+    for _, seg_start, seg_end in segments:
+        seg_offsets = []
+        for c in range(ncols):
+            seg_offsets.append(len(columns[c]))
+            _encode_column([row[c + 1] for row in rows[seg_start:seg_end]], columns[c])
+        offsets.append(seg_offsets)
+
+    col_base = []
+    base = data_start
+    for col in columns:
+        col_base.append(base)
+        base += len(col)
+
+    out = bytearray(_HEADER.pack(_MAGIC, _KINDS.index(kind), ncols, len(segments), len(rows)))
+    for (key, seg_start, seg_end), seg_offsets in zip(segments, offsets):
+        out += dir_entry.pack(
+            key, seg_end - seg_start, *(col_base[c] + seg_offsets[c] for c in range(ncols))
+        )
+    for col in columns:
+        out += col
+
+    path = partition_path(kind, day)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(out)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    with _lock:
+        _days.pop(kind, None)
+    return path
+
+
+class ArchivePartition:
+    """
+    Read-only, memory-mapped view of one day partition.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, _, self.ncols, self.nsegments, self.nrows = _HEADER.unpack_from(self._buf, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"Not an archive partition: {path}")
+        self._entry = struct.Struct("<II" + "I" * self.ncols)
+        # Readers currently using the map (guarded by _lock), and whether it
+        # has left the cache and should be closed by the last of them
+        self._refs = 0
+        self._retired = False
+
+    def close(self) -> None:
+        self._buf.close()
+
+    def _dir(self, i: int) -> Tuple[int, ...]:
+        return self._entry.unpack_from(self._buf, _HEADER.size + i * self._entry.size)
+
+    def keys(self) -> List[int]:
+        return [self._dir(i)[0] for i in range(self.nsegments)]
+
+    def segment(self, key: int) -> List[Tuple[int, ...]]:
+        """
+        Rows (ts, *values) of one key, or [] if the key has none this day.
+        """
+        lo, hi = 0, self.nsegments
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._dir(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.nsegments:
+            return []
+        entry = self._dir(lo)
+        if entry[0] != key:
+            return []
+        count = entry[1]
+        cols = [_decode_column(self._buf, offset, count) for offset in entry[2:]]
+        return list(zip(*cols))
+
+    def scan(self) -> Iterator[Tuple[int, ...]]:
+        """
+        Every row as (key, ts, *values), in (key, ts) order.
+        """
+        for i in range(self.nsegments):
+            entry = self._dir(i)
+            cols = [_decode_column(self._buf, offset, entry[1]) for offset in entry[2:]]
+            for row in zip(*cols):
+                yield (entry[0],) + row
+
+
+_open: "OrderedDict[Path, ArchivePartition]" = OrderedDict()  # LRU, newest last
+_rewriting: Set[Path] = set()
+_days: Dict[str, List[date]] = {}
+
+
+def partition_days(kind: str) -> List[date]:
+    """
+    Sorted days that have a partition for `kind` (cached; refreshed on write).
+    """
+    with _lock:
+        days = _days.get(kind)
+        if days is None:
+            days = sorted(date.fromisoformat(p.stem) for p in archive_dir(kind).glob("*.iia"))
+            _days[kind] = days
+    return days
+
+
+def _retire(part: ArchivePartition) -> None:
+    # Caller holds _lock and has removed `part` from _open
+    part._retired = True
+    if part._refs == 0:
+        part.close()
+
+
+@contextmanager
+def _checkout(kind: str, day: date) -> Iterator[Optional[ArchivePartition]]:
+    """
+    The mapped partition of one day (None if there is none), held open for
+    the duration of the block.
+    """
+    path = partition_path(kind, day)
+    with _released:
+        while path in _rewriting:
+            _released.wait()
+        part = _open.get(path)
+        if part is not None:
+            _open.move_to_end(path)
+        elif path.exists():
+            part = ArchivePartition(path)
+            _open[path] = part
+            while len(_open) > MAX_OPEN:
+                _retire(_open.popitem(last=False)[1])
+        if part is not None:
+            part._refs += 1
+    try:
+        yield part
+    finally:
+        if part is not None:
+            with _released:
+                part._refs -= 1
+                if part._refs == 0:
+                    if part._retired:
+                        part.close()
+                    _released.notify_all()
+
+
+@contextmanager
+def _rewrite(kind: str, day: date) -> Iterator[List[Tuple[int, ...]]]:
+    """
+    Take one day partition away from readers while it is rewritten: waits for
+    current readers, unmaps it and yields its rows ([] if there is none yet).
+    New readers wait until the block exits.
+    """
+    path = partition_path(kind, day)
+    with _released:
+        while path in _rewriting:
+            _released.wait()
+        _rewriting.add(path)
+        part = _open.pop(path, None)
+        while part is not None and part._refs:
+            _released.wait()
+    try:
+        if part is None and path.exists():
+            part = ArchivePartition(path)
+        rows: List[Tuple[int, ...]] = []
+        if part is not None:
+            rows = list(part.scan())
+            part.close()
+        yield rows
+    finally:
+        with _released:
+            _rewriting.discard(path)
+            _released.notify_all()
+
+
+def _day_of(ts: float) -> date:
+    return datetime.fromtimestamp(ts, timezone.utc).date()
+
+
+def _day_start(day: date) -> int:
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+
+
+# ---------------- PUBLIC API ----------------
+
+def read_archived(kind: str, key: int, since: float, until: float) -> Iterator[Tuple[int, ...]]:
+    """
+    (ts, *values) rows of one channel / video key with since <= ts <= until,
+    oldest first, from the day partitions covering that range.
+    """
+    days = partition_days(kind)
+    first, last = _day_of(max(since, 0)), _day_of(min(until, _MAX_TS))
+    for day in days[bisect_left(days, first):bisect_right(days, last)]:
+        # Decode inside the checkout; the map isn't held across yields
+        with _checkout(kind, day) as part:
+            rows = part.segment(key) if part is not None else []
+        for row in rows:
+            if since <= row[0] <= until:
+                yield row
+
+
+def latest_archived(
+    kind: str, key: int, until: float, since: float = 0
+) -> Optional[Tuple[int, ...]]:
+    """
+    The newest archived (ts, *values) row of one key in [since, until],
+    walking day partitions backwards; None if there is none.
+    """
+    days = partition_days(kind)
+    lo = bisect_left(days, _day_of(max(since, 0)))
+    hi = bisect_right(days, _day_of(min(until, _MAX_TS)))
+    for day in reversed(days[lo:hi]):
+        with _checkout(kind, day) as part:
+            if part is None:
+                continue
+            rows = [row for row in part.segment(key) if since <= row[0] <= until]
+        if rows:
+            return rows[-1]
+    return None
+
+
+def archive_until(cutoff: Optional[float] = None) -> List[Path]:
+    """
+    Move every complete UTC day before `cutoff` (default: now - HOT_DAYS) from
+    SQLite into day partitions, then prune those rows from SQLite.
+    Safe to re-run: days are rewritten whole, pruning happens last.
+    """
+    store = get_snapshot_store()
+    cutoff = time.time() - HOT_DAYS * _DAY_SECONDS if cutoff is None else cutoff
+    end_day = _day_of(cutoff)  # exclusive: only complete days
+
+    # From 0, not archived_before(): late rows for archived days are merged in
+    firsts = [store.oldest_ts(kind, 0, _day_start(end_day)) for kind in _KINDS]
+    firsts = [ts for ts in firsts if ts is not None]
+    if not firsts:
+        return []
+    oldest = min(firsts)
+
+    written: List[Path] = []
+    day = _day_of(oldest)
+    while day < end_day:
+        start, end = _day_start(day), _day_start(day + timedelta(days=1))
+        for kind in _KINDS:
+            rows = store.rows_between(kind, start, end)
+            if not rows:
+                continue
+            with _rewrite(kind, day) as existing:
+                if existing:
+                    # Late rows for an already archived day: merge + rewrite
+                    rows = sorted(set(existing) | set(rows))
+                written.append(write_partition(kind, day, rows))
+        day += timedelta(days=1)
+
+    store.prune_before(_day_start(end_day))
+    return written
@@ -0,0 +1,286 @@
+"""
+src/youtube/async_client.py
+Native asyncio counterpart of src/youtube/client.py.
+
+Talks to the YouTube Data API v3 REST endpoints directly over httpx, using one
+shared AsyncClient (and therefore one shared connection pool) per process.
+Function names, inputs and return shapes mirror the sync client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .cache import CacheEntry, ResponseCache, cache_key, get_response_cache
+from .client import (
+    YouTubeAPIError,
+    _channel_from_item,
+    _most_recent,
+    _record_handle_resolution,
+    _video_from_item,
+)
+from .parser import extract_identifier
+from .pool import _get_api_key
+from .quota import QuotaExceededError, get_quota_ledger
+from .resolution import get_resolution_index
+from .snapshots import record_response
+from src.utils.singleflight import AsyncSingleFlight
+
+_API_BASE = "https://www.googleapis.com/youtube/v3"
+
+_HTTP_TIMEOUT_SECONDS = float(os.getenv("YOUTUBE_HTTP_TIMEOUT", "15"))
+_MAX_CONNECTIONS = int(os.getenv("YOUTUBE_ASYNC_MAX_CONNECTIONS", "100"))
+_MAX_KEEPALIVE = int(os.getenv("YOUTUBE_ASYNC_MAX_KEEPALIVE", "20"))
+
+_client: Optional[httpx.AsyncClient] = None
+_flights = AsyncSingleFlight()
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=_API_BASE,
+            timeout=_HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=_MAX_CONNECTIONS,
+                max_keepalive_connections=_MAX_KEEPALIVE,
+            ),
+        )
+    return _client
+
+
+async def close_async_client() -> None:
+    """
+    Close the shared connection pool (e.g. on app shutdown).
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _api_get(resource: str, **params: Any) -> Dict[str, Any]:
+    """
+    GET /youtube/v3/<resource> and return the decoded JSON body.
+    Goes through the shared ETag response cache (see cache.py) and the quota
+    scheduler (see quota.py); concurrent misses for the same key share one request.
+    Raises httpx.HTTPStatusError on non-2xx, non-304 responses.
+
+    The cache, quota ledger and snapshot store are SQLite-backed and take
+    thread locks, so every call into them runs in a worker thread: a slow
+    disk write must not stall the other analyses on this event loop.
+    """
+    client = _get_async_client()
+    request = client.build_request("GET", f"/{resource}", params=params)
+
+    cache = get_response_cache()
+    key = cache_key(str(request.url))
+    entry = await asyncio.to_thread(cache.get, key, allow_expired=True)
+    if entry is not None and cache.is_fresh(entry):
+        return entry.payload
+
+    return await _flights.do(key, lambda: _send_miss(client, request, resource, cache, key, entry))
+
+
+async def _send_miss(
+    client: httpx.AsyncClient,
+    request: httpx.Request,
+    resource: str,
+    cache: ResponseCache,
+    key: str,
+    entry: Optional[CacheEntry],
+) -> Dict[str, Any]:
+    try:
+        delay = await asyncio.to_thread(get_quota_ledger().admit, resource)
+    except QuotaExceededError:
+        if entry is not None:
+            return entry.payload
+        raise
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+    request.url = request.url.copy_merge_params({"key": _get_api_key()})
+    if entry is not None and entry.etag and cache.is_usable(entry):
+        request.headers["If-None-Match"] = entry.etag
+
+    resp = await client.send(request)
+    if resp.status_code == 304 and entry is not None:
+        await asyncio.to_thread(cache.touch, key)
+        return entry.payload
+    resp.raise_for_status()
+
+    payload = resp.json()
+    await asyncio.to_thread(_store_response, cache, key, resource, payload)
+    return payload
+
+
+def _store_response(cache: ResponseCache, key: str, resource: str, payload: Dict[str, Any]) -> None:
+    cache.put(key, payload.get("etag", ""), payload)
+    record_response(resource, payload)
+
+
+async def _resolve_channel_id_from_video_id(video_id: str) -> Optional[str]:
+    """
+    Given a YouTube video ID, return the owning channelId.
+    """
+    if not video_id:
+        return None
+    known = await asyncio.to_thread(get_resolution_index().get, video_id, "video_id")
+    if known is not None:
+        return known.channel_id
+    try:
+        resp = await _api_get("videos", part="snippet", id=video_id)
+        items = resp.get("items", [])
+        channel_id = items[0].get("snippet", {}).get("channelId") if items else None
+        await asyncio.to_thread(get_resolution_index().put, video_id, "video_id", channel_id)
+        return channel_id
+    except QuotaExceededError:
+        raise
+    except httpx.HTTPStatusError as e:
+        print(f"[YouTube API HttpError] {e}")
+        return None
+    except Exception as e:
+        print(f"[YouTube API Error] {e}")
+        return None
+
+
+async def _resolve_channel_id_from_vanity(query: str) -> Optional[str]:
+    """
+    Best-effort resolution for /c/ and /user/ inputs or custom names.
+    Uses YouTube search API to find the most relevant channel.
+    """
+    if not query:
+        return None
+    known = await asyncio.to_thread(get_resolution_index().get, query, "vanity")
+    if known is not None:
+        return known.channel_id
+    try:
+        resp = await _api_get(
+            "search", part="snippet", q=query, type="channel", maxResults=1
+        )
+        items = resp.get("items", [])
+        channel_id = items[0].get("snippet", {}).get("channelId") if items else None
+        await asyncio.to_thread(get_resolution_index().put, query, "vanity", channel_id)
+        return channel_id
+    except QuotaExceededError:
+        raise
+    except httpx.HTTPStatusError as e:
+        print(f"[YouTube API HttpError] {e}")
+        return None
+    except Exception as e:
+        print(f"[YouTube API Error] {e}")
+        return None
+
+
+async def get_channel_stats(channel_input: str) -> Optional[Dict[str, Any]]:
+    """
+    Async version of client.get_channel_stats (same return shape).
+    """
+    identifier, id_type = extract_identifier(channel_input)
+    _get_api_key()  # fail fast (ValueError) like the sync client
+
+    try:
+        channel_id: Optional[str] = None
+        channel_url: str = ""
+        part = "snippet,statistics,contentDetails"
+
+        if id_type == "handle":
+            known = await asyncio.to_thread(get_resolution_index().get, identifier, "handle")
+            if known is not None and not known.channel_id:
+                return None
+            if known is not None:
+                channel_id = known.channel_id
+                params = {"part": part, "id": channel_id}
+            else:
+                params = {"part": part, "forHandle": identifier}
+            channel_url = f"https://www.youtube.com/@{identifier.lstrip('@')}"
+
+        elif id_type in ("video_id", "vanity"):
+            if id_type == "video_id":
+                channel_id = await _resolve_channel_id_from_video_id(identifier)
+            else:
+                channel_id = await _resolve_channel_id_from_vanity(identifier)
+            if not channel_id:
+                return None
+            params = {"part": part, "id": channel_id}
+            channel_url = f"https://www.youtube.com/channel/{channel_id}"
+
+        else:
+            # "channel_id" and backward-compatible fallback
+            channel_id = identifier
+            params = {"part": part, "id": channel_id}
+            channel_url = f"https://www.youtube.com/channel/{channel_id}"
+
+        response = await _api_get("channels", **params)
+        items = response.get("items", [])
+        await asyncio.to_thread(_record_handle_resolution, identifier, id_type, channel_id, items)
+        if not items:
+            return None
+
+        return _channel_from_item(items[0], channel_id or identifier, channel_url)
+
+    except QuotaExceededError:
+        raise
+    except httpx.HTTPStatusError as e:
+        print(f"[YouTube API HttpError] {e}")
+        return None
+    except Exception as e:
+        print(f"[YouTube API Error] {e}")
+        return None
+
+
+async def get_recent_videos(
+    playlist_id: str, count: int = 8, incremental: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Async version of client.get_recent_videos (same return shape).
+    """
+    if not playlist_id:
+        return []
+    _get_api_key()
+
+    if incremental:
+        # Local import: sync.py builds on this module
+        from .sync import sync_recent_videos_async
+
+        return await sync_recent_videos_async(playlist_id, count=count)
+
+    try:
+        playlist_response = await _api_get(
+            "playlistItems",
+            part="contentDetails",
+            playlistId=playlist_id,
+            maxResults=25,
+        )
+
+        video_ids = [
+            item["contentDetails"]["videoId"]
+            for item in playlist_response.get("items", [])
+            if item.get("contentDetails", {}).get("videoId")
+        ]
+
+        if not video_ids:
+            return []
+
+        stats_response = await _api_get(
+            "videos",
+            part="statistics,snippet,contentDetails",
+            id=",".join(video_ids),
+        )
+
+        video_data = [_video_from_item(item) for item in stats_response.get("items", [])]
+        return _most_recent(video_data, count)
+
+    except QuotaExceededError:
+        raise
+    except httpx.HTTPStatusError as e:
+        print(f"[YouTube API HttpError] {e}")
+        raise YouTubeAPIError("YouTube API error while fetching recent uploads.") from e
+    except Exception as e:
+        print(f"[YouTube API Error] {e}")
+        raise YouTubeAPIError("Could not fetch recent uploads from the YouTube API.") from e
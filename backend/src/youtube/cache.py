@@ -0,0 +1,195 @@
+"""
+src/youtube/cache.py
+Persistent, ETag-aware cache for YouTube Data API list responses.
+
+- Entries are keyed by endpoint path + query (API key and alt= stripped), so the
+  sync and async clients share them.
+- Within YOUTUBE_CACHE_TTL_SECONDS an entry is served locally, with no request.
+- After that it is revalidated with If-None-Match. A 304 refreshes the entry and
+  serves the already-decoded payload (kept in a small in-memory tier).
+- Entries older than YOUTUBE_CACHE_MAX_AGE_SECONDS are treated as missing,
+  except when the quota scheduler refuses the call: then any cached payload,
+  however old, is served instead of failing.
+- Every payload actually fetched from the network is also appended to the
+  statistics time series (see snapshots.py).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from googleapiclient.errors import HttpError
+
+from .quota import QuotaExceededError, charge, endpoint_from_uri
+from .snapshots import record_response
+from src.utils.db import connect
+from src.utils.singleflight import SingleFlight
+
+_TTL_SECONDS = float(os.getenv("YOUTUBE_CACHE_TTL_SECONDS", str(15 * 60)))
+_MAX_AGE_SECONDS = float(os.getenv("YOUTUBE_CACHE_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+_MEMORY_ENTRIES = int(os.getenv("YOUTUBE_CACHE_MEMORY_ENTRIES", "512"))
+
+_IGNORED_PARAMS = {"key", "alt", "prettyPrint"}
+
+
+@dataclass
+class CacheEntry:
+    etag: str
+    payload: Dict[str, Any]
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+def cache_key(uri: str, method: str = "GET") -> str:
+    """
+    Normalise a request URI into a cache key. ID lists are sorted, so the same
+    set of videos/channels maps to one key whatever order it was requested in
+    (every caller re-orders list results itself).
+    """
+    parts = urlsplit(uri)
+    query = sorted(
+        (k, ",".join(sorted(v.split(","))) if k == "id" else v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in _IGNORED_PARAMS
+    )
+    return f"{method.upper()} {parts.path}?{urlencode(query)}"
+
+
+class ResponseCache:
+    def __init__(self, ttl_seconds: float = _TTL_SECONDS, max_age_seconds: float = _MAX_AGE_SECONDS) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._conn = connect("youtube_cache")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key        TEXT PRIMARY KEY,
+                etag       TEXT NOT NULL,
+                payload    TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+
+    def get(self, key: str, allow_expired: bool = False) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._conn.execute(
+                    "SELECT etag, payload, fetched_at FROM responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    return None
+                entry = CacheEntry(row["etag"], json.loads(row["payload"]), row["fetched_at"])
+                self._remember(key, entry)
+            else:
+                self._memory.move_to_end(key)
+
+        if entry.age > self.max_age_seconds and not allow_expired:
+            return None
+        return entry
+
+    def put(self, key: str, etag: str, payload: Dict[str, Any]) -> None:
+        entry = CacheEntry(etag or "", payload, time.time())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                (key, entry.etag, json.dumps(payload, separators=(",", ":")), entry.fetched_at),
+            )
+            self._remember(key, entry)
+
+    def touch(self, key: str) -> None:
+        """
+        Mark an entry as fresh again (after a 304).
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (now, key))
+            entry = self._memory.get(key)
+            if entry is not None:
+                entry.fetched_at = now
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.age < self.ttl_seconds
+
+    def is_usable(self, entry: CacheEntry) -> bool:
+        return entry.age <= self.max_age_seconds
+
+    def purge_expired(self) -> int:
+        cutoff = time.time() - self.max_age_seconds
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM responses WHERE fetched_at < ?", (cutoff,))
+            self._memory.clear()
+            return cur.rowcount
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > _MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+
+_cache: Optional[ResponseCache] = None
+_flights = SingleFlight()
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
+
+
+def execute_cached(request) -> Dict[str, Any]:
+    """
+    Execute a googleapiclient HttpRequest through the response cache (and the
+    quota scheduler). Concurrent misses for the same key share one request.
+    """
+    cache = get_response_cache()
+    key = cache_key(request.uri, request.method)
+
+    entry = cache.get(key, allow_expired=True)
+    if entry is not None and cache.is_fresh(entry):
+        return entry.payload
+
+    return _flights.do(key, lambda: _execute_miss(request, cache, key, entry))
+
+
+def _execute_miss(request, cache: ResponseCache, key: str, entry: Optional[CacheEntry]) -> Dict[str, Any]:
+    try:
+        charge(request.uri)
+    except QuotaExceededError:
+        if entry is not None:
+            return entry.payload
+        raise
+
+    if entry is not None and entry.etag and cache.is_usable(entry):
+        request.headers["If-None-Match"] = entry.etag
+
+    try:
+        payload = request.execute()
+    except HttpError as e:
+        if entry is not None and getattr(e.resp, "status", None) == 304:
+            cache.touch(key)
+            return entry.payload
+        raise
+
+    cache.put(key, payload.get("etag", ""), payload)
+    record_response(endpoint_from_uri(request.uri), payload)
+    return payload
@@ -4,49 +4,133 @@ Fetches YouTube channel and video data via YouTube Data API v3.
 
 from __future__ import annotations
 
-import os
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from dotenv import load_dotenv
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from .cache import execute_cached
 from .parser import extract_identifier
+from .pool import discard_if_broken, youtube_client
+from .quota import QuotaExceededError
+from .resolution import get_resolution_index
+from src.models.video import VideoRecord
+from src.utils.timeparse import NO_DATE, timestamp_us, to_epoch_us
 
-load_dotenv()
+# channels().list / videos().list accept at most 50 comma-separated IDs
+_MAX_IDS_PER_CALL = 50
 
+_UNRESOLVED = "Could not resolve a YouTube channel from the provided input."
+# Per-item batch errors are returned to clients; the upstream error (whose text
+# includes the request URI and API key) is only logged
+_VIDEO_LOOKUP_FAILED = "Video lookup failed (YouTube API error)."
+_CHANNEL_LOOKUP_FAILED = "Channel lookup failed (YouTube API error)."
 
-def _get_youtube_client():
+
+class YouTubeAPIError(Exception):
     """
-    Lazy-init the YouTube client so importing this module never crashes the app.
+    A YouTube API call failed (other than quota). The message is safe to return
+    to clients; the upstream error is logged and chained as __cause__.
     """
-    api_key = os.getenv("YOUTUBE_API_KEY")
-    if not api_key:
-        raise ValueError(
-            "YOUTUBE_API_KEY not found. Add it to your environment (.env / host env vars)."
-        )
-    return build("youtube", "v3", developerKey=api_key)
 
 
+def _execute(request) -> Dict[str, Any]:
+    """
+    Single choke point for every API call made by this module.
+    """
+    return execute_cached(request)
+
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# ---------------- RESPONSE SHAPING (shared with async_client) ----------------
+
+def _channel_from_item(item: Dict[str, Any], fallback_id: str, channel_url: str) -> Dict[str, Any]:
+    """
+    Shape a channels().list item into our channel dict.
+    """
+    snippet = item.get("snippet", {})
+    stats = item.get("statistics", {})
+    content_details = item.get("contentDetails", {})
+
+    resolved_channel_id = item.get("id") or fallback_id
+    channel_name = snippet.get("title", "")
+    subs = int(stats.get("subscriberCount", 0))
+    region = snippet.get("country", "Global")
+    uploads_playlist_id = (
+        content_details.get("relatedPlaylists", {}).get("uploads", "")
+    )
+
+    # If channel_url wasn't constructed by the caller (rare), default now
+    if not channel_url:
+        channel_url = f"https://www.youtube.com/channel/{resolved_channel_id}"
+
+    return {
+        "channel_id": resolved_channel_id,
+        "channel_name": channel_name,
+        "subscribers": subs,
+        "region": region,
+        "uploads_playlist_id": uploads_playlist_id,
+        "channel_url": channel_url,
+    }
+
+
+def _video_from_item(item: Dict[str, Any]) -> VideoRecord:
+    """
+    Shape a videos().list item into our (slotted, dict-like) video record.
+    """
+    snippet = item.get("snippet", {})
+    stats = item.get("statistics", {})
+    content = item.get("contentDetails", {})
+
+    return VideoRecord(
+        video_id=item.get("id", ""),
+        title=snippet.get("title", ""),
+        publishedAt=snippet.get("publishedAt", ""),
+        views=int(stats.get("viewCount", 0)),
+        likes=int(stats.get("likeCount", 0)),
+        comments=int(stats.get("commentCount", 0)),
+        duration=content.get("duration", ""),
+    )
+
+
+def _most_recent(video_data: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+    """
+    Newest-first ordering, trimmed to `count`.
+    """
+    video_data.sort(key=lambda v: v.published_us, reverse=True)
+    return video_data[:count]
+
+
+# ---------------- CHANNEL RESOLUTION ----------------
+
 def _resolve_channel_id_from_video_id(youtube, video_id: str) -> Optional[str]:
     """
     Given a YouTube video ID, return the owning channelId.
     """
     if not video_id:
         return None
+    known = get_resolution_index().get(video_id, "video_id")
+    if known is not None:
+        return known.channel_id
     try:
-        resp = youtube.videos().list(part="snippet", id=video_id).execute()
+        resp = _execute(youtube.videos().list(part="snippet", id=video_id))
         items = resp.get("items", [])
-        if not items:
-            return None
-        snippet = items[0].get("snippet", {})
-        return snippet.get("channelId")
+        channel_id = items[0].get("snippet", {}).get("channelId") if items else None
+        get_resolution_index().put(video_id, "video_id", channel_id)
+        return channel_id
+    except QuotaExceededError:
+        raise
     except HttpError as e:
         print(f"[YouTube API HttpError] {e}")
         return None
     except Exception as e:
         print(f"[YouTube API Error] {e}")
+        discard_if_broken(youtube, e)
         return None
 
 
@@ -57,21 +141,25 @@ def _resolve_channel_id_from_vanity(youtube, query: str) -> Optional[str]:
     """
     if not query:
         return None
+    known = get_resolution_index().get(query, "vanity")
+    if known is not None:
+        return known.channel_id
     try:
-        resp = (
-            youtube.search()
-            .list(part="snippet", q=query, type="channel", maxResults=1)
-            .execute()
+        resp = _execute(
+            youtube.search().list(part="snippet", q=query, type="channel", maxResults=1)
         )
         items = resp.get("items", [])
-        if not items:
-            return None
-        return items[0].get("snippet", {}).get("channelId")
+        channel_id = items[0].get("snippet", {}).get("channelId") if items else None
+        get_resolution_index().put(query, "vanity", channel_id)
+        return channel_id
+    except QuotaExceededError:
+        raise
     except HttpError as e:
         print(f"[YouTube API HttpError] {e}")
         return None
     except Exception as e:
         print(f"[YouTube API Error] {e}")
+        discard_if_broken(youtube, e)
         return None
 
 
@@ -90,18 +178,48 @@ def get_channel_stats(channel_input: str) -> Optional[Dict[str, Any]]:
     }
     """
     identifier, id_type = extract_identifier(channel_input)
-    youtube = _get_youtube_client()
 
+    with youtube_client() as youtube:
+        return _fetch_channel_stats(youtube, identifier, id_type)
+
+
+def _record_handle_resolution(
+    identifier: str, id_type: str, channel_id: Optional[str], items: List[Dict[str, Any]]
+) -> None:
+    """
+    Keep the handle entry of the resolution index in sync with a channels().list response.
+    """
+    if id_type != "handle":
+        return
+    if channel_id is None:
+        # Looked up by forHandle: remember the outcome either way.
+        get_resolution_index().put(identifier, "handle", items[0].get("id") if items else None)
+    elif not items:
+        # Previously resolved channel has gone away.
+        get_resolution_index().forget(identifier, "handle")
+
+
+def _fetch_channel_stats(youtube, identifier: str, id_type: str) -> Optional[Dict[str, Any]]:
     try:
         # Resolve to a channel ID when needed
         channel_id: Optional[str] = None
         channel_url: str = ""
 
         if id_type == "handle":
-            request = youtube.channels().list(
-                part="snippet,statistics,contentDetails",
-                forHandle=identifier,
-            )
+            known = get_resolution_index().get(identifier, "handle")
+            if known is not None and not known.channel_id:
+                return None
+            if known is not None:
+                channel_id = known.channel_id
+                request = youtube.channels().list(
+                    part="snippet,statistics,contentDetails",
+                    id=channel_id,
+                )
+            else:
+                request = youtube.channels().list(
+                    part="snippet,statistics,contentDetails",
+                    forHandle=identifier,
+                )
             channel_url = f"https://www.youtube.com/@{identifier.lstrip('@')}"
 
         elif id_type == "channel_id":
@@ -140,51 +258,165 @@ def get_channel_stats(channel_input: str) -> Optional[Dict[str, Any]]:
             )
             channel_url = f"https://www.youtube.com/channel/{identifier}"
 
-        response = request.execute()
+        response = _execute(request)
         items = response.get("items", [])
+        _record_handle_resolution(identifier, id_type, channel_id, items)
         if not items:
             return None
 
-        item = items[0]
-        snippet = item.get("snippet", {})
-        stats = item.get("statistics", {})
-        content_details = item.get("contentDetails", {})
-
-        resolved_channel_id = item.get("id") or channel_id or identifier
-        channel_name = snippet.get("title", "")
-        subs = int(stats.get("subscriberCount", 0))
-        region = snippet.get("country", "Global")
-        uploads_playlist_id = (
-            content_details.get("relatedPlaylists", {}).get("uploads", "")
-        )
-
-        # If channel_url wasn't constructed above (rare), default now
-        if not channel_url:
-            channel_url = f"https://www.youtube.com/channel/{resolved_channel_id}"
-
-        return {
-            "channel_id": resolved_channel_id,
-            "channel_name": channel_name,
-            "subscribers": subs,
-            "region": region,
-            "uploads_playlist_id": uploads_playlist_id,
-            "channel_url": channel_url,
-        }
+        return _channel_from_item(items[0], channel_id or identifier, channel_url)
 
+    except QuotaExceededError:
+        raise
     except HttpError as e:
         print(f"[YouTube API HttpError] {e}")
         return None
     except Exception as e:
         print(f"[YouTube API Error] {e}")
+        discard_if_broken(youtube, e)
         return None
 
 
-def get_recent_videos(playlist_id: str, count: int = 8) -> List[Dict[str, Any]]:
+def get_channel_stats_many(channel_inputs: List[str]) -> List[Dict[str, Any]]:
+    """
+    Batched get_channel_stats for many inputs.
+
+    Channel IDs (given directly or already known to the resolution index) are
+    fetched 50 per channels().list call, and video links are resolved 50 per
+    videos().list call. Handles / custom names not yet in the index fall back
+    to the single-channel path (which then indexes them for next time).
+
+    Returns one item per input, in input order:
+    {
+        "input": str,
+        "channel": {...} | None,   # same shape as get_channel_stats
+        "error": str | None
+    }
+
+    API and quota errors are reported on the items they affect; they never
+    fail the whole batch.
+    """
+    parsed = [extract_identifier(raw) for raw in channel_inputs]
+
+    with youtube_client() as youtube:
+        return _fetch_channel_stats_many(youtube, channel_inputs, parsed)
+
+
+def _fetch_channel_stats_many(
+    youtube, channel_inputs: List[str], parsed: List[Tuple[str, str]]
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = [
+        {"input": raw, "channel": None, "error": None} for raw in channel_inputs
+    ]
+    index = get_resolution_index()
+
+    # 1) Resolve as many inputs as possible to channel IDs without per-item calls
+    by_channel_id: Dict[str, List[int]] = {}
+    by_video_id: Dict[str, List[int]] = {}
+
+    for i, (identifier, id_type) in enumerate(parsed):
+        if id_type == "channel_id":
+            by_channel_id.setdefault(identifier, []).append(i)
+            continue
+
+        known = index.get(identifier, id_type)
+        if known is not None:
+            if known.channel_id:
+                by_channel_id.setdefault(known.channel_id, []).append(i)
+            else:
+                results[i]["error"] = _UNRESOLVED
+            continue
+
+        if id_type == "video_id":
+            by_video_id.setdefault(identifier, []).append(i)
+        else:
+            # Unknown handle / custom name: forHandle and search() take one value each
+            try:
+                channel = _fetch_channel_stats(youtube, identifier, id_type)
+            except QuotaExceededError as e:
+                results[i]["error"] = str(e)
+                continue
+            if channel:
+                results[i]["channel"] = channel
+            else:
+                results[i]["error"] = _UNRESOLVED
+
+    for chunk in _chunks(list(by_video_id), _MAX_IDS_PER_CALL):
+        try:
+            resp = _execute(youtube.videos().list(part="snippet", id=",".join(chunk)))
+        except Exception as e:
+            print(f"[YouTube API Error] {e}")
+            discard_if_broken(youtube, e)
+            error = str(e) if isinstance(e, QuotaExceededError) else _VIDEO_LOOKUP_FAILED
+            for video_id in chunk:
+                for i in by_video_id[video_id]:
+                    results[i]["error"] = error
+            continue
+
+        owners = {
+            item.get("id"): item.get("snippet", {}).get("channelId")
+            for item in resp.get("items", [])
+        }
+        for video_id in chunk:
+            channel_id = owners.get(video_id)
+            index.put(video_id, "video_id", channel_id)
+            for i in by_video_id[video_id]:
+                if channel_id:
+                    by_channel_id.setdefault(channel_id, []).append(i)
+                else:
+                    results[i]["error"] = _UNRESOLVED
+
+    # 2) Fetch channel stats, 50 IDs per call
+    for chunk in _chunks(list(by_channel_id), _MAX_IDS_PER_CALL):
+        try:
+            resp = _execute(
+                youtube.channels().list(
+                    part="snippet,statistics,contentDetails",
+                    id=",".join(chunk),
+                )
+            )
+        except Exception as e:
+            print(f"[YouTube API Error] {e}")
+            discard_if_broken(youtube, e)
+            error = str(e) if isinstance(e, QuotaExceededError) else _CHANNEL_LOOKUP_FAILED
+            for channel_id in chunk:
+                for i in by_channel_id[channel_id]:
+                    results[i]["error"] = error
+            continue
+
+        items = {item.get("id"): item for item in resp.get("items", [])}
+        for channel_id in chunk:
+            item = items.get(channel_id)
+            for i in by_channel_id[channel_id]:
+                if item is None:
+                    results[i]["error"] = "Channel not found."
+                    continue
+                identifier, id_type = parsed[i]
+                channel_url = (
+                    f"https://www.youtube.com/@{identifier.lstrip('@')}"
+                    if id_type == "handle"
+                    else f"https://www.youtube.com/channel/{channel_id}"
+                )
+                results[i]["channel"] = _channel_from_item(item, channel_id, channel_url)
+
+    return results
+
+
+def get_recent_videos(
+    playlist_id: str, count: int = 8, incremental: bool = False
+) -> List[Dict[str, Any]]:
     """
     Returns the most recent `count` videos with stable ordering.
 
-    Each item:
+    With incremental=True, only uploads newer than the last sync (plus stored
+    videos whose stats are due) are fetched; see src/youtube/sync.py.
+
+    Raises YouTubeAPIError when the API fails, so a failed fetch is never
+    mistaken for a channel without uploads.
+
+    Each item is a VideoRecord (read-only mapping):
     {
+        "video_id": str,
         "title": str,
         "publishedAt": str (ISO),
         "views": int,
@@ -193,18 +425,27 @@ def get_recent_videos(playlist_id: str, count: int = 8) -> List[Dict[str, Any]]:
         "duration": str (ISO 8601 duration)
     }
     """
-    youtube = _get_youtube_client()
-
     if not playlist_id:
         return []
 
+    if incremental:
+        # Local import: sync.py builds on this module
+        from .sync import sync_recent_videos
+
+        return sync_recent_videos(playlist_id, count=count)
+
+    with youtube_client() as youtube:
+        return _fetch_recent_videos(youtube, playlist_id, count)
+
+
+def _fetch_recent_videos(youtube, playlist_id: str, count: int) -> List[Dict[str, Any]]:
     try:
         playlist_request = youtube.playlistItems().list(
             part="contentDetails",
             playlistId=playlist_id,
             maxResults=25,
         )
-        playlist_response = playlist_request.execute()
+        playlist_response = _execute(playlist_request)
 
         video_ids = [
             item["contentDetails"]["videoId"]
@@ -219,37 +460,154 @@ def get_recent_videos(playlist_id: str, count: int = 8) -> List[Dict[str, Any]]:
             part="statistics,snippet,contentDetails",
             id=",".join(video_ids),
         )
-        stats_response = stats_request.execute()
-
-        video_data: List[Dict[str, Any]] = []
-        for item in stats_response.get("items", []):
-            snippet = item.get("snippet", {})
-            stats = item.get("statistics", {})
-            content = item.get("contentDetails", {})
-
-            published_at = snippet.get("publishedAt", "")
-
-            video_data.append(
-                {
-                    "title": snippet.get("title", ""),
-                    "publishedAt": published_at,
-                    "views": int(stats.get("viewCount", 0)),
-                    "likes": int(stats.get("likeCount", 0)),
-                    "comments": int(stats.get("commentCount", 0)),
-                    "duration": content.get("duration", ""),
-                }
-            )
+        stats_response = _execute(stats_request)
+
+        video_data = [_video_from_item(item) for item in stats_response.get("items", [])]
+        return _most_recent(video_data, count)
+
+    except QuotaExceededError:
+        raise
+    except HttpError as e:
+        print(f"[YouTube API HttpError] {e}")
+        raise YouTubeAPIError("YouTube API error while fetching recent uploads.") from e
+    except Exception as e:
+        print(f"[YouTube API Error] {e}")
+        discard_if_broken(youtube, e)
+        raise YouTubeAPIError("Could not fetch recent uploads from the YouTube API.") from e
+
+
+# ---------------- DEEP HISTORY ----------------
+
+@dataclass
+class UploadPage:
+    videos: List[Dict[str, Any]]
+    next_page_token: Optional[str]
+
+
+class UploadPageError(YouTubeAPIError):
+    """
+    An uploads page could not be fetched. `page_token` is the token of the
+    failed page (None = first page), so the walk can be resumed from it.
+    """
+
+    def __init__(self, message: str, page_token: Optional[str]) -> None:
+        super().__init__(message)
+        self.page_token = page_token
+
+
+def iter_upload_pages(
+    playlist_id: str,
+    published_after: Optional[datetime] = None,
+    max_videos: Optional[int] = None,
+    page_token: Optional[str] = None,
+) -> Iterator[UploadPage]:
+    """
+    Stream an uploads playlist page by page (newest first), following nextPageToken.
+
+    - published_after: stop once uploads are older than this (tz-aware) datetime
+    - max_videos: stop after this many videos have been yielded
+    - page_token: resume from a `next_page_token` of an earlier page
+
+    Each page's video IDs are fetched in one videos().list call (50 IDs max), and
+    its videos have the same shape as get_recent_videos items. A pooled client is
+    only held while a page is being fetched, never across yields.
+
+    Raises UploadPageError if a page fails, so an API error is never mistaken
+    for the end of the history.
+    """
+    if not playlist_id:
+        return
+
+    yielded = 0
+    while True:
+        with youtube_client() as youtube:
+            page = _fetch_upload_page(youtube, playlist_id, page_token, published_after)
+
+        videos = page.videos
+        if max_videos is not None:
+            videos = videos[: max(max_videos - yielded, 0)]
+        yielded += len(videos)
+
+        reached_cutoff = len(videos) < len(page.videos) or page.next_page_token is None
+        yield UploadPage(videos, None if reached_cutoff else page.next_page_token)
+
+        if reached_cutoff or (max_videos is not None and yielded >= max_videos):
+            return
+        page_token = page.next_page_token
+
+
+def iter_uploads(
+    playlist_id: str,
+    published_after: Optional[datetime] = None,
+    max_videos: Optional[int] = None,
+    page_token: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Flattened iter_upload_pages: yields video dicts as each page arrives.
+    """
+    for page in iter_upload_pages(playlist_id, published_after, max_videos, page_token):
+        yield from page.videos
 
-        def _parse_dt(iso_str: str) -> datetime:
-            return datetime.fromisoformat(iso_str.replace("Z", "+00:00"))
 
-        video_data.sort(key=lambda x: _parse_dt(x["publishedAt"]), reverse=True)
+def _fetch_upload_page(
+    youtube,
+    playlist_id: str,
+    page_token: Optional[str],
+    published_after: Optional[datetime],
+) -> UploadPage:
+    """
+    One playlistItems page + its videos. Videos published before `published_after`
+    are dropped, and the returned page then has no next token (uploads are newest
+    first, so nothing older is needed).
+    """
+    try:
+        params: Dict[str, Any] = {
+            "part": "contentDetails",
+            "playlistId": playlist_id,
+            "maxResults": _MAX_IDS_PER_CALL,
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        playlist_response = _execute(youtube.playlistItems().list(**params))
+
+        video_ids: List[str] = []
+        reached_cutoff = False
+        cutoff_us = to_epoch_us(published_after) if published_after is not None else None
+        for item in playlist_response.get("items", []):
+            details = item.get("contentDetails", {})
+            video_id = details.get("videoId")
+            if not video_id:
+                continue
+            published_us = timestamp_us(details.get("videoPublishedAt"))
+            if cutoff_us is not None and published_us != NO_DATE and published_us < cutoff_us:
+                reached_cutoff = True
+                break
+            video_ids.append(video_id)
+
+        next_token = None if reached_cutoff else playlist_response.get("nextPageToken")
+        if not video_ids:
+            return UploadPage([], next_token)
 
-        return video_data[:count]
+        stats_response = _execute(
+            youtube.videos().list(
+                part="statistics,snippet,contentDetails",
+                id=",".join(video_ids),
+            )
+        )
+        by_id = {
+            item.get("id"): _video_from_item(item)
+            for item in stats_response.get("items", [])
+        }
+        # Keep playlist order; private/deleted videos have no videos() item
+        videos = [by_id[v] for v in video_ids if v in by_id]
+        return UploadPage(videos, next_token)
 
+    except QuotaExceededError:
+        raise
     except HttpError as e:
         print(f"[YouTube API HttpError] {e}")
-        return []
+        raise UploadPageError("YouTube API error while fetching uploads.", page_token) from e
     except Exception as e:
         print(f"[YouTube API Error] {e}")
-        return []
+        discard_if_broken(youtube, e)
+        raise UploadPageError("Could not fetch uploads from the YouTube API.", page_token) from e
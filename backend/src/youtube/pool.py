@@ -0,0 +1,166 @@
+"""
+src/youtube/pool.py
+Process-wide lifecycle for YouTube Data API clients.
+
+- The v3 discovery document is loaded once, from the copy bundled with
+  google-api-python-client (no network round trip).
+- Built service objects are kept in a small thread-safe pool. Each one owns its
+  own httplib2.Http, so connections (and TLS sessions) are kept alive and reused,
+  and no two threads ever share an Http instance (httplib2 is not thread-safe).
+- A client whose transport failed is closed instead of going back to the pool,
+  whether the error escapes the `with` block or the caller handles it and
+  reports it with discard_if_broken().
+
+Usage:
+    with youtube_client() as youtube:
+        youtube.channels().list(...).execute()
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Set
+
+import httplib2
+from dotenv import load_dotenv
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+load_dotenv()
+
+_SERVICE_NAME = "youtube"
+_SERVICE_VERSION = "v3"
+
+_POOL_SIZE = int(os.getenv("YOUTUBE_CLIENT_POOL_SIZE", "8"))
+_HTTP_TIMEOUT_SECONDS = float(os.getenv("YOUTUBE_HTTP_TIMEOUT", "15"))
+
+_lock = threading.Lock()
+_discovery_doc: Optional[Dict[str, Any]] = None
+_idle: "queue.LifoQueue[Any]" = queue.LifoQueue(maxsize=_POOL_SIZE)
+_api_key_for_pool: Optional[str] = None
+# id()s of checked-out clients whose transport failed
+_broken: Set[int] = set()
+
+TRANSPORT_ERRORS = (httplib2.HttpLib2Error, OSError)
+
+
+def _get_api_key() -> str:
+    api_key = os.getenv("YOUTUBE_API_KEY")
+    if not api_key:
+        raise ValueError(
+            "YOUTUBE_API_KEY not found. Add it to your environment (.env / host env vars)."
+        )
+    return api_key
+
+
+def _get_discovery_document() -> Dict[str, Any]:
+    """
+    Load the bundled discovery document once per process.
+    """
+    global _discovery_doc
+    if _discovery_doc is None:
+        with _lock:
+            if _discovery_doc is None:
+                raw = get_static_doc(_SERVICE_NAME, _SERVICE_VERSION)
+                if not raw:
+                    raise RuntimeError(
+                        f"No bundled discovery document for {_SERVICE_NAME} {_SERVICE_VERSION}."
+                    )
+                _discovery_doc = json.loads(raw)
+    return _discovery_doc
+
+
+def _build_client(api_key: str):
+    http = httplib2.Http(timeout=_HTTP_TIMEOUT_SECONDS)
+    return build_from_document(
+        _get_discovery_document(),
+        developerKey=api_key,
+        http=http,
+    )
+
+
+def _drain_pool() -> None:
+    while True:
+        try:
+            youtube = _idle.get_nowait()
+        except queue.Empty:
+            return
+        _close_client(youtube)
+
+
+def _close_client(youtube) -> None:
+    try:
+        youtube.close()
+    except Exception:
+        pass
+
+
+def _acquire(api_key: str):
+    global _api_key_for_pool
+    with _lock:
+        # A rotated key invalidates every pooled client.
+        if _api_key_for_pool != api_key:
+            _drain_pool()
+            _api_key_for_pool = api_key
+    try:
+        return _idle.get_nowait()
+    except queue.Empty:
+        return _build_client(api_key)
+
+
+def _release(youtube, api_key: str) -> None:
+    if api_key != _api_key_for_pool:
+        _close_client(youtube)
+        return
+    try:
+        _idle.put_nowait(youtube)
+    except queue.Full:
+        _close_client(youtube)
+
+
+def discard_if_broken(youtube, error: BaseException) -> None:
+    """
+    For callers that catch API errors themselves: if `error` came from the
+    transport, the checked-out client is closed on check-in instead of being
+    reused.
+    """
+    if isinstance(error, TRANSPORT_ERRORS):
+        with _lock:
+            _broken.add(id(youtube))
+
+
+@contextmanager
+def youtube_client() -> Iterator[Any]:
+    """
+    Check out a YouTube service object for exclusive use by the current thread.
+
+    Raises ValueError if YOUTUBE_API_KEY is missing.
+    """
+    api_key = _get_api_key()
+    youtube = _acquire(api_key)
+    try:
+        yield youtube
+    except TRANSPORT_ERRORS as e:
+        discard_if_broken(youtube, e)
+        raise
+    finally:
+        with _lock:
+            healthy = id(youtube) not in _broken
+            _broken.discard(id(youtube))
+        if healthy:
+            _release(youtube, api_key)
+        else:
+            # Broken transport: don't hand the connection back to the pool.
+            _close_client(youtube)
+
+
+def reset_pool() -> None:
+    """
+    Close all idle clients (e.g. on app shutdown).
+    """
+    with _lock:
+        _drain_pool()
@@ -0,0 +1,234 @@
+"""
+src/youtube/quota.py
+YouTube Data API quota accounting + budget-aware admission.
+
+- Every API call is charged to a ledger (SQLite) by day, tenant and endpoint.
+  Days follow the API's own reset (midnight America/Los_Angeles).
+- Admission against YOUTUBE_DAILY_QUOTA:
+  * the whole budget exhausted -> QuotaExceededError for everyone
+  * the last YOUTUBE_QUOTA_INTERACTIVE_RESERVE share is kept for the
+    "interactive" tenant; other tenants (batch jobs, refreshes) are rejected
+  * non-interactive tenants also draw from a token bucket that spreads their
+    share over the day, so a burst is delayed (up to max_wait) rather than
+    burning the quota in one go
+
+Callers pick the tenant with `tenant_scope("batch")`; the default is "interactive".
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+from src.utils.db import connect
+
+try:
+    from zoneinfo import ZoneInfo
+
+    _QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+except Exception:  # tzdata missing: fall back to UTC days
+    _QUOTA_TZ = None
+
+DAILY_BUDGET = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+INTERACTIVE_RESERVE = float(os.getenv("YOUTUBE_QUOTA_INTERACTIVE_RESERVE", "0.2"))
+_BUCKET_CAPACITY = float(os.getenv("YOUTUBE_QUOTA_BURST", "500"))
+_DEFAULT_MAX_WAIT_SECONDS = float(os.getenv("YOUTUBE_QUOTA_MAX_WAIT", "5"))
+
+INTERACTIVE = "interactive"
+
+# Units per call (YouTube Data API v3 cost table); everything else is 1
+QUOTA_COSTS: Dict[str, int] = {
+    "search": 100,
+}
+
+_current_tenant: ContextVar[str] = ContextVar("youtube_quota_tenant", default=INTERACTIVE)
+
+
+class QuotaExceededError(Exception):
+    pass
+
+
+@contextmanager
+def tenant_scope(tenant: str) -> Iterator[None]:
+    """
+    Charge every API call made inside this block to `tenant`.
+    """
+    token = _current_tenant.set(tenant)
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
+
+
+def current_tenant() -> str:
+    return _current_tenant.get()
+
+
+def endpoint_from_uri(uri: str) -> str:
+    """
+    "https://.../youtube/v3/channels?..." -> "channels"
+    """
+    return urlsplit(uri).path.rstrip("/").rsplit("/", 1)[-1]
+
+
+def cost_of(endpoint: str) -> int:
+    return QUOTA_COSTS.get(endpoint, 1)
+
+
+def quota_day(ts: Optional[float] = None) -> str:
+    ts = time.time() if ts is None else ts
+    return datetime.fromtimestamp(ts, _QUOTA_TZ).date().isoformat()
+
+
+class _TokenBucket:
+    def __init__(self, rate_per_second: float, capacity: float) -> None:
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, units: float) -> float:
+        """
+        Take `units` (the balance may go negative = booked in the future) and
+        return how long the caller must wait before using them.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= units
+        if self.tokens >= 0 or self.rate <= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def refund(self, units: float) -> None:
+        self.tokens += units
+
+
+class QuotaLedger:
+    def __init__(self, daily_budget: int = DAILY_BUDGET, reserve: float = INTERACTIVE_RESERVE) -> None:
+        self.daily_budget = daily_budget
+        self.reserve = reserve
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._day = ""
+        self._used_today = 0
+        self._conn = connect("quota")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS usage (
+                day      TEXT NOT NULL,
+                tenant   TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                units    INTEGER NOT NULL,
+                calls    INTEGER NOT NULL,
+                PRIMARY KEY (day, tenant, endpoint)
+            )
+            """
+        )
+
+    def _roll_day(self) -> str:
+        day = quota_day()
+        if day != self._day:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(units), 0) AS units FROM usage WHERE day = ?", (day,)
+            ).fetchone()
+            self._day = day
+            self._used_today = int(row["units"])
+        return day
+
+    def _bucket(self, tenant: str) -> _TokenBucket:
+        bucket = self._buckets.get(tenant)
+        if bucket is None:
+            share = self.daily_budget * (1.0 - self.reserve)
+            bucket = _TokenBucket(share / 86400.0, _BUCKET_CAPACITY)
+            self._buckets[tenant] = bucket
+        return bucket
+
+    def admit(self, endpoint: str, tenant: Optional[str] = None, max_wait: Optional[float] = None) -> float:
+        """
+        Charge one call to `endpoint` and return the delay (seconds) the caller
+        must wait before sending it. Raises QuotaExceededError when the call
+        cannot be admitted within max_wait.
+        """
+        tenant = tenant or current_tenant()
+        max_wait = _DEFAULT_MAX_WAIT_SECONDS if max_wait is None else max_wait
+        units = cost_of(endpoint)
+
+        with self._lock:
+            day = self._roll_day()
+            limit = self.daily_budget
+            if tenant != INTERACTIVE:
+                limit = int(self.daily_budget * (1.0 - self.reserve))
+            if self._used_today + units > limit:
+                raise QuotaExceededError(
+                    f"YouTube API daily quota exhausted for tenant '{tenant}' "
+                    f"({self._used_today}/{limit} units used)."
+                )
+
+            delay = 0.0
+            if tenant != INTERACTIVE:
+                bucket = self._bucket(tenant)
+                delay = bucket.reserve(units)
+                if delay > max_wait:
+                    bucket.refund(units)
+                    raise QuotaExceededError(
+                        f"YouTube API quota rate limit for tenant '{tenant}' "
+                        f"(next slot in {delay:.1f}s)."
+                    )
+
+            self._used_today += units
+            self._conn.execute(
+                "INSERT INTO usage (day, tenant, endpoint, units, calls) VALUES (?, ?, ?, ?, 1) "
+                "ON CONFLICT (day, tenant, endpoint) DO UPDATE SET "
+                "units = units + excluded.units, calls = calls + 1",
+                (day, tenant, endpoint, units),
+            )
+        return delay
+
+    def usage(self, day: Optional[str] = None) -> Dict[str, Any]:
+        """
+        JSON-friendly usage summary for one quota day (default: today).
+        """
+        with self._lock:
+            day = day or self._roll_day()
+            rows = self._conn.execute(
+                "SELECT tenant, endpoint, units, calls FROM usage WHERE day = ? ORDER BY tenant, endpoint",
+                (day,),
+            ).fetchall()
+        breakdown: List[Dict[str, Any]] = [dict(r) for r in rows]
+        used = sum(r["units"] for r in breakdown)
+        return {
+            "day": day,
+            "daily_budget": self.daily_budget,
+            "used_units": used,
+            "remaining_units": max(self.daily_budget - used, 0),
+            "breakdown": breakdown,
+        }
+
+
+_ledger: Optional[QuotaLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_quota_ledger() -> QuotaLedger:
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = QuotaLedger()
+    return _ledger
+
+
+def charge(uri: str) -> None:
+    """
+    Admit + record one call to `uri`, sleeping if the scheduler delays it.
+    """
+    delay = get_quota_ledger().admit(endpoint_from_uri(uri))
+    if delay > 0:
+        time.sleep(delay)
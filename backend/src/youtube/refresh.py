@@ -0,0 +1,57 @@
+"""
+src/youtube/refresh.py
+Age-tiered refresh policy for stored video statistics.
+
+A fresh upload's views move by the hour; a six-month-old video barely moves.
+Each video gets a TTL from its age (time since publishedAt); its stats are only
+re-requested once they are older than that TTL.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import List, Optional, Tuple
+
+_HOUR = 3600.0
+_DAY = 24 * _HOUR
+
+# (max video age, stats TTL), evaluated top-down. Calibrate as quota allows.
+REFRESH_TIERS: List[Tuple[float, float]] = [
+    (2 * _DAY, 1 * _HOUR),
+    (7 * _DAY, 6 * _HOUR),
+    (30 * _DAY, 1 * _DAY),
+    (180 * _DAY, 7 * _DAY),
+]
+# Anything older than the last tier
+_ARCHIVE_TTL = 30 * _DAY
+
+
+def video_ttl(published_ts: float, now: Optional[float] = None) -> float:
+    """
+    Seconds a video's fetched stats stay valid, given its publish time (epoch).
+    """
+    now = time.time() if now is None else now
+    age = now - published_ts
+    for max_age, ttl in REFRESH_TIERS:
+        if age < max_age:
+            return ttl
+    return _ARCHIVE_TTL
+
+
+def is_stale(published_ts: float, fetched_at: float, now: Optional[float] = None) -> bool:
+    now = time.time() if now is None else now
+    return now - fetched_at >= video_ttl(published_ts, now)
+
+
+def next_due(published_ts: float, fetched_at: float) -> float:
+    """
+    First moment is_stale() turns true for stats fetched at `fetched_at`, so the
+    due date can be stored (and indexed) when the stats are written. The TTL
+    only grows with age, so the first tier whose TTL expires while the video
+    is still in that tier wins.
+    """
+    for max_age, ttl in REFRESH_TIERS:
+        due = fetched_at + ttl
+        if due - published_ts < max_age:
+            return due
+    return fetched_at + _ARCHIVE_TTL
@@ -0,0 +1,108 @@
+"""
+src/youtube/resolution.py
+Persistent index of (identifier, id_type) -> channel_id resolutions.
+
+Keys are the normalized outputs of parser.extract_identifier. Both successful
+and failed resolutions are stored (channel_id NULL = "did not resolve"), so
+repeat lookups of the same handle / vanity name / video cost no API calls.
+Negative entries expire sooner than positive ones.
+
+Only record outcomes of *successful* API responses here; transient errors must
+not poison the index.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from src.utils.db import connect
+
+_POSITIVE_TTL_SECONDS = float(os.getenv("RESOLUTION_TTL_SECONDS", str(30 * 24 * 3600)))
+_NEGATIVE_TTL_SECONDS = float(os.getenv("RESOLUTION_NEGATIVE_TTL_SECONDS", str(24 * 3600)))
+
+
+@dataclass
+class Resolution:
+    channel_id: Optional[str]
+    resolved_at: float
+
+
+def _normalize(identifier: str, id_type: str) -> str:
+    # Handles and custom names are case-insensitive on YouTube; IDs are not.
+    if id_type in ("handle", "vanity"):
+        return identifier.strip().lower()
+    return identifier.strip()
+
+
+class ResolutionIndex:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._conn = connect("resolution_index")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resolutions (
+                id_type     TEXT NOT NULL,
+                identifier  TEXT NOT NULL,
+                channel_id  TEXT,
+                resolved_at REAL NOT NULL,
+                PRIMARY KEY (id_type, identifier)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_resolutions_channel ON resolutions (channel_id)"
+        )
+
+    def get(self, identifier: str, id_type: str) -> Optional[Resolution]:
+        """
+        Return the stored resolution, or None if unknown / expired.
+        A returned Resolution with channel_id=None is a negative hit.
+        """
+        if not identifier:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT channel_id, resolved_at FROM resolutions WHERE id_type = ? AND identifier = ?",
+                (id_type, _normalize(identifier, id_type)),
+            ).fetchone()
+        if row is None:
+            return None
+
+        ttl = _POSITIVE_TTL_SECONDS if row["channel_id"] else _NEGATIVE_TTL_SECONDS
+        if time.time() - row["resolved_at"] > ttl:
+            return None
+        return Resolution(row["channel_id"], row["resolved_at"])
+
+    def put(self, identifier: str, id_type: str, channel_id: Optional[str]) -> None:
+        if not identifier:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resolutions (id_type, identifier, channel_id, resolved_at) "
+                "VALUES (?, ?, ?, ?)",
+                (id_type, _normalize(identifier, id_type), channel_id or None, time.time()),
+            )
+
+    def forget(self, identifier: str, id_type: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM resolutions WHERE id_type = ? AND identifier = ?",
+                (id_type, _normalize(identifier, id_type)),
+            )
+
+
+_index: Optional[ResolutionIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_resolution_index() -> ResolutionIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ResolutionIndex()
+    return _index
@@ -0,0 +1,491 @@
+"""
+src/youtube/snapshots.py
+Append-only time series of channel + video statistics.
+
+Every channels()/videos() response that comes back from the network (cache
+misses and expired entries, not local cache hits) appends one row per item:
+
+    channel_snapshots: (channel, ts, subscribers, views, video_count)
+    video_snapshots:   (video, ts, channel, views, likes, comments)
+
+Encoding is kept compact: channel / video IDs are interned into small integer
+keys, timestamps are whole seconds, and both tables are WITHOUT ROWID with the
+(key, ts) primary key as the clustered per-channel / per-video index, so a
+history read is one contiguous range scan. Video metadata (title, publish
+date, duration) is stored once per video, not per snapshot.
+
+Days older than SNAPSHOT_HOT_DAYS are moved out to the columnar day archive
+(archive.py); history() reads both transparently.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.models.video import VideoRecord
+from src.utils.db import connect
+from src.utils.timeparse import timestamp_seconds
+
+# Endpoints whose items carry statistics we record
+SNAPSHOT_ENDPOINTS = ("channels", "videos")
+
+# Value columns per snapshot kind (after the key + ts)
+SNAPSHOT_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "channel": ("subscribers", "views", "video_count"),
+    "video": ("channel_key", "views", "likes", "comments"),
+}
+
+# kind -> (snapshot table, key column) / (dictionary table, name prefix)
+_SNAPSHOT_TABLES = {
+    "channel": ("channel_snapshots", "channel_key"),
+    "video": ("video_snapshots", "video_key"),
+}
+_KEY_TABLES = {
+    "channel": ("channels", "channel"),
+    "video": ("videos", "video"),
+}
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class SnapshotStore:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._conn = connect("snapshots")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS channels (
+                channel_key INTEGER PRIMARY KEY,
+                channel_id  TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS channel_info (
+                channel_key         INTEGER PRIMARY KEY,
+                title               TEXT NOT NULL,
+                country             TEXT NOT NULL,
+                uploads_playlist_id TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS videos (
+                video_key    INTEGER PRIMARY KEY,
+                video_id     TEXT NOT NULL UNIQUE,
+                channel_key  INTEGER NOT NULL,
+                title        TEXT NOT NULL,
+                published_at TEXT NOT NULL,
+                duration     TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_videos_channel ON videos (channel_key);
+            CREATE TABLE IF NOT EXISTS channel_snapshots (
+                channel_key INTEGER NOT NULL,
+                ts          INTEGER NOT NULL,
+                subscribers INTEGER NOT NULL,
+                views       INTEGER NOT NULL,
+                video_count INTEGER NOT NULL,
+                PRIMARY KEY (channel_key, ts)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS video_snapshots (
+                video_key   INTEGER NOT NULL,
+                ts          INTEGER NOT NULL,
+                channel_key INTEGER NOT NULL,
+                views       INTEGER NOT NULL,
+                likes       INTEGER NOT NULL,
+                comments    INTEGER NOT NULL,
+                PRIMARY KEY (video_key, ts)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_video_snapshots_channel
+                ON video_snapshots (channel_key, ts);
+            CREATE INDEX IF NOT EXISTS idx_channel_snapshots_ts ON channel_snapshots (ts);
+            CREATE INDEX IF NOT EXISTS idx_video_snapshots_ts ON video_snapshots (ts);
+            CREATE TABLE IF NOT EXISTS meta (
+                name  TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """
+        )
+        self._channel_keys: Dict[str, int] = {}
+        self._video_keys: Dict[str, int] = {}
+
+    # ---------- interning (caller holds the lock) ----------
+
+    def _channel_key(self, channel_id: str) -> int:
+        key = self._channel_keys.get(channel_id)
+        if key is None:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO channels (channel_id) VALUES (?)", (channel_id,)
+            )
+            key = self._conn.execute(
+                "SELECT channel_key FROM channels WHERE channel_id = ?", (channel_id,)
+            ).fetchone()["channel_key"]
+            self._channel_keys[channel_id] = key
+        return key
+
+    def _video_key(self, video_id: str, channel_key: int, snippet: Dict[str, Any], duration: str) -> int:
+        key = self._video_keys.get(video_id)
+        if key is None:
+            self._conn.execute(
+                "INSERT INTO videos (video_id, channel_key, title, published_at, duration) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (video_id) DO UPDATE SET "
+                "title = COALESCE(NULLIF(excluded.title, ''), title), "
+                "published_at = COALESCE(NULLIF(excluded.published_at, ''), published_at), "
+                "duration = COALESCE(NULLIF(excluded.duration, ''), duration)",
+                (video_id, channel_key, snippet.get("title", ""), snippet.get("publishedAt", ""), duration),
+            )
+            key = self._conn.execute(
+                "SELECT video_key FROM videos WHERE video_id = ?", (video_id,)
+            ).fetchone()["video_key"]
+            self._video_keys[video_id] = key
+        return key
+
+    def _record_channel_info(self, channel_key: int, item: Dict[str, Any]) -> None:
+        snippet = item.get("snippet")
+        uploads = item.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads", "")
+        if not snippet and not uploads:
+            return
+        snippet = snippet or {}
+        self._conn.execute(
+            "INSERT INTO channel_info (channel_key, title, country, uploads_playlist_id) "
+            "VALUES (?, ?, ?, ?) ON CONFLICT (channel_key) DO UPDATE SET "
+            "title = COALESCE(NULLIF(excluded.title, ''), title), "
+            "country = COALESCE(NULLIF(excluded.country, ''), country), "
+            "uploads_playlist_id = COALESCE(NULLIF(excluded.uploads_playlist_id, ''), uploads_playlist_id)",
+            (channel_key, snippet.get("title", ""), snippet.get("country", ""), uploads),
+        )
+
+    # ---------- writes ----------
+
+    def record(self, endpoint: str, items: List[Dict[str, Any]], ts: Optional[float] = None) -> int:
+        """
+        Append snapshots for the raw API `items` of a channels()/videos()
+        response. Items without statistics (e.g. part="snippet" lookups) are
+        skipped. Returns the number of rows written.
+        """
+        if endpoint not in SNAPSHOT_ENDPOINTS:
+            return 0
+        ts = int(time.time() if ts is None else ts)
+        written = 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for item in items:
+                    stats = item.get("statistics")
+                    item_id = item.get("id")
+                    if not stats or not item_id:
+                        continue
+                    if endpoint == "channels":
+                        channel_key = self._channel_key(item_id)
+                        self._record_channel_info(channel_key, item)
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO channel_snapshots "
+                            "(channel_key, ts, subscribers, views, video_count) VALUES (?, ?, ?, ?, ?)",
+                            (
+                                channel_key,
+                                ts,
+                                _int(stats.get("subscriberCount")),
+                                _int(stats.get("viewCount")),
+                                _int(stats.get("videoCount")),
+                            ),
+                        )
+                    else:
+                        snippet = item.get("snippet", {})
+                        channel_key = self._channel_key(snippet.get("channelId", ""))
+                        video_key = self._video_key(
+                            item_id,
+                            channel_key,
+                            snippet,
+                            item.get("contentDetails", {}).get("duration", ""),
+                        )
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO video_snapshots "
+                            "(video_key, ts, channel_key, views, likes, comments) VALUES (?, ?, ?, ?, ?, ?)",
+                            (
+                                video_key,
+                                ts,
+                                channel_key,
+                                _int(stats.get("viewCount")),
+                                _int(stats.get("likeCount")),
+                                _int(stats.get("commentCount")),
+                            ),
+                        )
+                    written += 1
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                # Interned keys may refer to rolled-back rows
+                self._channel_keys.clear()
+                self._video_keys.clear()
+                raise
+        return written
+
+    # ---------- reads ----------
+
+    def key_for(self, kind: str, item_id: str) -> Optional[int]:
+        table, column = _KEY_TABLES[kind]
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {column}_key AS k FROM {table} WHERE {column}_id = ?", (item_id,)
+            ).fetchone()
+        return row["k"] if row is not None else None
+
+    def archived_before(self) -> int:
+        """
+        Rows older than this (epoch seconds) live in the archive, not here.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE name = 'archived_before'"
+            ).fetchone()
+        return int(row["value"]) if row is not None else 0
+
+    def oldest_ts(self, kind: str, start: float, end: float) -> Optional[int]:
+        """
+        Smallest snapshot ts with start <= ts < end, or None. Used by the archiver.
+        """
+        table, _ = _SNAPSHOT_TABLES[kind]
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT MIN(ts) AS ts FROM {table} WHERE ts >= ? AND ts < ?",
+                (int(start), int(end)),
+            ).fetchone()
+        return row["ts"]
+
+    def rows_between(self, kind: str, start: float, end: float) -> List[Tuple[int, ...]]:
+        """
+        Raw (key, ts, *SNAPSHOT_COLUMNS[kind]) tuples with start <= ts < end,
+        ordered by (key, ts). Used by the archiver.
+        """
+        table, column = _SNAPSHOT_TABLES[kind]
+        values = ", ".join(SNAPSHOT_COLUMNS[kind])
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {column}, ts, {values} FROM {table} "
+                f"WHERE ts >= ? AND ts < ? ORDER BY {column}, ts",
+                (int(start), int(end)),
+            ).fetchall()
+        return [tuple(r) for r in rows]
+
+    def prune_before(self, ts: float) -> None:
+        """
+        Drop hot rows older than `ts` once they have been archived.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for table, _ in _SNAPSHOT_TABLES.values():
+                    self._conn.execute(f"DELETE FROM {table} WHERE ts < ?", (int(ts),))
+                self._conn.execute(
+                    "INSERT INTO meta (name, value) VALUES ('archived_before', ?) "
+                    "ON CONFLICT (name) DO UPDATE SET value = MAX(value, excluded.value)",
+                    (int(ts),),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def history(
+        self, kind: str, item_id: str, since: Optional[float] = None, until: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Snapshots of one channel / video, oldest first, as
+        {"ts", *SNAPSHOT_COLUMNS[kind]} dicts. Reads the day archive for
+        periods that have already been moved out of SQLite.
+        """
+        key = self.key_for(kind, item_id)
+        if key is None:
+            return []
+        since = int(since or 0)
+        until = int(until if until is not None else 2**62)
+        names = ("ts",) + SNAPSHOT_COLUMNS[kind]
+
+        out: List[Dict[str, Any]] = []
+        archived_before = self.archived_before()
+        if since < archived_before:
+            from .archive import read_archived
+
+            for row in read_archived(kind, key, since, min(until, archived_before - 1)):
+                out.append(dict(zip(names, row)))
+
+        table, column = _SNAPSHOT_TABLES[kind]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT ts, {', '.join(SNAPSHOT_COLUMNS[kind])} FROM {table} "
+                f"WHERE {column} = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+                (key, since, until),
+            ).fetchall()
+        out.extend(dict(r) for r in rows)
+        return out
+
+    def channel_for_video(self, video_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT c.channel_id FROM videos v JOIN channels c ON c.channel_key = v.channel_key "
+                "WHERE v.video_id = ?",
+                (video_id,),
+            ).fetchone()
+        return row["channel_id"] if row is not None else None
+
+    def channel_as_of(self, channel_id: str, ts: float) -> Optional[Dict[str, Any]]:
+        """
+        Channel dict (same shape as client.get_channel_stats) built from the
+        newest snapshot at or before `ts`; None when nothing was recorded by then.
+        Name / region / uploads playlist are the latest known values.
+        """
+        key = self.key_for("channel", channel_id)
+        if key is None:
+            return None
+        ts = int(ts)
+        with self._lock:
+            info = self._conn.execute(
+                "SELECT title, country, uploads_playlist_id FROM channel_info WHERE channel_key = ?",
+                (key,),
+            ).fetchone()
+            row = self._conn.execute(
+                "SELECT ts, subscribers FROM channel_snapshots "
+                "WHERE channel_key = ? AND ts <= ? ORDER BY ts DESC LIMIT 1",
+                (key, ts),
+            ).fetchone()
+        subscribers = row["subscribers"] if row is not None else None
+        if row is None and ts < self.archived_before():
+            from .archive import latest_archived
+
+            archived = latest_archived("channel", key, ts)
+            subscribers = archived[1] if archived is not None else None
+        if subscribers is None:
+            return None
+
+        return {
+            "channel_id": channel_id,
+            "channel_name": info["title"] if info is not None else "",
+            "subscribers": int(subscribers),
+            "region": (info["country"] if info is not None else "") or "Global",
+            "uploads_playlist_id": info["uploads_playlist_id"] if info is not None else "",
+            "channel_url": f"https://www.youtube.com/channel/{channel_id}",
+        }
+
+    def videos_as_of(self, channel_id: str, ts: float, count: int) -> List[VideoRecord]:
+        """
+        The `count` newest uploads published by `ts`, each with its newest
+        snapshot at or before `ts`, shaped like client._video_from_item.
+        Uses the (channel_key, ts) index; archived days are consulted only for
+        videos with no hot snapshot before `ts`.
+        """
+        key = self.key_for("channel", channel_id)
+        if key is None:
+            return []
+        ts = int(ts)
+        with self._lock:
+            meta = self._conn.execute(
+                "SELECT video_key, video_id, title, published_at, duration FROM videos "
+                "WHERE channel_key = ? AND published_at != ''",
+                (key,),
+            ).fetchall()
+            # Bare columns with MAX(): SQLite takes them from the max-ts row
+            stats = {
+                r["video_key"]: (r["views"], r["likes"], r["comments"])
+                for r in self._conn.execute(
+                    "SELECT video_key, MAX(ts) AS ts, views, likes, comments FROM video_snapshots "
+                    "WHERE channel_key = ? AND ts <= ? GROUP BY video_key",
+                    (key, ts),
+                )
+            }
+
+        published = [(timestamp_seconds(m["published_at"]), m) for m in meta]
+        published = sorted(
+            (p for p in published if p[0] is not None and p[0] <= ts),
+            key=lambda p: p[0],
+            reverse=True,
+        )
+
+        archived_before = self.archived_before()
+        videos: List[VideoRecord] = []
+        for published_ts, m in published:
+            counters = stats.get(m["video_key"])
+            if counters is None and archived_before > 0:
+                from .archive import latest_archived
+
+                archived = latest_archived(
+                    "video", m["video_key"], min(ts, archived_before - 1), since=published_ts
+                )
+                # (ts, channel_key, views, likes, comments)
+                counters = archived[2:5] if archived is not None else None
+            if counters is None:
+                continue
+            videos.append(VideoRecord(
+                video_id=m["video_id"],
+                title=m["title"],
+                publishedAt=m["published_at"],
+                views=counters[0],
+                likes=counters[1],
+                comments=counters[2],
+                duration=m["duration"],
+            ))
+            if len(videos) >= count:
+                break
+        return videos
+
+    def channel_history(
+        self, channel_id: str, since: Optional[float] = None, until: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        [{"ts", "subscribers", "views", "video_count"}] oldest first.
+        """
+        return self.history("channel", channel_id, since, until)
+
+    def video_history(
+        self, video_id: str, since: Optional[float] = None, until: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        [{"ts", "channel_key", "views", "likes", "comments"}] oldest first.
+        """
+        return self.history("video", video_id, since, until)
+
+
+_store: Optional[SnapshotStore] = None
+_store_lock = threading.Lock()
+
+# Called as listener(endpoint, items) after each recorded response
+_listeners: List[Callable[[str, List[Dict[str, Any]]], None]] = []
+
+
+def get_snapshot_store() -> SnapshotStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SnapshotStore()
+    return _store
+
+
+def record_response(endpoint: str, payload: Dict[str, Any]) -> None:
+    """
+    Record the items of a freshly fetched API response. Never raises: losing a
+    snapshot must not fail the fetch that produced it.
+    """
+    if endpoint not in SNAPSHOT_ENDPOINTS:
+        return
+    items = payload.get("items", [])
+    try:
+        get_snapshot_store().record(endpoint, items)
+    except Exception as e:
+        print(f"[Snapshot store error] {e}")
+    for listener in list(_listeners):
+        try:
+            listener(endpoint, items)
+        except Exception as e:
+            print(f"[Snapshot listener error] {e}")
+
+
+def subscribe(listener: Callable[[str, List[Dict[str, Any]]], None]) -> None:
+    """
+    Also hand every freshly fetched channels()/videos() response to `listener`
+    (e.g. to keep rolling windows current). Listeners must be cheap; they run
+    on the fetching thread.
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
@@ -0,0 +1,401 @@
+"""
+src/youtube/sync.py
+Incremental uploads sync on top of the YouTube client.
+
+Per uploads playlist we remember the newest video we have seen, plus the last
+fetched stats of every stored video. A sync then:
+
+1. pages playlistItems from the top only until it reaches the known newest video,
+2. fetches stats for the new videos and for stored videos whose stats are due
+   for a refresh (age-tiered TTLs, see refresh.py),
+3. serves everything else from the local store.
+
+With nothing new uploaded this is one small playlistItems call (usually an ETag
+revalidation) plus at most one videos() call for the uploads that are due.
+sync_recent_videos_async() is the same sync over the async client.
+
+refresh_due_videos() applies the same policy across every stored playlist, for
+scheduled watchlist refreshes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+from googleapiclient.errors import HttpError
+
+from .async_client import _api_get
+from .client import _MAX_IDS_PER_CALL, YouTubeAPIError, _chunks, _execute, _video_from_item
+from .pool import discard_if_broken, youtube_client
+from .quota import QuotaExceededError, tenant_scope
+from .refresh import is_stale, next_due
+from src.models.video import VideoRecord, json_default
+from src.utils.db import connect
+from src.utils.timeparse import NO_DATE, timestamp_seconds
+
+
+class UploadStore:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._conn = connect("uploads")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS playlist_state (
+                playlist_id       TEXT PRIMARY KEY,
+                newest_video_id   TEXT NOT NULL,
+                newest_published  REAL NOT NULL,
+                synced_at         REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS videos (
+                video_id     TEXT PRIMARY KEY,
+                playlist_id  TEXT NOT NULL,
+                published_ts REAL NOT NULL,
+                fetched_at   REAL NOT NULL,
+                due_at       REAL NOT NULL DEFAULT 0,
+                data         TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_videos_playlist_published
+                ON videos (playlist_id, published_ts DESC);
+            """
+        )
+        columns = {r["name"] for r in self._conn.execute("PRAGMA table_info(videos)")}
+        if "due_at" not in columns:
+            # Stores created before due_at: every video is due once
+            self._conn.execute("ALTER TABLE videos ADD COLUMN due_at REAL NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_due ON videos (due_at)")
+
+    def get_state(self, playlist_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT newest_video_id, newest_published, synced_at FROM playlist_state WHERE playlist_id = ?",
+                (playlist_id,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def set_state(self, playlist_id: str, newest_video_id: str, newest_published: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO playlist_state (playlist_id, newest_video_id, newest_published, synced_at) "
+                "VALUES (?, ?, ?, ?)",
+                (playlist_id, newest_video_id, newest_published, time.time()),
+            )
+
+    def recent(self, playlist_id: str, count: int) -> List[Dict[str, Any]]:
+        """
+        Newest-first stored rows: {"video": {...}, "published_ts": float, "fetched_at": float}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data, published_ts, fetched_at FROM videos WHERE playlist_id = ? "
+                "ORDER BY published_ts DESC LIMIT ?",
+                (playlist_id, count),
+            ).fetchall()
+        return [
+            {"video": VideoRecord.from_mapping(json.loads(r["data"])), "published_ts": r["published_ts"], "fetched_at": r["fetched_at"]}
+            for r in rows
+        ]
+
+    def count(self, playlist_id: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS n FROM videos WHERE playlist_id = ?", (playlist_id,)
+            ).fetchone()
+        return int(row["n"])
+
+    def upsert(self, playlist_id: str, videos: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        rows = []
+        for v in videos:
+            if not v.get("video_id"):
+                continue
+            published_ts = _published_ts(v)
+            rows.append((
+                v["video_id"],
+                playlist_id,
+                published_ts,
+                now,
+                next_due(published_ts, now),
+                json.dumps(v, separators=(",", ":"), default=json_default),
+            ))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO videos (video_id, playlist_id, published_ts, fetched_at, due_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute("COMMIT")
+
+    def due(self, now: float, limit: int) -> List[Dict[str, Any]]:
+        """
+        Stored videos whose stats TTL has expired, most overdue first:
+        [{"video_id": str, "playlist_id": str}]
+        due_at is written with the stats (refresh.next_due), so this is a
+        range scan on idx_videos_due rather than a pass over every row.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT video_id, playlist_id FROM videos WHERE due_at <= ? ORDER BY due_at LIMIT ?",
+                (now, limit),
+            ).fetchall()
+        return [{"video_id": r["video_id"], "playlist_id": r["playlist_id"]} for r in rows]
+
+    def delete(self, video_ids: List[str]) -> None:
+        if not video_ids:
+            return
+        with self._lock:
+            self._conn.executemany("DELETE FROM videos WHERE video_id = ?", [(v,) for v in video_ids])
+
+
+_store: Optional[UploadStore] = None
+_store_lock = threading.Lock()
+
+
+def get_upload_store() -> UploadStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = UploadStore()
+    return _store
+
+
+def _published_ts(video: Dict[str, Any]) -> float:
+    # Parsed once when the record was built
+    published_us = VideoRecord.from_mapping(video).published_us
+    return 0.0 if published_us == NO_DATE else published_us / 1_000_000
+
+
+def sync_recent_videos(playlist_id: str, count: int = 8) -> List[Dict[str, Any]]:
+    """
+    Incremental version of client.get_recent_videos (same return shape and
+    errors). When the quota is exhausted, the stored uploads are served.
+    """
+    if not playlist_id:
+        return []
+
+    with youtube_client() as youtube:
+        try:
+            return _sync(youtube, playlist_id, count)
+        except QuotaExceededError:
+            stored = get_upload_store().recent(playlist_id, count)
+            if not stored:
+                raise
+            return [row["video"] for row in stored]
+        except HttpError as e:
+            print(f"[YouTube API HttpError] {e}")
+            raise YouTubeAPIError("YouTube API error while fetching recent uploads.") from e
+        except Exception as e:
+            print(f"[YouTube API Error] {e}")
+            discard_if_broken(youtube, e)
+            raise YouTubeAPIError("Could not fetch recent uploads from the YouTube API.") from e
+
+
+async def sync_recent_videos_async(playlist_id: str, count: int = 8) -> List[Dict[str, Any]]:
+    """
+    sync_recent_videos over the async client's connection pool. Store reads and
+    writes run in a worker thread so they never block the event loop.
+    """
+    if not playlist_id:
+        return []
+
+    store = get_upload_store()
+    try:
+        state = await asyncio.to_thread(_listing_state, store, playlist_id, count)
+
+        listed: List[str] = []
+        page_token: Optional[str] = None
+        while True:
+            response = await _api_get("playlistItems", **_playlist_params(playlist_id, count, listed, page_token))
+            page_token = _take_new_video_ids(response, state, count, listed)
+            if page_token is None:
+                break
+
+        to_fetch = await asyncio.to_thread(_to_fetch, store, playlist_id, listed, count)
+        fetched: List[Dict[str, Any]] = []
+        for chunk in _chunks(to_fetch, _MAX_IDS_PER_CALL):
+            response = await _api_get("videos", part="statistics,snippet,contentDetails", id=",".join(chunk))
+            fetched.extend(_video_from_item(item) for item in response.get("items", []))
+
+        return await asyncio.to_thread(_apply, store, playlist_id, to_fetch, fetched, count)
+    except QuotaExceededError:
+        stored = await asyncio.to_thread(store.recent, playlist_id, count)
+        if not stored:
+            raise
+        return [row["video"] for row in stored]
+    except httpx.HTTPStatusError as e:
+        print(f"[YouTube API HttpError] {e}")
+        raise YouTubeAPIError("YouTube API error while fetching recent uploads.") from e
+    except Exception as e:
+        print(f"[YouTube API Error] {e}")
+        raise YouTubeAPIError("Could not fetch recent uploads from the YouTube API.") from e
+
+
+def _sync(youtube, playlist_id: str, count: int) -> List[Dict[str, Any]]:
+    store = get_upload_store()
+    state = _listing_state(store, playlist_id, count)
+    listed = _list_new_video_ids(youtube, playlist_id, state, count)
+    to_fetch = _to_fetch(store, playlist_id, listed, count)
+    fetched = _fetch_videos(youtube, to_fetch)
+    return _apply(store, playlist_id, to_fetch, fetched, count)
+
+
+def _listing_state(store: UploadStore, playlist_id: str, count: int) -> Optional[Dict[str, Any]]:
+    # Not enough history stored for this `count`: list the top `count` in full,
+    # but still only fetch stats for unknown / due videos.
+    state = store.get_state(playlist_id)
+    if state is None or store.count(playlist_id) < count:
+        return None
+    return state
+
+
+def _to_fetch(store: UploadStore, playlist_id: str, listed: List[str], count: int) -> List[str]:
+    """
+    Newly listed IDs plus the stored uploads (within `count`) whose stats are due.
+    """
+    stored = store.recent(playlist_id, count)
+    stored_ids: Set[str] = {row["video"].get("video_id", "") for row in stored}
+
+    now = time.time()
+    to_fetch = [v for v in listed if v not in stored_ids]
+    keep = stored[: max(count - len(to_fetch), 0)]
+    to_fetch += [
+        row["video"]["video_id"]
+        for row in keep
+        if is_stale(row["published_ts"], row["fetched_at"], now)
+    ]
+    return to_fetch
+
+
+def _apply(
+    store: UploadStore,
+    playlist_id: str,
+    to_fetch: List[str],
+    fetched: List[Dict[str, Any]],
+    count: int,
+) -> List[Dict[str, Any]]:
+    store.upsert(playlist_id, fetched)
+    store.delete([v for v in to_fetch if v not in {f["video_id"] for f in fetched}])
+
+    result = [row["video"] for row in store.recent(playlist_id, count)]
+    if result:
+        newest = result[0]
+        store.set_state(playlist_id, newest["video_id"], _published_ts(newest))
+    return result
+
+
+def _list_new_video_ids(
+    youtube, playlist_id: str, state: Optional[Dict[str, Any]], count: int
+) -> List[str]:
+    """
+    Newest-first video IDs from the top of the playlist, stopping at the first
+    already-known upload (or after `count` IDs).
+    """
+    video_ids: List[str] = []
+    page_token: Optional[str] = None
+
+    while True:
+        params = _playlist_params(playlist_id, count, video_ids, page_token)
+        response = _execute(youtube.playlistItems().list(**params))
+        page_token = _take_new_video_ids(response, state, count, video_ids)
+        if page_token is None:
+            return video_ids
+
+
+def _playlist_params(
+    playlist_id: str, count: int, video_ids: List[str], page_token: Optional[str]
+) -> Dict[str, Any]:
+    # First page is sized to `count`; later pages are full
+    params: Dict[str, Any] = {
+        "part": "contentDetails",
+        "playlistId": playlist_id,
+        "maxResults": _MAX_IDS_PER_CALL if page_token else min(max(count, 1), _MAX_IDS_PER_CALL),
+    }
+    if page_token:
+        params["pageToken"] = page_token
+    return params
+
+
+def _take_new_video_ids(
+    response: Dict[str, Any], state: Optional[Dict[str, Any]], count: int, video_ids: List[str]
+) -> Optional[str]:
+    """
+    Append one playlistItems page's new IDs to `video_ids`. Returns the token of
+    the next page to list, or None once a known upload / `count` IDs / the end
+    of the playlist is reached.
+    """
+    for item in response.get("items", []):
+        details = item.get("contentDetails", {})
+        video_id = details.get("videoId")
+        if not video_id:
+            continue
+        if state is not None:
+            published = timestamp_seconds(details.get("videoPublishedAt"))
+            if video_id == state["newest_video_id"] or (
+                published is not None and published <= state["newest_published"]
+            ):
+                return None
+        video_ids.append(video_id)
+        if len(video_ids) >= count:
+            return None
+    return response.get("nextPageToken")
+
+
+def _fetch_videos(youtube, video_ids: List[str]) -> List[Dict[str, Any]]:
+    videos: List[Dict[str, Any]] = []
+    for chunk in _chunks(video_ids, _MAX_IDS_PER_CALL):
+        response = _execute(
+            youtube.videos().list(
+                part="statistics,snippet,contentDetails",
+                id=",".join(chunk),
+            )
+        )
+        videos.extend(_video_from_item(item) for item in response.get("items", []))
+    return videos
+
+
+def refresh_due_videos(max_videos: int = 5000) -> int:
+    """
+    Re-fetch stats for stored videos (any playlist) whose age-tiered TTL has
+    expired, 50 IDs per videos().list call. Returns the number refreshed.
+    Charged to the "refresh" quota tenant.
+    """
+    store = get_upload_store()
+    due = store.due(time.time(), max_videos)
+    if not due:
+        return 0
+
+    playlist_of = {row["video_id"]: row["playlist_id"] for row in due}
+    refreshed = 0
+    with youtube_client() as youtube, tenant_scope("refresh"):
+        for chunk in _chunks(list(playlist_of), _MAX_IDS_PER_CALL):
+            try:
+                fetched = _fetch_videos(youtube, chunk)
+            except QuotaExceededError as e:
+                # Budget gone or rate-limited: the rest stays due for next run
+                print(f"[YouTube API Quota] {e}")
+                break
+            except HttpError as e:
+                print(f"[YouTube API HttpError] {e}")
+                break
+            except Exception as e:
+                print(f"[YouTube API Error] {e}")
+                discard_if_broken(youtube, e)
+                break
+
+            by_playlist: Dict[str, List[Dict[str, Any]]] = {}
+            for video in fetched:
+                by_playlist.setdefault(playlist_of[video["video_id"]], []).append(video)
+            for playlist_id, videos in by_playlist.items():
+                store.upsert(playlist_id, videos)
+
+            found = {v["video_id"] for v in fetched}
+            store.delete([v for v in chunk if v not in found])
+            refreshed += len(fetched)
+
+    return refreshed
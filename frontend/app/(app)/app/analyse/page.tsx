@@ -54,71 +54,161 @@ export default function AnalysePage() {
   const [error, setError] = useState<string | null>(null);
   const [data, setData] = useState<ApiResponse | null>(null);
 
+  // Server-side save is an explicit action on a finished analysis
+  const [lastRun, setLastRun] = useState<{
+    youtubeUrl: string;
+    videoCount: number;
+  } | null>(null);
+  const [saving, setSaving] = useState(false);
+  const [savedId, setSavedId] = useState<number | null>(null);
+
   const apiBase = useMemo(() => {
     return process.env.NEXT_PUBLIC_API_BASE_URL || "http://127.0.0.1:8000";
   }, []);
 
-  async function runAnalysis(e: React.FormEvent) {
+  function saveAnalysis(
+    channel: ApiChannel,
+    metrics: ApiResponse["metrics"] | undefined,
+  ) {
+    const createdAt = new Date().toISOString();
+    const id = `${Date.now()}`;
+
+    const medianViews = safeNum(metrics?.median_views);
+    const averageViews = safeNum(metrics?.mean_views);
+
+    const feeNum =
+      quotedFeeClient.trim() === "" ? undefined : Number(quotedFeeClient);
+    const fee = Number.isFinite(feeNum as number) ? feeNum : undefined;
+
+    const tCpmNum = targetCpm.trim() === "" ? undefined : Number(targetCpm);
+    const tCpm = Number.isFinite(tCpmNum as number) ? tCpmNum : undefined;
+
+    upsertAnalysis({
+      id,
+      channelId: channel.channel_id,
+      channelName: channel.channel_name,
+      channelUrl: channel.channel_url,
+      region: channel.region,
+      subscribers: channel.subscribers,
+      medianViews,
+      averageViews,
+      createdAt,
+
+      // Pricing inputs persisted for calculator + later
+      clientCurrency,
+      creatorCurrency,
+      quotedFeeClient: fee,
+      targetMarginPct,
+      targetCpm: tCpm,
+    });
+  }
+
+  // Streams the analysis over SSE so the creator header renders after the
+  // first API call instead of after the whole pipeline.
+  function runAnalysis(e: React.FormEvent) {
     e.preventDefault();
     setError(null);
     setLoading(true);
     setData(null);
+    setLastRun(null);
+    setSavedId(null);
+
+    const run = { youtubeUrl: youtubeUrl.trim(), videoCount };
+    const params = new URLSearchParams({
+      youtube_url: run.youtubeUrl,
+      video_count: String(run.videoCount),
+    });
+    const source = new EventSource(
+      `${apiBase}/api/analysis/stream?${params.toString()}`,
+    );
+
+    let channel: ApiChannel | null = null;
+    let metrics: ApiResponse["metrics"] | undefined;
+
+    const finish = () => {
+      source.close();
+      setLoading(false);
+    };
+
+    source.addEventListener("channel", (ev) => {
+      channel = JSON.parse((ev as MessageEvent).data) as ApiChannel;
+      setData({ channel });
+    });
+
+    source.addEventListener("videos", (ev) => {
+      const videos = JSON.parse(
+        (ev as MessageEvent).data,
+      ) as ApiResponse["videos"];
+      setData((prev) => (prev ? { ...prev, videos } : prev));
+    });
+
+    source.addEventListener("metrics_report", (ev) => {
+      const report = JSON.parse((ev as MessageEvent).data);
+      metrics = {
+        mean_views: safeNum(report.mean_views),
+        median_views: safeNum(report.median_views),
+        engagement_rate: safeNum(report.engagement_rate_percent),
+        like_rate: safeNum(report.like_rate_percent),
+        comment_rate: safeNum(report.comment_rate_percent),
+        volatility_ratio: safeNum(report.volatility_ratio),
+        risk_level: report.risk_level,
+      };
+      setData((prev) => (prev ? { ...prev, metrics } : prev));
+    });
+
+    // Last event of the stream
+    source.addEventListener("analysis", () => {
+      if (channel) saveAnalysis(channel, metrics);
+      setLastRun(run);
+      finish();
+    });
+
+    // Fires for server-sent `error` events (with data) and for dropped connections
+    source.addEventListener("error", (ev) => {
+      const raw = (ev as MessageEvent).data;
+      if (raw) {
+        try {
+          const payload = JSON.parse(raw);
+          setError(
+            `API error (${payload.status}). ${payload.detail || "Check backend logs."}`,
+          );
+        } catch {
+          setError("Something went wrong.");
+        }
+      } else {
+        setError("Lost connection to the API. Check backend logs.");
+      }
+      finish();
+    });
+  }
 
+  // Stores a server-side copy for the Saved page. The analysis was just run,
+  // so the backend serves it from its result cache.
+  async function saveReport() {
+    if (!lastRun) return;
+    setError(null);
+    setSaving(true);
     try {
-      const res = await fetch(`${apiBase}/api/analysis`, {
+      const res = await fetch(`${apiBase}/api/reports`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
-          youtube_url: youtubeUrl.trim(),
-          video_count: videoCount,
+          youtube_url: lastRun.youtubeUrl,
+          video_count: lastRun.videoCount,
         }),
       });
-
       if (!res.ok) {
         const text = await res.text().catch(() => "");
         throw new Error(
           `API error (${res.status}). ${text || "Check backend logs."}`,
         );
       }
-
-      const json = (await res.json()) as ApiResponse;
-      setData(json);
-
-      const createdAt = new Date().toISOString();
-      const id = `${Date.now()}`;
-
-      const medianViews = safeNum(json.metrics?.median_views);
-      const averageViews = safeNum(json.metrics?.mean_views);
-
-      const feeNum =
-        quotedFeeClient.trim() === "" ? undefined : Number(quotedFeeClient);
-      const fee = Number.isFinite(feeNum as number) ? feeNum : undefined;
-
-      const tCpmNum = targetCpm.trim() === "" ? undefined : Number(targetCpm);
-      const tCpm = Number.isFinite(tCpmNum as number) ? tCpmNum : undefined;
-
-      upsertAnalysis({
-        id,
-        channelId: json.channel.channel_id,
-        channelName: json.channel.channel_name,
-        channelUrl: json.channel.channel_url,
-        region: json.channel.region,
-        subscribers: json.channel.subscribers,
-        medianViews,
-        averageViews,
-        createdAt,
-
-        // Pricing inputs persisted for calculator + later
-        clientCurrency,
-        creatorCurrency,
-        quotedFeeClient: fee,
-        targetMarginPct,
-        targetCpm: tCpm,
-      });
+      const saved = (await res.json()) as { id: number };
+      setSavedId(saved.id);
     } catch (err: any) {
-      setError(err?.message || "Something went wrong.");
+      setError(err?.message || "Could not save the report.");
     } finally {
-      setLoading(false);
+      setSaving(false);
     }
   }
 
@@ -271,6 +361,18 @@ export default function AnalysePage() {
             {loading ? "Analysing…" : "Run analysis"}
           </button>
 
+          {lastRun && (
+            <button
+              type="button"
+              onClick={saveReport}
+              disabled={saving || savedId !== null}
+              className="rounded-xl px-4 py-2 text-sm font-medium transition disabled:opacity-60"
+              style={{ border: "1px solid var(--border)" }}
+            >
+              {savedId !== null ? "Saved" : saving ? "Saving…" : "Save report"}
+            </button>
+          )}
+
           <div className="text-xs opacity-70">
             API: <span className="opacity-90">{apiBase}</span>
           </div>
@@ -350,6 +452,16 @@ export default function AnalysePage() {
           }}
         >
           <div className="text-sm font-semibold">Latest result</div>
+          {data?.channel && (
+            <div className="mt-2 text-sm">
+              <div className="font-medium">{data.channel.channel_name}</div>
+              <div className="mt-1 text-xs opacity-70">
+                {data.channel.region ?? "Global"} •{" "}
+                {data.channel.subscribers.toLocaleString()} subs
+                {data.videos ? ` • ${data.videos.length} videos` : ""}
+              </div>
+            </div>
+          )}
           <div className="mt-2 text-sm opacity-80">
             {data?.metrics ? (
               <div className="grid grid-cols-2 gap-3 text-xs">
@@ -380,6 +492,8 @@ export default function AnalysePage() {
                   </div>
                 </div>
               </div>
+            ) : loading && data?.channel ? (
+              "Crunching recent uploads…"
             ) : (
               "Run an analysis to see metrics."
             )}
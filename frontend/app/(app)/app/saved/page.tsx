@@ -1,10 +1,242 @@
+"use client";
+
+import { useEffect, useMemo, useState } from "react";
+
+type SavedReport = {
+  id: number;
+  channel_id: string;
+  channel_name: string;
+  channel_url: string;
+  region: string;
+  tier: string;
+  subscribers: number;
+  dashboard_score: number;
+  engagement_rate_percent: number;
+  median_views: number;
+  mean_views: number;
+  video_count: number;
+  created_at: string;
+};
+
+type ReportPage = {
+  items: SavedReport[];
+  total: number;
+  limit: number;
+  offset: number;
+};
+
+const PAGE_SIZE = 25;
+
+const TIERS = ["", "mega", "macro", "micro", "nano", "tiny"];
+
+const SORTS: Array<{ value: string; label: string }> = [
+  { value: "created_at", label: "Newest" },
+  { value: "dashboard_score", label: "Dashboard score" },
+  { value: "engagement_rate_percent", label: "Engagement rate" },
+  { value: "subscribers", label: "Subscribers" },
+  { value: "median_views", label: "Median views" },
+];
+
 export default function SavedPage() {
+  const [tier, setTier] = useState("");
+  const [sort, setSort] = useState("created_at");
+  const [latestOnly, setLatestOnly] = useState(true);
+  const [offset, setOffset] = useState(0);
+
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState<string | null>(null);
+  const [page, setPage] = useState<ReportPage | null>(null);
+
+  const apiBase = useMemo(() => {
+    return process.env.NEXT_PUBLIC_API_BASE_URL || "http://127.0.0.1:8000";
+  }, []);
+
+  useEffect(() => {
+    const params = new URLSearchParams({
+      sort,
+      order: "desc",
+      limit: String(PAGE_SIZE),
+      offset: String(offset),
+      latest_per_channel: String(latestOnly),
+    });
+    if (tier) params.set("tier", tier);
+
+    let cancelled = false;
+    setLoading(true);
+    setError(null);
+
+    fetch(`${apiBase}/api/reports?${params.toString()}`)
+      .then(async (res) => {
+        if (!res.ok) throw new Error(`API error (${res.status})`);
+        return (await res.json()) as ReportPage;
+      })
+      .then((json) => {
+        if (!cancelled) setPage(json);
+      })
+      .catch((err: Error) => {
+        if (!cancelled) setError(err.message || "Something went wrong.");
+      })
+      .finally(() => {
+        if (!cancelled) setLoading(false);
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [apiBase, tier, sort, latestOnly, offset]);
+
+  const total = page?.total ?? 0;
+
   return (
-    <div className="space-y-2">
-      <h1 className="text-2xl font-semibold">Saved</h1>
-      <p className="text-sm opacity-80">
-        Saved creator reports will live here once login + storage are enabled.
-      </p>
+    <div className="mx-auto max-w-4xl">
+      <div className="mb-6">
+        <div className="text-2xl font-semibold">Saved</div>
+        <div className="mt-1 text-sm opacity-70">
+          Reports you save with &ldquo;Save report&rdquo; on the Analyse page.
+          Each row keeps the metrics as they were when you saved it.
+        </div>
+      </div>
+
+      <div className="mb-4 flex flex-wrap items-center gap-3 text-sm">
+        <select
+          value={tier}
+          onChange={(e) => {
+            setTier(e.target.value);
+            setOffset(0);
+          }}
+          className="rounded-xl px-3 py-2 outline-none"
+          style={{ border: "1px solid var(--border)", background: "transparent" }}
+        >
+          {TIERS.map((t) => (
+            <option key={t} value={t}>
+              {t ? `Tier: ${t}` : "All tiers"}
+            </option>
+          ))}
+        </select>
+
+        <select
+          value={sort}
+          onChange={(e) => {
+            setSort(e.target.value);
+            setOffset(0);
+          }}
+          className="rounded-xl px-3 py-2 outline-none"
+          style={{ border: "1px solid var(--border)", background: "transparent" }}
+        >
+          {SORTS.map((s) => (
+            <option key={s.value} value={s.value}>
+              Sort: {s.label}
+            </option>
+          ))}
+        </select>
+
+        <label className="flex items-center gap-2 text-xs opacity-80">
+          <input
+            type="checkbox"
+            checked={latestOnly}
+            onChange={(e) => {
+              setLatestOnly(e.target.checked);
+              setOffset(0);
+            }}
+          />
+          Latest report per creator
+        </label>
+
+        <div className="ml-auto text-xs opacity-70">
+          {loading ? "Loading…" : `${total.toLocaleString()} saved`}
+        </div>
+      </div>
+
+      {error && (
+        <div
+          className="mb-4 rounded-xl p-3 text-sm"
+          style={{
+            border: "1px solid var(--border)",
+            background: "color-mix(in srgb, var(--muted) 70%, transparent)",
+          }}
+        >
+          <div className="font-medium">Error</div>
+          <div className="mt-1 opacity-80">{error}</div>
+        </div>
+      )}
+
+      <div
+        className="rounded-2xl p-2"
+        style={{
+          border: "1px solid var(--border)",
+          background: "rgba(255,255,255,0.04)",
+          backdropFilter: "blur(10px)",
+        }}
+      >
+        {page && page.items.length > 0 ? (
+          <table className="w-full text-left text-xs">
+            <thead className="opacity-70">
+              <tr>
+                <th className="p-2">Creator</th>
+                <th className="p-2">Tier</th>
+                <th className="p-2">Subs</th>
+                <th className="p-2">Median views</th>
+                <th className="p-2">Engagement</th>
+                <th className="p-2">Score</th>
+                <th className="p-2">Saved</th>
+              </tr>
+            </thead>
+            <tbody>
+              {page.items.map((r) => (
+                <tr key={r.id} style={{ borderTop: "1px solid var(--border)" }}>
+                  <td className="p-2 font-medium">
+                    {r.channel_url ? (
+                      <a href={r.channel_url} target="_blank" rel="noreferrer">
+                        {r.channel_name}
+                      </a>
+                    ) : (
+                      r.channel_name
+                    )}
+                  </td>
+                  <td className="p-2">{r.tier}</td>
+                  <td className="p-2">{r.subscribers.toLocaleString()}</td>
+                  <td className="p-2">{Math.round(r.median_views).toLocaleString()}</td>
+                  <td className="p-2">{r.engagement_rate_percent.toFixed(2)}%</td>
+                  <td className="p-2">{r.dashboard_score.toFixed(1)}</td>
+                  <td className="p-2 opacity-70">
+                    {new Date(r.created_at).toLocaleDateString()}
+                  </td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        ) : (
+          <div className="p-3 text-sm opacity-80">
+            {loading
+              ? "Loading…"
+              : "No saved reports yet — run an analysis and use “Save report”."}
+          </div>
+        )}
+      </div>
+
+      {total > PAGE_SIZE && (
+        <div className="mt-4 flex items-center gap-3 text-sm">
+          <button
+            disabled={offset === 0 || loading}
+            onClick={() => setOffset(Math.max(offset - PAGE_SIZE, 0))}
+            className="rounded-xl px-3 py-1 disabled:opacity-50"
+            style={{ border: "1px solid var(--border)" }}
+          >
+            Previous
+          </button>
+          <div className="text-xs opacity-70">
+            {offset + 1}–{Math.min(offset + PAGE_SIZE, total)} of {total}
+          </div>
+          <button
+            disabled={offset + PAGE_SIZE >= total || loading}
+            onClick={() => setOffset(offset + PAGE_SIZE)}
+            className="rounded-xl px-3 py-1 disabled:opacity-50"
+            style={{ border: "1px solid var(--border)" }}
+          >
+            Next
+          </button>
+        </div>
+      )}
     </div>
   );
 }
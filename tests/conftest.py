@@ -0,0 +1,66 @@
+import os
+import queue
+import sys
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Backend modules import as `src.…`, relative to backend/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+# Stores opened by a test never touch the real data directory
+os.environ.setdefault("INFLUENCER_INTEL_DATA_DIR", tempfile.mkdtemp(prefix="influencer-intel-tests-"))
+
+# Manual scripts that call the live YouTube API
+collect_ignore = ["test_client.py", "test_parser.py"]
+
+API_KEY = "test-api-key-123"
+
+
+@pytest.fixture
+def youtube(tmp_path, monkeypatch):
+    """
+    A FakeYouTube behind both API clients, with every store (response cache,
+    quota ledger, resolution index, snapshots, uploads, jobs, reports) opened
+    fresh under tmp_path.
+    """
+    from googleapiclient.discovery import build_from_document
+
+    from fake_youtube import FakeYouTube
+    from src.services import jobs, report_store, result_cache, rolling_windows
+    from src.youtube import archive, async_client, cache, pool, quota, resolution, snapshots, sync
+
+    api = FakeYouTube()
+    monkeypatch.setenv("INFLUENCER_INTEL_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("YOUTUBE_API_KEY", API_KEY)
+    for module, name in [
+        (cache, "_cache"),
+        (quota, "_ledger"),
+        (resolution, "_index"),
+        (snapshots, "_store"),
+        (sync, "_store"),
+        (jobs, "_store"),
+        (jobs, "_runner"),
+        (report_store, "_store"),
+        (rolling_windows, "_registry"),
+    ]:
+        monkeypatch.setattr(module, name, None)
+    monkeypatch.setattr(result_cache, "_CACHE", {})
+    monkeypatch.setattr(archive, "_open", OrderedDict())
+    monkeypatch.setattr(archive, "_days", {})
+
+    def _build_client(api_key):
+        return build_from_document(pool._get_discovery_document(), developerKey=api_key, http=api.http())
+
+    monkeypatch.setattr(pool, "_build_client", _build_client)
+    monkeypatch.setattr(pool, "_idle", queue.LifoQueue(maxsize=pool._POOL_SIZE))
+    monkeypatch.setattr(pool, "_api_key_for_pool", None)
+
+    monkeypatch.setattr(
+        async_client,
+        "_client",
+        httpx.AsyncClient(base_url=async_client._API_BASE, transport=api.transport()),
+    )
+    return api
@@ -0,0 +1,193 @@
+"""
+In-process stand-in for the YouTube Data API v3 endpoints the backend calls
+(channels, videos, playlistItems, search).
+
+It is plugged in below the clients, so the ETag cache, quota ledger, client
+pool and response parsing all run for real:
+- http() returns an httplib2.Http look-alike for googleapiclient services
+- transport() returns an httpx.MockTransport for the async client
+
+Every response carries an ETag; a request whose If-None-Match matches the
+current body gets a 304. fail(endpoint, status) makes the next calls to an
+endpoint return an error.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import httplib2
+import httpx
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def channel_id(n: int) -> str:
+    return f"UC{n:022d}"
+
+
+class FakeYouTube:
+    def __init__(self) -> None:
+        self.channels: Dict[str, Dict[str, Any]] = {}
+        self.handles: Dict[str, str] = {}  # lower-case handle without "@" -> channel ID
+        self.videos: Dict[str, Dict[str, Any]] = {}
+        self.playlists: Dict[str, List[str]] = {}  # uploads playlist -> video IDs, newest first
+        self.requests: List[Tuple[str, Dict[str, str], Dict[str, str]]] = []
+        self.responses: List[Tuple[str, int]] = []
+        self.https: List["FakeHttp"] = []  # one per pooled client built
+        self._failures: Dict[str, List[int]] = {}
+
+    # ---------------- FIXTURE DATA ----------------
+
+    def add_channel(
+        self,
+        n: int,
+        handle: Optional[str] = None,
+        title: str = "",
+        subscribers: int = 10_000,
+        uploads: int = 0,
+        every_days: float = 3.0,
+    ) -> str:
+        cid = channel_id(n)
+        playlist = "UU" + cid[2:]
+        self.channels[cid] = {
+            "id": cid,
+            "snippet": {"title": title or f"Channel {n}", "country": "US"},
+            "statistics": {"subscriberCount": str(subscribers), "viewCount": "1", "videoCount": str(uploads)},
+            "contentDetails": {"relatedPlaylists": {"uploads": playlist}},
+        }
+        if handle:
+            self.handles[handle.lstrip("@").lower()] = cid
+        self.playlists[playlist] = []
+        for i in range(uploads):
+            self.add_video(cid, f"{n:03d}v{i:07d}", NOW - timedelta(days=i * every_days + 1), append=True)
+        return cid
+
+    def add_video(
+        self, cid: str, video_id: str, published: datetime, views: int = 1000, append: bool = False
+    ) -> None:
+        published_at = published.strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.videos[video_id] = {
+            "id": video_id,
+            "snippet": {"channelId": cid, "title": f"Video {video_id}", "publishedAt": published_at},
+            "statistics": {"viewCount": str(views), "likeCount": "50", "commentCount": "5"},
+            "contentDetails": {"duration": "PT5M"},
+        }
+        playlist = self.playlists["UU" + cid[2:]]
+        if append:
+            playlist.append(video_id)
+        else:
+            playlist.insert(0, video_id)
+
+    def set_views(self, video_id: str, views: int) -> None:
+        self.videos[video_id]["statistics"]["viewCount"] = str(views)
+
+    def fail(self, endpoint: str, status: int = 500, times: int = 1) -> None:
+        self._failures.setdefault(endpoint, []).extend([status] * times)
+
+    def calls(self, endpoint: str) -> List[Dict[str, str]]:
+        return [params for name, params, _ in self.requests if name == endpoint]
+
+    # ---------------- REQUEST HANDLING ----------------
+
+    def handle(self, url: str, headers: Dict[str, str]) -> Tuple[int, Optional[Dict[str, Any]]]:
+        parts = urlsplit(url)
+        endpoint = parts.path.rstrip("/").rsplit("/", 1)[-1]
+        params = dict(parse_qsl(parts.query))
+        headers = {k.lower(): v for k, v in headers.items()}
+        self.requests.append((endpoint, params, headers))
+
+        failures = self._failures.get(endpoint)
+        if failures:
+            status = failures.pop(0)
+            self.responses.append((endpoint, status))
+            return status, {"error": {"code": status, "message": "injected failure"}}
+
+        body = getattr(self, f"_{endpoint}")(params)
+        etag = hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()
+        if headers.get("if-none-match") == etag:
+            self.responses.append((endpoint, 304))
+            return 304, None
+        self.responses.append((endpoint, 200))
+        return 200, {"etag": etag, **body}
+
+    def _channels(self, params: Dict[str, str]) -> Dict[str, Any]:
+        if "forHandle" in params:
+            cid = self.handles.get(params["forHandle"].lstrip("@").lower())
+            ids = [cid] if cid else []
+        else:
+            ids = params.get("id", "").split(",")
+        return {"items": [self.channels[c] for c in ids if c in self.channels]}
+
+    def _videos(self, params: Dict[str, str]) -> Dict[str, Any]:
+        ids = params.get("id", "").split(",")
+        return {"items": [self.videos[v] for v in ids if v in self.videos]}
+
+    def _playlistItems(self, params: Dict[str, str]) -> Dict[str, Any]:
+        video_ids = self.playlists.get(params["playlistId"], [])
+        start = int(params.get("pageToken") or 0)
+        size = int(params.get("maxResults", 5))
+        items = [
+            {
+                "contentDetails": {
+                    "videoId": v,
+                    "videoPublishedAt": self.videos[v]["snippet"]["publishedAt"],
+                }
+            }
+            for v in video_ids[start:start + size]
+        ]
+        body: Dict[str, Any] = {"items": items}
+        if start + size < len(video_ids):
+            body["nextPageToken"] = str(start + size)
+        return body
+
+    def _search(self, params: Dict[str, str]) -> Dict[str, Any]:
+        q = params.get("q", "").lower()
+        items = [
+            {"snippet": {"channelId": c["id"]}}
+            for c in self.channels.values()
+            if q and q in c["snippet"]["title"].lower()
+        ]
+        return {"items": items[:1]}
+
+    # ---------------- TRANSPORTS ----------------
+
+    def http(self) -> "FakeHttp":
+        http = FakeHttp(self)
+        self.https.append(http)
+        return http
+
+    def transport(self) -> httpx.MockTransport:
+        def _handler(request: httpx.Request) -> httpx.Response:
+            status, body = self.handle(str(request.url), dict(request.headers))
+            if body is None:
+                return httpx.Response(status)
+            return httpx.Response(status, json=body)
+
+        return httpx.MockTransport(_handler)
+
+
+class FakeHttp:
+    """
+    The part of httplib2.Http googleapiclient uses. Set `broken` to an
+    exception to make every request fail at the transport level.
+    """
+
+    def __init__(self, api: FakeYouTube) -> None:
+        self.api = api
+        self.broken: Optional[BaseException] = None
+        self.closed = False
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        if self.broken is not None:
+            raise self.broken
+        status, payload = self.api.handle(uri, headers or {})
+        content = b"" if payload is None else json.dumps(payload).encode()
+        return httplib2.Response({"status": str(status), "content-type": "application/json"}), content
+
+    def close(self) -> None:
+        self.closed = True
@@ -0,0 +1,139 @@
+import random
+import threading
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.youtube import archive
+
+INT64_MAX = 2 ** 63 - 1
+
+
+def round_trip(values):
+    buf = bytearray()
+    archive._encode_column(values, buf)
+    return archive._decode_column(bytes(buf), 0, len(values))
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [],
+        [0],
+        [1, -1, 63, -64, 64, -65, 127, 128, -129],
+        [2 ** 31, -(2 ** 31), 2 ** 32, 0],
+        [INT64_MAX // 2, -(INT64_MAX // 2), 0],  # deltas close to the int64 edge
+        list(range(1_700_000_000, 1_700_100_000, 97)),  # timestamps: small positive deltas
+        list(range(10 ** 9, 10 ** 9 - 5000, -3)),  # decreasing counters: negative deltas
+    ],
+)
+def test_varint_round_trip(values):
+    assert round_trip(values) == values
+
+
+def test_varint_round_trip_random():
+    rng = random.Random(0)
+    for _ in range(200):
+        values = [rng.randint(-(2 ** 40), 2 ** 40) for _ in range(rng.randint(1, 200))]
+        assert round_trip(values) == values
+
+
+def test_small_deltas_take_one_byte():
+    buf = bytearray()
+    archive._encode_column([10, 11, 9, 40, 8], buf)  # deltas 10, 1, -2, 31, -32
+    assert len(buf) == 5
+
+
+def test_decode_from_offset():
+    buf = bytearray(b"\xff\xff")
+    archive._encode_column([5, -7, 300], buf)
+    assert archive._decode_column(bytes(buf), 2, 3) == [5, -7, 300]
+
+
+def test_partition_round_trip():
+    rng = random.Random(1)
+    rows = []
+    for key in sorted(rng.sample(range(1, 10 ** 6), 50)):
+        ts, views = 1_700_000_000, rng.randint(0, 10 ** 12)
+        for _ in range(rng.randint(1, 10)):
+            ts += rng.randint(1, 3000)
+            views += rng.randint(-5, 10 ** 6)
+            rows.append((key, ts, rng.randint(0, 10 ** 9), views, rng.randint(-10, 10 ** 10)))
+
+    path = archive.write_partition("channel", date(2023, 11, 14), rows)
+    part = archive.ArchivePartition(path)
+    assert list(part.scan()) == rows
+    for key in {r[0] for r in rows}:
+        assert part.segment(key) == [r[1:] for r in rows if r[0] == key]
+    assert part.segment(7) == []
+    part.close()
+
+
+def day_ts(day):
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+
+
+def write_days(first, n):
+    days = [first + timedelta(days=i) for i in range(n)]
+    for day in days:
+        archive.write_partition("video", day, [(1, day_ts(day) + 60, 2, 100, 10, 1)])
+    return days
+
+
+def test_open_partitions_are_bounded(monkeypatch):
+    monkeypatch.setattr(archive, "MAX_OPEN", 2)
+    days = write_days(date(2022, 1, 1), 4)
+    maps = []
+    for day in days:
+        with archive._checkout("video", day) as part:
+            maps.append(part)
+    assert len(archive._open) <= 2
+    assert maps[0]._buf.closed and maps[1]._buf.closed
+    assert not maps[2]._buf.closed and not maps[3]._buf.closed
+
+    rows = archive.read_archived("video", 1, day_ts(days[0]), day_ts(days[-1]) + 86399)
+    assert [row[0] for row in rows] == [day_ts(day) + 60 for day in days]
+    assert len(archive._open) <= 2
+
+
+def test_evicted_partition_stays_mapped_while_held(monkeypatch):
+    monkeypatch.setattr(archive, "MAX_OPEN", 1)
+    first, second = write_days(date(2022, 2, 1), 2)
+    with archive._checkout("video", first) as held:
+        with archive._checkout("video", second):
+            pass
+        assert held not in archive._open.values()
+        assert held.segment(1)  # still readable
+    assert held._buf.closed
+
+
+def test_rewrite_waits_for_readers_and_unmaps():
+    (day,) = write_days(date(2022, 3, 1), 1)
+    ts = day_ts(day)
+    reader_in, release = threading.Event(), threading.Event()
+    merged = []
+
+    def reader():
+        with archive._checkout("video", day):
+            reader_in.set()
+            release.wait(5)
+
+    def rewriter():
+        with archive._rewrite("video", day) as rows:
+            merged.extend(rows)
+            archive.write_partition("video", day, sorted(set(rows) | {(1, ts + 120, 2, 200, 20, 2)}))
+
+    t_reader = threading.Thread(target=reader)
+    t_reader.start()
+    reader_in.wait(5)
+    t_rewriter = threading.Thread(target=rewriter)
+    t_rewriter.start()
+    t_rewriter.join(0.2)
+    assert t_rewriter.is_alive()  # blocked on the reader
+    release.set()
+    t_reader.join(5)
+    t_rewriter.join(5)
+    assert not t_rewriter.is_alive()
+
+    assert merged == [(1, ts + 60, 2, 100, 10, 1)]
+    assert [row[0] for row in archive.read_archived("video", 1, ts, ts + 86399)] == [ts + 60, ts + 120]
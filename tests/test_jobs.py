@@ -0,0 +1,148 @@
+import pytest
+
+from src.services.jobs import JobError, JobRunner, get_job_store, submit_job
+from src.youtube import client
+from src.youtube.quota import get_quota_ledger
+
+
+def run_next(runner):
+    job = runner.store.claim_next(runner.owner)
+    runner._run(job)
+    return runner.store.get(job["id"])
+
+
+def looked_up_ids(youtube):
+    return [cid for params in youtube.calls("channels") for cid in params["id"].split(",")]
+
+
+# ---------------- STORE ----------------
+
+def test_submit_validates_params(youtube):
+    with pytest.raises(JobError, match="Unknown job kind"):
+        submit_job("nope", {})
+    with pytest.raises(JobError, match="non-empty 'inputs'"):
+        submit_job("batch", {"inputs": []})
+
+    job = submit_job("batch", {"inputs": ["a", "b"], "video_count": 3})
+    assert job["status"] == "queued"
+    assert job["progress"] == {"done": 0, "total": 2}
+
+
+def test_expired_leases_are_requeued(youtube):
+    store = get_job_store()
+    job = store.create("refresh", {}, 1)
+
+    store.claim_next("dead-runner", lease_seconds=-1)
+    assert store.get(job["id"])["status"] == "running"
+    assert store.requeue_expired() == 1
+    assert store.get(job["id"])["status"] == "queued"
+
+    # A live runner keeps its job by renewing the lease
+    store.claim_next("live-runner", lease_seconds=-1)
+    store.renew_leases("live-runner")
+    assert store.requeue_expired() == 0
+
+
+def test_finish_from_a_stale_owner_is_ignored(youtube):
+    store = get_job_store()
+    job = store.create("refresh", {}, 1)
+    store.claim_next("old-runner", lease_seconds=-1)
+    store.requeue_expired()
+    store.claim_next("new-runner")
+
+    store.finish(job["id"], "failed", error="late", owner="old-runner")
+    assert store.get(job["id"])["status"] == "running"
+    store.finish(job["id"], "succeeded", result={"ok": 1}, owner="new-runner")
+    assert store.get(job["id"])["result"] == {"ok": 1}
+
+
+def test_cancel(youtube):
+    store = get_job_store()
+    queued = store.create("refresh", {}, 1)
+    assert store.request_cancel(queued["id"])["status"] == "cancelled"
+    assert store.claim_next("runner") is None
+
+    running = store.create("batch", {"inputs": ["@a"], "video_count": 3}, 1)
+    runner = JobRunner(store)
+    job = store.claim_next(runner.owner)
+    store.request_cancel(running["id"])
+    runner._run(job)
+    assert store.get(running["id"])["status"] == "cancelled"
+    assert youtube.requests == []
+
+
+# ---------------- BATCH JOBS ----------------
+
+def test_batch_job_looks_up_inputs_chunk_by_chunk(youtube):
+    ids = [youtube.add_channel(n, uploads=2) for n in range(60)]
+    runner = JobRunner(get_job_store())
+    job = submit_job("batch", {"inputs": ids, "video_count": 2})
+
+    done = run_next(runner)
+    assert done["status"] == "succeeded"
+    assert done["result"] == {"total": 60, "ok": 60, "failed": 0}
+    assert done["progress"] == {"done": 60, "total": 60}
+    assert [len(params["id"].split(",")) for params in youtube.calls("channels")] == [50, 10]
+
+    items = runner.store.items(job["id"])
+    assert items[7]["result"]["channel"]["channel_id"] == ids[7]
+
+
+def test_interrupted_batch_job_resumes_where_it_stopped(youtube):
+    ids = [youtube.add_channel(n, uploads=2) for n in range(8)]
+    store = get_job_store()
+    job = submit_job("batch", {"inputs": ids, "video_count": 2})
+
+    # A runner finished five items and died
+    store.claim_next("dead-runner", lease_seconds=-1)
+    for i in range(5):
+        store.put_item(job["id"], i, {"input": ids[i], "ok": True, "result": None, "error": None})
+    store.requeue_expired()
+
+    done = run_next(JobRunner(store))
+    assert done["status"] == "succeeded"
+    assert done["result"] == {"total": 8, "ok": 8, "failed": 0}
+    assert looked_up_ids(youtube) == ids[5:]
+    assert sorted(store.items(job["id"])) == list(range(8))
+
+
+def test_batch_job_item_errors_do_not_fail_the_job(youtube):
+    cid = youtube.add_channel(1, title="Some Name", uploads=2)
+    other = youtube.add_channel(2, uploads=2)
+    get_quota_ledger().daily_budget = 50  # batch tenant: 40 units, a search costs 100
+
+    job = submit_job(
+        "batch",
+        {"inputs": [cid, "https://www.youtube.com/c/SomeName", "@nobody", other], "video_count": 2},
+    )
+    youtube.fail("playlistItems", 500)  # the first analysis fetches uploads for `cid`
+
+    done = run_next(JobRunner(get_job_store()))
+    assert done["status"] == "succeeded"
+    items = get_job_store().items(job["id"])
+    assert items[0]["ok"] is False and items[0]["error"]
+    assert "quota" in items[1]["error"]
+    assert items[2]["error"] == client._UNRESOLVED
+    assert items[3]["ok"] is True
+    assert done["result"] == {"total": 4, "ok": 1, "failed": 3}
+    assert youtube.calls("search") == []
+
+
+# ---------------- HISTORY JOBS ----------------
+
+def test_interrupted_history_job_resumes_from_its_page_token(youtube):
+    cid = youtube.add_channel(1, uploads=120, every_days=1)
+    store = get_job_store()
+    job = submit_job("history", {"youtube_input": cid, "days": 365, "max_videos": 500})
+
+    first = next(client.iter_upload_pages("UU" + cid[2:]))
+    store.claim_next("dead-runner", lease_seconds=-1)
+    store.put_item(job["id"], 0, {"videos": first.videos, "next_page_token": first.next_page_token})
+    store.requeue_expired()
+    youtube.requests.clear()
+
+    done = run_next(JobRunner(store))
+    assert done["status"] == "succeeded"
+    assert done["progress"] == {"done": 120, "total": 120}
+    assert [params.get("pageToken") for params in youtube.calls("playlistItems")] == ["50", "100"]
+    assert sorted(store.items(job["id"])) == [0, 1, 2]
@@ -0,0 +1,83 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from reference_metrics import InfluencerMetrics as ReferenceMetrics
+from src.metrics.cohort import cohort_reports
+from src.metrics.metrics import InfluencerMetrics
+from src.models.video import VideoBatch
+
+NOW = datetime(2026, 6, 1, 12, tzinfo=timezone.utc)
+DURATIONS = ["PT5M30S", "PT12M10S", "PT7M", "PT6M59S", "PT1H2M", "P0D", "PT59S", "", "bogus", None]
+
+
+def random_videos(rng: random.Random, n: int, messy: bool = False):
+    videos = []
+    for _ in range(n):
+        published = NOW - timedelta(days=rng.uniform(0, 30), seconds=rng.randint(0, 1000))
+        published_at = published.strftime("%Y-%m-%dT%H:%M:%SZ")
+        if messy:
+            published_at = rng.choice([published_at, published.isoformat(), "", "garbage"])
+        videos.append({
+            "views": rng.choice([0, rng.randint(0, 10 ** rng.randint(1, 9)), str(rng.randint(0, 1000))]),
+            "likes": rng.randint(0, 5000),
+            "comments": rng.choice([rng.randint(0, 300), None, "x"]) if messy else rng.randint(0, 300),
+            "publishedAt": published_at,
+            "duration": rng.choice(DURATIONS),
+        })
+    return videos
+
+
+def as_json(report):
+    # Same numbers and the same types (int vs float) as the reference
+    return json.dumps(report, sort_keys=True)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_report_matches_reference(seed):
+    rng = random.Random(seed)
+    for trial in range(200):
+        videos = random_videos(rng, rng.choice([1, 2, 3, 8, 25, 200]), messy=trial % 3 == 0)
+        subs = rng.choice([0, 1000, rng.randint(1, 10 ** 7)])
+        expected = ReferenceMetrics("c", subs, videos, as_of=NOW).get_performance_report()
+        actual = InfluencerMetrics("c", subs, videos, as_of=NOW).get_performance_report()
+        assert as_json(actual) == as_json(expected)
+
+
+def test_report_from_video_batch_matches_reference():
+    videos = random_videos(random.Random(7), 300)
+    expected = ReferenceMetrics("c", 5000, videos, as_of=NOW).get_performance_report()
+    actual = InfluencerMetrics("c", 5000, VideoBatch.from_records(videos), as_of=NOW).get_performance_report()
+    assert as_json(actual) == as_json(expected)
+
+
+def test_empty_report():
+    assert InfluencerMetrics("c", 10, []).get_performance_report() == {}
+
+
+def test_report_cache_follows_reassignment_and_is_copied():
+    rng = random.Random(3)
+    metrics = InfluencerMetrics("c", 1000, random_videos(rng, 20), as_of=NOW)
+    report = metrics.get_performance_report()
+    report["short_long_split"]["short_count"] = -1
+    report["benchmarks"]["cpm"] = 0
+    again = metrics.get_performance_report()
+    assert again["short_long_split"]["short_count"] != -1
+    assert again["benchmarks"]["cpm"] == 40.0
+
+    videos = random_videos(rng, 20)
+    metrics.video_data = videos
+    expected = ReferenceMetrics("c", 1000, videos, as_of=NOW).get_performance_report()
+    assert as_json(metrics.get_performance_report()) == as_json(expected)
+
+
+def test_cohort_matches_per_channel_reports():
+    rng = random.Random(11)
+    channels = [
+        InfluencerMetrics(f"c{i}", rng.randint(0, 10 ** 6), random_videos(rng, rng.choice([0, 1, 5, 40])), as_of=NOW)
+        for i in range(50)
+    ]
+    expected = [as_json(c.get_performance_report()) for c in channels]
+    assert [as_json(r) for r in cohort_reports(channels, now=NOW)] == expected
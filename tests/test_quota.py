@@ -0,0 +1,87 @@
+import pytest
+
+from src.youtube import client
+from src.youtube.cache import get_response_cache
+from src.youtube.quota import (
+    INTERACTIVE,
+    QuotaExceededError,
+    QuotaLedger,
+    endpoint_from_uri,
+    get_quota_ledger,
+    tenant_scope,
+)
+
+
+def test_endpoint_and_costs(youtube):
+    assert endpoint_from_uri("https://www.googleapis.com/youtube/v3/channels?id=x&key=k") == "channels"
+    ledger = QuotaLedger(daily_budget=1000, reserve=0.0)
+    ledger.admit("search")
+    ledger.admit("videos")
+    usage = ledger.usage()
+    assert usage["used_units"] == 101
+    assert usage["remaining_units"] == 899
+    assert {(r["endpoint"], r["units"]) for r in usage["breakdown"]} == {("search", 100), ("videos", 1)}
+
+
+def test_interactive_reserve(youtube):
+    ledger = QuotaLedger(daily_budget=10, reserve=0.2)
+
+    with tenant_scope("batch"):
+        for _ in range(8):
+            assert ledger.admit("videos") == 0.0
+        with pytest.raises(QuotaExceededError, match="tenant 'batch'"):
+            ledger.admit("videos")
+
+    # The last 20% is kept for interactive requests
+    ledger.admit("videos")
+    ledger.admit("videos", tenant=INTERACTIVE)
+    with pytest.raises(QuotaExceededError):
+        ledger.admit("videos")
+
+    tenants = {r["tenant"]: r["units"] for r in ledger.usage()["breakdown"]}
+    assert tenants == {"batch": 8, "interactive": 2}
+
+
+def test_usage_survives_a_restart(youtube):
+    first = QuotaLedger(daily_budget=10, reserve=0.0)
+    for _ in range(6):
+        first.admit("videos")
+
+    second = QuotaLedger(daily_budget=10, reserve=0.0)
+    for _ in range(4):
+        second.admit("videos")
+    with pytest.raises(QuotaExceededError):
+        second.admit("videos")
+
+
+def test_background_tenants_are_rate_limited(youtube):
+    # 86400 units / day for background tenants = 1 unit per second after the burst
+    ledger = QuotaLedger(daily_budget=86400, reserve=0.0)
+    with tenant_scope("refresh"):
+        with pytest.raises(QuotaExceededError, match="rate limit"):
+            for burst in range(1000):
+                ledger.admit("videos", max_wait=0)
+        assert burst >= 400
+        # A caller willing to wait gets a delay instead of an error
+        assert 0 < ledger.admit("videos", max_wait=60) <= 3
+    # Interactive calls never wait on the bucket
+    assert ledger.admit("videos") == 0.0
+
+
+def test_exhausted_quota_serves_cached_responses(youtube):
+    cid = youtube.add_channel(1, subscribers=500)
+    assert client.get_channel_stats(cid)["subscribers"] == 500
+
+    ledger = get_quota_ledger()
+    ledger.daily_budget = ledger.usage()["used_units"]
+    get_response_cache().ttl_seconds = 0
+    calls = len(youtube.requests)
+
+    # Stale but cached: served without a request
+    assert client.get_channel_stats(cid)["subscribers"] == 500
+    assert len(youtube.requests) == calls
+
+    # Nothing cached: the quota error reaches the caller
+    with pytest.raises(QuotaExceededError):
+        client.get_channel_stats(youtube.add_channel(2))
+    assert len(youtube.requests) == calls
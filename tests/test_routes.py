@@ -0,0 +1,111 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from conftest import API_KEY
+from src.services.jobs import get_job_runner
+from src.youtube.quota import get_quota_ledger
+
+
+@pytest.fixture
+def api(youtube):
+    from app.main import app
+
+    # Not used as a context manager: the lifespan (and its job runner
+    # threads) stays off, and tests run jobs one at a time
+    return TestClient(app)
+
+
+def test_analysis(youtube, api):
+    cid = youtube.add_channel(1, handle="@alpha", subscribers=50_000, uploads=10)
+
+    res = api.post("/api/analysis", json={"youtube_url": "@alpha", "video_count": 5})
+    assert res.status_code == 200
+    body = res.json()
+    assert body["channel"]["channel_id"] == cid
+    assert len(body["videos"]) == 5
+    assert body["metrics_report"]["dashboard_score"] >= 0
+
+    assert api.post("/api/analysis", json={"youtube_url": "x", "video_count": 5}).status_code == 422
+
+
+def test_analysis_errors(youtube, api):
+    res = api.post("/api/analysis", json={"youtube_url": "@nobody"})
+    assert res.status_code == 400
+
+    cid = youtube.add_channel(1, uploads=3)
+    youtube.fail("videos", 500)
+    res = api.post("/api/analysis", json={"youtube_url": cid})
+    assert res.status_code == 502
+    assert API_KEY not in res.text
+
+    ledger = get_quota_ledger()
+    ledger.daily_budget = ledger.usage()["used_units"]
+    res = api.post("/api/analysis", json={"youtube_url": youtube.add_channel(2)})
+    assert res.status_code == 429
+    assert "quota" in res.json()["detail"].lower()
+
+
+def test_batch_analysis_streams_ndjson(youtube, api):
+    ids = [youtube.add_channel(n, uploads=3) for n in range(3)]
+
+    res = api.post("/api/analysis/batch", json={"inputs": ids + [ids[0], "@nobody"], "video_count": 3})
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in res.text.splitlines()]
+
+    assert lines[-1]["type"] == "summary"
+    results = [line for line in lines if line["type"] == "result"]
+    assert len(results) == 4  # duplicates are analysed once
+    assert sum(1 for line in results if line["ok"]) == 3
+    id_lookups = [params["id"] for params in youtube.calls("channels") if "id" in params]
+    assert [len(joined.split(",")) for joined in id_lookups] == [3]
+
+
+def test_reports(youtube, api):
+    cid = youtube.add_channel(1, uploads=5)
+
+    saved = api.post("/api/reports", json={"youtube_url": cid, "video_count": 5})
+    assert saved.status_code == 201
+    report_id = saved.json()["id"]
+
+    listed = api.get("/api/reports", params={"channel_id": cid}).json()
+    assert [r["id"] for r in listed["items"]] == [report_id]
+    assert api.get("/api/reports", params={"sort": "nope"}).status_code == 422
+
+    assert api.get(f"/api/reports/{report_id}").json()["result"]["channel"]["channel_id"] == cid
+    assert api.delete(f"/api/reports/{report_id}").status_code == 204
+    assert api.get(f"/api/reports/{report_id}").status_code == 404
+    assert api.delete(f"/api/reports/{report_id}").status_code == 404
+
+
+def test_jobs(youtube, api):
+    ids = [youtube.add_channel(n, uploads=3) for n in range(3)]
+
+    res = api.post("/api/jobs", json={"kind": "batch", "inputs": ids + ["@nobody"], "video_count": 3})
+    assert res.status_code == 202
+    job_id = res.json()["id"]
+    assert api.post("/api/jobs", json={"kind": "batch"}).status_code == 400
+    assert api.post("/api/jobs", json={"kind": "nope"}).status_code == 422
+
+    runner = get_job_runner()
+    runner._run(runner.store.claim_next(runner.owner))
+
+    job = api.get(f"/api/jobs/{job_id}", params={"include_items": True, "offset": 2, "limit": 5}).json()
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"total": 4, "ok": 3, "failed": 1}
+    assert [item["index"] for item in job["items"]] == [2, 3]
+    assert job["items"][1]["ok"] is False
+
+    assert api.get("/api/jobs/missing").status_code == 404
+    assert api.post("/api/jobs/missing/cancel").status_code == 404
+
+
+def test_quota(youtube, api):
+    cid = youtube.add_channel(1, uploads=3)
+    api.post("/api/analysis", json={"youtube_url": cid, "video_count": 3})
+
+    usage = api.get("/api/quota").json()
+    assert usage["used_units"] == len(youtube.requests)
+    assert {r["tenant"] for r in usage["breakdown"]} == {"interactive"}
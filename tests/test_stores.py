@@ -0,0 +1,152 @@
+import copy
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from fake_youtube import NOW
+from src.services.report_store import get_report_store
+from src.services.youtube_analysis import run_analysis_as_of, run_youtube_analysis
+from src.youtube import client
+from src.youtube.cache import get_response_cache
+from src.youtube.resolution import get_resolution_index
+from src.youtube.snapshots import get_snapshot_store
+
+DAY = 86400
+
+
+# ---------------- RESOLUTION INDEX ----------------
+
+def test_resolution_index(youtube, monkeypatch):
+    from src.youtube import resolution
+
+    index = get_resolution_index()
+    index.put("@Alpha", "handle", "UC1")
+    index.put("@nobody", "handle", None)
+    index.put("UCabc", "channel_id", "UCabc")
+
+    assert index.get("@ALPHA", "handle").channel_id == "UC1"
+    assert index.get("@nobody", "handle").channel_id is None  # negative hit
+    assert index.get("@unknown", "handle") is None
+    assert index.get("ucabc", "channel_id") is None  # IDs are case-sensitive
+
+    index.forget("@alpha", "handle")
+    assert index.get("@Alpha", "handle") is None
+
+    # Negative hits expire much sooner than positive ones
+    monkeypatch.setattr(resolution, "_NEGATIVE_TTL_SECONDS", -1)
+    assert index.get("@nobody", "handle") is None
+    assert index.get("UCabc", "channel_id") is not None
+
+
+def test_expired_negative_hit_is_looked_up_again(youtube, monkeypatch):
+    from src.youtube import resolution
+
+    assert client.get_channel_stats("@later") is None
+    cid = youtube.add_channel(1, handle="@later")
+
+    assert client.get_channel_stats("@later") is None  # still a negative hit
+    monkeypatch.setattr(resolution, "_NEGATIVE_TTL_SECONDS", -1)
+    get_response_cache().ttl_seconds = 0
+    assert client.get_channel_stats("@later")["channel_id"] == cid
+
+
+# ---------------- SNAPSHOTS ----------------
+
+def record_channel(youtube, cid, subscribers, ts):
+    item = copy.deepcopy(youtube.channels[cid])
+    item["statistics"]["subscriberCount"] = str(subscribers)
+    get_snapshot_store().record("channels", [item], ts=ts)
+
+
+def record_videos(youtube, video_ids, views, ts):
+    items = []
+    for video_id in video_ids:
+        item = copy.deepcopy(youtube.videos[video_id])
+        item["statistics"]["viewCount"] = str(views)
+        items.append(item)
+    get_snapshot_store().record("videos", items, ts=ts)
+
+
+def test_api_responses_are_recorded(youtube):
+    cid = youtube.add_channel(1, subscribers=100, uploads=3)
+    client.get_recent_videos("UU" + cid[2:], count=3)
+    client.get_channel_stats(cid)
+
+    store = get_snapshot_store()
+    assert [s["subscribers"] for s in store.channel_history(cid)] == [100]
+    video_id = youtube.playlists["UU" + cid[2:]][0]
+    assert [s["views"] for s in store.video_history(video_id)] == [1000]
+    assert store.channel_for_video(video_id) == cid
+
+
+def test_channel_and_videos_as_of(youtube):
+    cid = youtube.add_channel(1, uploads=4, every_days=10)
+    uploads = youtube.playlists["UU" + cid[2:]]  # published 1, 11, 21, 31 days ago
+    now = NOW.timestamp()
+    record_channel(youtube, cid, 100, now - 30 * DAY)
+    record_channel(youtube, cid, 200, now - 5 * DAY)
+    record_videos(youtube, uploads, 10, now - 25 * DAY)
+    record_videos(youtube, uploads, 50, now - 2 * DAY)
+
+    store = get_snapshot_store()
+    assert store.channel_as_of(cid, now - 40 * DAY) is None
+    assert store.channel_as_of(cid, now - 10 * DAY)["subscribers"] == 100
+    assert store.channel_as_of(cid, now)["subscribers"] == 200
+
+    # Only uploads published by then, each with its snapshot at that time
+    then = store.videos_as_of(cid, now - 15 * DAY, count=10)
+    assert [v.video_id for v in then] == uploads[2:]
+    assert {v.views for v in then} == {10}
+    assert [v.views for v in store.videos_as_of(cid, now, count=2)] == [50, 50]
+
+    history = store.channel_history(cid, since=now - 10 * DAY)
+    assert [s["subscribers"] for s in history] == [200]
+
+
+def test_analysis_as_of_makes_no_requests(youtube):
+    cid = youtube.add_channel(1, uploads=4, every_days=10)
+    uploads = youtube.playlists["UU" + cid[2:]]
+    now = NOW.timestamp()
+    record_channel(youtube, cid, 100, now - 30 * DAY)
+    record_videos(youtube, uploads, 10, now - 25 * DAY)
+
+    as_of = datetime.fromtimestamp(now - 15 * DAY, tz=timezone.utc)
+    result = run_analysis_as_of(cid, as_of, video_count=8)
+    assert result["channel"]["subscribers"] == 100
+    assert len(result["videos"]) == 2
+    assert youtube.requests == []
+
+    with pytest.raises(ValueError, match="No stored snapshots"):
+        run_analysis_as_of(cid, as_of - timedelta(days=30))
+
+
+# ---------------- REPORTS ----------------
+
+def test_report_store(youtube):
+    big = youtube.add_channel(1, subscribers=2_000_000, uploads=5)
+    small = youtube.add_channel(2, subscribers=5_000, uploads=5)
+    store = get_report_store()
+
+    first = store.save(run_youtube_analysis(big))
+    second = store.save(run_youtube_analysis(big))
+    other = store.save(run_youtube_analysis(small))
+    assert first["channel_id"] == big
+    assert first["subscribers"] == 2_000_000
+
+    assert store.list()["total"] == 3
+    assert [r["id"] for r in store.list()["items"]] == [other["id"], second["id"], first["id"]]
+    assert [r["id"] for r in store.list(channel_id=big)["items"]] == [second["id"], first["id"]]
+    assert {r["id"] for r in store.list(latest_per_channel=True)["items"]} == {second["id"], other["id"]}
+    assert store.list(tier=other["tier"])["items"][0]["channel_id"] == small
+
+    page = store.list(sort="subscribers", descending=False, limit=1, offset=1)
+    assert page["total"] == 3
+    assert page["items"][0]["channel_id"] == big
+    with pytest.raises(ValueError, match="Unknown sort"):
+        store.list(sort="nope")
+
+    stored = store.get(first["id"])
+    assert stored["result"]["channel"]["channel_id"] == big
+    assert store.delete(first["id"]) is True
+    assert store.delete(first["id"]) is False
+    assert store.get(first["id"]) is None
@@ -0,0 +1,144 @@
+import json
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from src.metrics.metrics import InfluencerMetrics
+from src.metrics.streaming import MetricsAccumulator, QuantileSketch, reduce_shards
+from src.models.video import VideoBatch
+
+NOW = datetime(2026, 6, 1, 12, tzinfo=timezone.utc)
+
+
+def rank_error(sketch: QuantileSketch, values, q: float) -> float:
+    return value_rank_error(values, sketch.quantile(q), q)
+
+
+def value_rank_error(values, estimate: int, q: float) -> float:
+    # Distance from q to the rank range [lo, hi] that `estimate` occupies
+    ordered = np.sort(np.asarray(values))
+    lo = np.searchsorted(ordered, estimate, side="left") / len(ordered)
+    hi = np.searchsorted(ordered, estimate, side="right") / len(ordered)
+    return 0.0 if lo <= q <= hi else min(abs(q - lo), abs(q - hi))
+
+
+def test_sketch_is_exact_below_k():
+    values = list(range(150, 0, -1))
+    sketch = QuantileSketch(k=200)
+    sketch.extend(values)
+    assert sketch.exact
+    assert sketch.median_parts() == (75, 76)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_sketch_rank_error(seed):
+    rng = random.Random(seed)
+    values = [rng.randint(0, 10 ** 7) for _ in range(100_000)]
+    sketch = QuantileSketch(k=200, seed=seed)
+    for v in values:
+        sketch.update(v)
+    assert not sketch.exact
+    assert sketch.n == len(values)
+    # ~1.7 / k expected; allow headroom for the randomized compactions
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        assert rank_error(sketch, values, q) < 0.02
+
+
+def test_sketch_memory_is_sublinear():
+    sketch = QuantileSketch(k=200)
+    sketch.extend(range(200_000))
+    assert sum(len(level) for level in sketch._levels) < 2_000
+
+
+def test_sketch_merge_rank_error():
+    rng = random.Random(5)
+    shards = [[rng.randint(0, 10 ** 6) for _ in range(20_000)] for _ in range(8)]
+    merged = QuantileSketch(k=200)
+    for i, shard in enumerate(shards):
+        part = QuantileSketch(k=200, seed=i)
+        part.extend(shard)
+        merged.merge(part)
+    everything = [v for shard in shards for v in shard]
+    assert merged.n == len(everything)
+    for q in (0.1, 0.5, 0.9):
+        assert rank_error(merged, everything, q) < 0.02
+
+
+def random_videos(rng: random.Random, n: int):
+    durations = ["PT5M30S", "PT12M10S", "PT59S", "P0D", "", None]
+    return [
+        {
+            "views": rng.choice([0, rng.randint(0, 10 ** rng.randint(1, 9))]),
+            "likes": rng.randint(0, 5000),
+            "comments": rng.randint(0, 300),
+            "publishedAt": (NOW - timedelta(days=rng.uniform(0, 30))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "duration": rng.choice(durations),
+        }
+        for _ in range(n)
+    ]
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 10, 150])
+def test_accumulator_matches_report_while_exact(n):
+    rng = random.Random(n)
+    for _ in range(20):
+        videos = random_videos(rng, n)
+        expected = json.dumps(InfluencerMetrics("c", 12345, videos, as_of=NOW).get_performance_report())
+
+        one_by_one = MetricsAccumulator(now=NOW)
+        for v in videos:
+            one_by_one.add(v)
+        paged = MetricsAccumulator(now=NOW).add_all([videos[: n // 2], VideoBatch.from_records(videos[n // 2:])])
+        merged = MetricsAccumulator(now=NOW)
+        for i in range(3):
+            merged.merge(MetricsAccumulator(now=NOW).add_all([videos[i::3]]))
+
+        for acc in (one_by_one, paged, merged):
+            assert json.dumps(acc.report("c", 12345)) == expected
+
+
+def test_reduce_shards_matches_report_except_median():
+    rng = random.Random(9)
+    videos = random_videos(rng, 20_000)
+    shards = [[videos[i:i + 50] for i in range(s, s + 5_000, 50)] for s in range(0, 20_000, 5_000)]
+    expected = InfluencerMetrics("c", 10 ** 6, videos, as_of=NOW).get_performance_report()
+    actual = reduce_shards(shards, now=NOW).report("c", 10 ** 6)
+
+    # Everything but the sketch median (and what derives from it) is exact
+    derived = {"median_views", "loyalty_percent", "dashboard_score"}
+    for key in expected.keys() - derived:
+        assert actual[key] == pytest.approx(expected[key]), key
+    views = [int(v["views"]) for v in videos]
+    assert value_rank_error(views, actual["median_views"], 0.5) < 0.02
+
+
+def test_reduce_shards_reads_shards_concurrently():
+    rng = random.Random(10)
+    videos = random_videos(rng, 2_000)
+    barrier = threading.Barrier(4, timeout=5)
+
+    def shard(s):
+        # Every shard blocks until all four are being read at once
+        barrier.wait()
+        for i in range(s, s + 500, 50):
+            yield videos[i:i + 50]
+
+    parallel = reduce_shards([shard(s) for s in range(0, 2_000, 500)], now=NOW, max_workers=4)
+    sequential = reduce_shards(
+        [[videos[i:i + 50] for i in range(s, s + 500, 50)] for s in range(0, 2_000, 500)],
+        now=NOW,
+        max_workers=1,
+    )
+    assert json.dumps(parallel.report("c", 1)) == json.dumps(sequential.report("c", 1))
+
+
+def test_merge_rejects_different_reference_times():
+    with pytest.raises(ValueError):
+        MetricsAccumulator(now=NOW).merge(MetricsAccumulator(now=NOW + timedelta(seconds=1)))
+
+
+def test_empty_accumulator():
+    assert MetricsAccumulator(now=NOW).report("c", 5) == {}
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from fake_youtube import NOW
+from src.youtube.cache import get_response_cache
+from src.youtube.quota import QuotaExceededError, get_quota_ledger
+from src.youtube.sync import get_upload_store, refresh_due_videos, sync_recent_videos, sync_recent_videos_async
+
+
+def run_sync(mode, playlist, count):
+    if mode == "async":
+        return asyncio.run(sync_recent_videos_async(playlist, count=count))
+    return sync_recent_videos(playlist, count=count)
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_second_sync_only_fetches_new_uploads(youtube, mode):
+    cid = youtube.add_channel(1, uploads=30)
+    playlist = "UU" + cid[2:]
+
+    first = run_sync(mode, playlist, 8)
+    assert [v["video_id"] for v in first] == youtube.playlists[playlist][:8]
+    assert [p["maxResults"] for p in youtube.calls("playlistItems")] == ["8"]
+    assert len(youtube.calls("videos")[0]["id"].split(",")) == 8
+
+    youtube.add_video(cid, "001vnew0000", NOW)
+    get_response_cache().ttl_seconds = 0
+    second = run_sync(mode, playlist, 8)
+
+    assert [v["video_id"] for v in second] == youtube.playlists[playlist][:8]
+    assert second[0]["video_id"] == "001vnew0000"
+    # One listing page, and stats for the new upload only
+    assert len(youtube.calls("playlistItems")) == 2
+    assert youtube.calls("videos")[-1]["id"] == "001vnew0000"
+
+
+def test_exhausted_quota_serves_stored_uploads(youtube):
+    cid = youtube.add_channel(1, uploads=10)
+    playlist = "UU" + cid[2:]
+    stored = sync_recent_videos(playlist, count=5)
+
+    ledger = get_quota_ledger()
+    ledger.daily_budget = ledger.usage()["used_units"]
+    get_response_cache().ttl_seconds = 0
+    get_response_cache()._memory.clear()
+    get_response_cache()._conn.execute("DELETE FROM responses")
+
+    assert sync_recent_videos(playlist, count=5) == stored
+    with pytest.raises(QuotaExceededError):
+        sync_recent_videos("UU" + youtube.add_channel(2, uploads=3)[2:], count=3)
+
+
+def test_refresh_due_videos(youtube):
+    cid = youtube.add_channel(1, uploads=4)
+    playlist = "UU" + cid[2:]
+    sync_recent_videos(playlist, count=4)
+    store = get_upload_store()
+    assert refresh_due_videos() == 0  # everything was just fetched
+
+    store._conn.execute("UPDATE videos SET due_at = 0")
+    for video_id in youtube.playlists[playlist]:
+        youtube.set_views(video_id, 5000)
+    youtube.videos.pop(youtube.playlists[playlist][-1])  # deleted upstream
+    get_response_cache().ttl_seconds = 0
+
+    assert refresh_due_videos() == 3
+    assert [row["video"]["views"] for row in store.recent(playlist, 10)] == [5000] * 3
+    assert store.due(NOW.timestamp() + 60, 10) == []
+
+    tenants = {r["tenant"] for r in get_quota_ledger().usage()["breakdown"]}
+    assert "refresh" in tenants
+
+
+def test_old_uploads_are_due_later_than_new_ones(youtube):
+    cid = youtube.add_channel(1)
+    youtube.add_video(cid, "001vold0000", NOW - timedelta(days=400))
+    youtube.add_video(cid, "001vnew0000", NOW - timedelta(hours=2))
+    sync_recent_videos("UU" + cid[2:], count=2)
+
+    rows = get_upload_store()._conn.execute("SELECT video_id, due_at FROM videos").fetchall()
+    due = {r["video_id"]: r["due_at"] for r in rows}
+    assert due["001vnew0000"] < due["001vold0000"]
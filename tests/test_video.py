@@ -0,0 +1,135 @@
+import math
+import pickle
+import random
+from datetime import datetime, timedelta, timezone
+
+import isodate
+import numpy as np
+import pytest
+
+from src.models.video import VideoBatch, VideoRecord
+from src.utils.timeparse import (
+    NO_DATE,
+    duration_seconds,
+    parse_durations,
+    parse_timestamps,
+    timestamp_us,
+    to_epoch_us,
+)
+
+VIDEO = {
+    "video_id": "abc",
+    "title": "Title ✓",
+    "publishedAt": "2024-05-01T12:00:00Z",
+    "views": "1200",
+    "likes": 30,
+    "comments": None,
+    "duration": "PT4M13S",
+}
+
+
+# ---------------- timeparse ----------------
+
+@pytest.mark.parametrize(
+    "raw",
+    ["PT4M13S", "PT1H2S", "P1DT3H", "P0D", "PT59S", "PT0S", "PT10H", "P1W", "PT1.5S", "P1Y", "PT", "P", "bogus", ""],
+)
+def test_duration_matches_isodate(raw):
+    try:
+        expected = isodate.parse_duration(raw).total_seconds()
+    except (TypeError, ValueError, isodate.ISO8601Error):
+        expected = math.nan
+    actual = duration_seconds(raw)
+    assert (math.isnan(actual) and math.isnan(expected)) or actual == expected
+
+
+def test_parse_durations_bulk():
+    raw = ["PT4M13S", None, "PT4M13S", "bogus", ["unhashable"], "P1DT3H"]
+    out = parse_durations(raw)
+    assert out[0] == out[2] == 253.0
+    assert np.isnan(out[[1, 3, 4]]).all()
+    assert out[5] == 97200.0
+
+
+def test_timestamps_match_fromisoformat():
+    rng = random.Random(0)
+    base = datetime(2005, 4, 23, tzinfo=timezone.utc)
+    raw = []
+    for _ in range(500):
+        dt = base + timedelta(seconds=rng.randint(0, 700_000_000))
+        raw.append(rng.choice([
+            dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            dt.isoformat(),
+            dt.astimezone(timezone(timedelta(hours=2))).isoformat(),
+            "",
+            "garbage",
+            None,
+            "2024-13-01T00:00:00Z",
+            "0000-01-01T00:00:00Z",
+        ]))
+
+    def reference(value):
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except (AttributeError, ValueError):
+            return NO_DATE
+        return to_epoch_us(dt)
+
+    expected = [reference(r) for r in raw]
+    assert [timestamp_us(r) for r in raw] == expected
+    assert parse_timestamps(raw).tolist() == expected
+
+
+# ---------------- VideoRecord / VideoBatch ----------------
+
+def test_record_is_a_read_only_mapping():
+    record = VideoRecord.from_mapping(VIDEO)
+    assert dict(record) == {**VIDEO, "views": 1200, "comments": 0}
+    assert record["views"] == 1200
+    assert record.duration_s == 253.0
+    assert record.published_us == timestamp_us(VIDEO["publishedAt"])
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(KeyError):
+        record["duration_s"]
+    assert VideoRecord.from_mapping(record) is record
+    assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_batch_round_trip():
+    rng = random.Random(1)
+    videos = [
+        {
+            **VIDEO,
+            "video_id": f"v{i}",
+            "title": rng.choice(["", "plain", "émoji 🎬", "x" * 300]),
+            "views": rng.randint(0, 10 ** 9),
+            "duration": rng.choice(["PT4M13S", "", "P0D", "bogus", None]),
+            "publishedAt": rng.choice(["2024-05-01T12:00:00Z", "", "garbage", "2024-05-01T14:00:00+02:00"]),
+        }
+        for i in range(200)
+    ]
+    records = [VideoRecord.from_mapping(v) for v in videos]
+    batch = VideoBatch.from_records(videos)
+
+    assert len(batch) == len(videos)
+    assert batch.to_records() == records
+    assert [dict(r) for r in batch] == [dict(r) for r in records]
+    assert batch[5] == records[5] and batch[-1] == records[-1]
+    assert batch[10:20].to_records() == records[10:20]
+    np.testing.assert_array_equal(batch.published_us, [r.published_us for r in records])
+    np.testing.assert_array_equal(batch.duration_s, [r.duration_s for r in records])
+    for r, expected in zip(batch, records):
+        assert r.published_us == expected.published_us
+        assert r.duration_s == expected.duration_s or math.isnan(r.duration_s) and math.isnan(expected.duration_s)
+    assert VideoBatch.from_records(batch).to_records() == records
+
+    # Records keep their parsed values next to dicts parsed in bulk
+    mixed = VideoBatch.from_records([records[i] if i % 2 else videos[i] for i in range(len(videos))])
+    np.testing.assert_array_equal(mixed.published_us, batch.published_us)
+    np.testing.assert_array_equal(mixed.duration_s, batch.duration_s)
+
+
+def test_empty_batch():
+    batch = VideoBatch.from_records([])
+    assert len(batch) == 0
+    assert batch.to_records() == []
@@ -0,0 +1,99 @@
+import random
+import statistics
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.metrics.windows import WINDOW_DAYS, RollingWindows
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def parse(published_at: str) -> datetime:
+    return datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+
+
+def brute_force(videos, now, sub_count):
+    out = {}
+    for days in WINDOW_DAYS:
+        members = [v for v in videos.values() if parse(v["publishedAt"]) >= now - timedelta(days=days)]
+        n = len(members)
+        views = sum(v["views"] for v in members)
+        engagements = sum(v["likes"] + v["comments"] for v in members)
+        median = statistics.median([v["views"] for v in members]) if members else 0
+        published = sorted(parse(v["publishedAt"]).timestamp() for v in members)
+        gaps = [b - a for a, b in zip(published, published[1:])]
+        out[f"{days}d"] = {
+            "days": days,
+            "uploads": n,
+            "uploads_per_week": round(n / days * 7.0, 2),
+            "avg_days_between_uploads": round(statistics.mean(gaps) / 86400, 2) if gaps else 0.0,
+            "total_views": views,
+            "median_views": int(median),
+            "engagement_rate_percent": round(engagements / views * 100.0, 2) if views else 0.0,
+            "loyalty_percent": round(median / sub_count * 100.0, 2) if sub_count else 0.0,
+        }
+    return out
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_brute_force_under_random_updates(seed):
+    rng = random.Random(seed)
+    now, sub_count = T0, rng.randint(0, 10 ** 6)
+    windows = RollingWindows(sub_count=sub_count, now=now)
+    videos = {}
+    for _ in range(300):
+        r = rng.random()
+        if r < 0.5:
+            video_id = f"v{rng.randint(0, 80)}"
+            published = now - timedelta(days=rng.uniform(-1, 400))
+            if video_id in videos and rng.random() < 0.8:
+                published = parse(videos[video_id]["publishedAt"])  # new stats, same upload
+            video = {
+                "video_id": video_id,
+                "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "views": rng.randint(0, 10 ** 5),
+                "likes": rng.randint(0, 100),
+                "comments": rng.randint(0, 10),
+            }
+            videos[video_id] = video
+            windows.upsert(video)
+        elif r < 0.6 and videos:
+            video_id = rng.choice(sorted(videos))
+            del videos[video_id]
+            windows.remove(video_id)
+        elif r < 0.9:
+            now += timedelta(hours=rng.uniform(0, 100))
+            windows.advance(now)
+        else:
+            sub_count = rng.randint(0, 10 ** 6)
+            windows.set_sub_count(sub_count)
+
+        assert windows.windows() == brute_force(videos, now, sub_count)
+
+
+def test_upload_cadence():
+    uploads = [
+        {"video_id": f"v{i}", "publishedAt": (T0 - timedelta(days=d)).strftime("%Y-%m-%dT%H:%M:%SZ")}
+        for i, d in enumerate([1, 2, 6])
+    ]
+    windows = RollingWindows.from_videos(uploads, now=T0)
+    assert windows.window(7)["avg_days_between_uploads"] == 2.5
+    assert windows.window(30)["uploads"] == 3
+
+    single = RollingWindows.from_videos(uploads[:1], now=T0)
+    assert single.window(7)["avg_days_between_uploads"] == 0.0
+    assert RollingWindows(now=T0).window(7)["avg_days_between_uploads"] == 0.0
+
+
+def test_unknown_window():
+    with pytest.raises(ValueError):
+        RollingWindows(now=T0).window(14)
+
+
+def test_ignores_videos_without_id_or_date():
+    windows = RollingWindows.from_videos(
+        [{"video_id": "", "publishedAt": "2025-12-31T00:00:00Z"}, {"video_id": "v", "publishedAt": "garbage"}],
+        now=T0,
+    )
+    assert len(windows) == 0
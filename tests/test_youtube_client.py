@@ -0,0 +1,210 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from conftest import API_KEY
+from fake_youtube import NOW, channel_id
+from src.youtube import async_client, client
+from src.youtube.cache import get_response_cache
+from src.youtube.resolution import get_resolution_index
+
+
+def expire_cache():
+    # Entries stay usable for revalidation, but are no longer served as fresh
+    get_response_cache().ttl_seconds = 0
+
+
+# ---------------- CHANNEL LOOKUP ----------------
+
+def test_channel_lookup_by_id_handle_and_video(youtube):
+    cid = youtube.add_channel(1, handle="@alpha", subscribers=1234, uploads=3)
+
+    by_id = client.get_channel_stats(cid)
+    assert by_id["channel_id"] == cid
+    assert by_id["subscribers"] == 1234
+    assert by_id["uploads_playlist_id"] == "UU" + cid[2:]
+
+    by_handle = client.get_channel_stats("@Alpha")
+    assert by_handle["channel_id"] == cid
+    assert by_handle["channel_url"] == "https://www.youtube.com/@Alpha"
+
+    video_id = youtube.playlists["UU" + cid[2:]][0]
+    assert client.get_channel_stats(f"https://youtu.be/{video_id}")["channel_id"] == cid
+
+
+def test_handle_resolutions_are_indexed(youtube):
+    cid = youtube.add_channel(1, handle="@alpha")
+
+    client.get_channel_stats("@alpha")
+    assert youtube.calls("channels")[-1]["forHandle"] == "@alpha"
+    assert get_resolution_index().get("@alpha", "handle").channel_id == cid
+
+    # Known handle: looked up by ID (and the forHandle call is not repeated)
+    expire_cache()
+    client.get_channel_stats("@ALPHA")
+    assert youtube.calls("channels")[-1]["id"] == cid
+
+    # Unknown handle: remembered as a negative hit
+    assert client.get_channel_stats("@nobody") is None
+    calls = len(youtube.requests)
+    assert client.get_channel_stats("@nobody") is None
+    assert len(youtube.requests) == calls
+
+
+# ---------------- ETAG CACHE ----------------
+
+def test_fresh_responses_are_served_from_cache(youtube):
+    cid = youtube.add_channel(1)
+    client.get_channel_stats(cid)
+    client.get_channel_stats(cid)
+    assert len(youtube.calls("channels")) == 1
+
+
+def test_stale_response_is_revalidated_with_etag(youtube):
+    cid = youtube.add_channel(1, subscribers=100)
+    first = client.get_channel_stats(cid)
+    etag = get_response_cache()._memory.popitem()[1].etag  # also forces the SQLite read path
+
+    expire_cache()
+    assert client.get_channel_stats(cid) == first
+    endpoint, params, headers = youtube.requests[-1]
+    assert headers["if-none-match"] == etag
+    assert youtube.responses[-1] == ("channels", 304)
+
+    # Changed upstream: the 200 replaces the cached payload
+    youtube.channels[cid]["statistics"]["subscriberCount"] = "200"
+    assert client.get_channel_stats(cid)["subscribers"] == 200
+    assert youtube.responses[-1] == ("channels", 200)
+
+
+def test_async_client_revalidates_with_etag(youtube):
+    cid = youtube.add_channel(1, subscribers=100)
+
+    async def run():
+        first = await async_client.get_channel_stats(cid)
+        expire_cache()
+        second = await async_client.get_channel_stats(cid)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert first["subscribers"] == 100
+    assert [status for _, status in youtube.responses] == [200, 304]
+    assert all(params["key"] == API_KEY for _, params, _ in youtube.requests)
+
+
+# ---------------- BATCHED LOOKUP ----------------
+
+def test_batched_lookup_uses_fifty_ids_per_call(youtube):
+    ids = [youtube.add_channel(n) for n in range(120)]
+    results = client.get_channel_stats_many(ids + [ids[0]])
+
+    assert [r["channel"]["channel_id"] for r in results] == ids + [ids[0]]
+    assert [len(params["id"].split(",")) for params in youtube.calls("channels")] == [50, 50, 20]
+
+
+def test_batched_lookup_reports_errors_per_item(youtube):
+    cid = youtube.add_channel(1, handle="@alpha", uploads=2)
+    other = youtube.add_channel(2, uploads=2)
+    video_id = youtube.playlists["UU" + other[2:]][0]
+    youtube.fail("videos", 500)
+
+    results = client.get_channel_stats_many(
+        [cid, "@alpha", "@nobody", f"https://youtu.be/{video_id}", channel_id(999)]
+    )
+    assert results[0]["channel"]["channel_id"] == cid
+    assert results[1]["channel"]["channel_id"] == cid
+    assert results[2] == {"input": "@nobody", "channel": None, "error": client._UNRESOLVED}
+    assert results[3]["error"] == client._VIDEO_LOOKUP_FAILED
+    assert results[4]["error"] == "Channel not found."
+    assert all(API_KEY not in (r["error"] or "") for r in results)
+
+
+def test_batched_lookup_keeps_quota_errors_on_their_item(youtube):
+    from src.youtube.quota import get_quota_ledger, tenant_scope
+
+    cid = youtube.add_channel(1, title="Some Name")
+    ledger = get_quota_ledger()
+    ledger.daily_budget = 50  # batch tenant: 40 units, a search costs 100
+
+    with tenant_scope("batch"):
+        results = client.get_channel_stats_many([cid, "https://www.youtube.com/c/SomeName"])
+    assert results[0]["channel"]["channel_id"] == cid
+    assert results[1]["channel"] is None
+    assert "quota" in results[1]["error"]
+    assert youtube.calls("search") == []
+
+
+# ---------------- UPLOADS ----------------
+
+def test_recent_videos_are_newest_first(youtube):
+    cid = youtube.add_channel(1, uploads=30)
+    videos = client.get_recent_videos("UU" + cid[2:], count=8)
+    assert [v["video_id"] for v in videos] == youtube.playlists["UU" + cid[2:]][:8]
+    assert videos[0]["views"] == 1000
+
+
+def test_recent_videos_failure_raises_without_the_api_key(youtube):
+    cid = youtube.add_channel(1, uploads=5)
+    youtube.fail("videos", 500)
+
+    with pytest.raises(client.YouTubeAPIError) as err:
+        client.get_recent_videos("UU" + cid[2:], count=5)
+    assert API_KEY not in str(err.value)
+
+    # The failure was not cached as "no uploads"
+    assert len(client.get_recent_videos("UU" + cid[2:], count=5)) == 5
+
+
+def test_upload_pages_follow_tokens_and_stop_at_cutoff(youtube):
+    cid = youtube.add_channel(1, uploads=120, every_days=1)
+    playlist = "UU" + cid[2:]
+
+    pages = list(client.iter_upload_pages(playlist))
+    assert [len(p.videos) for p in pages] == [50, 50, 20]
+    assert [p.next_page_token for p in pages] == ["50", "100", None]
+
+    recent = list(client.iter_uploads(playlist, published_after=NOW - timedelta(days=60, hours=12)))
+    assert len(recent) == 60
+
+    assert len(list(client.iter_uploads(playlist, max_videos=70))) == 70
+
+
+def test_failed_upload_page_raises_with_its_token(youtube):
+    cid = youtube.add_channel(1, uploads=120)
+    pages = client.iter_upload_pages("UU" + cid[2:])
+    assert len(next(pages).videos) == 50
+
+    youtube.fail("playlistItems", 500)
+    with pytest.raises(client.UploadPageError) as err:
+        next(pages)
+    assert err.value.page_token == "50"
+    assert API_KEY not in str(err.value)
+
+    resumed = list(client.iter_upload_pages("UU" + cid[2:], page_token=err.value.page_token))
+    assert sum(len(p.videos) for p in resumed) == 70
+
+
+# ---------------- CLIENT POOL ----------------
+
+def test_clients_are_reused(youtube):
+    cid = youtube.add_channel(1, uploads=3)
+    for _ in range(3):
+        expire_cache()
+        client.get_channel_stats(cid)
+    assert len(youtube.https) == 1
+
+
+def test_client_with_broken_transport_is_discarded(youtube):
+    cid = youtube.add_channel(1)
+    client.get_channel_stats(cid)
+    (http,) = youtube.https
+
+    expire_cache()
+    http.broken = ConnectionResetError("connection reset")
+    assert client.get_channel_stats(cid) is None  # handled by the client...
+    assert http.closed  # ...but the connection is not reused
+
+    assert client.get_channel_stats(cid)["channel_id"] == cid
+    assert len(youtube.https) == 2